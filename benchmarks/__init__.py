@@ -0,0 +1,5 @@
+"""
+Offline benchmark suite.
+Runs the conversion pipeline against a local article corpus and a stand-in
+OpenAI endpoint, so performance can be measured without network access or API costs.
+"""
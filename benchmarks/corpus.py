@@ -0,0 +1,163 @@
+"""
+Local HTTP fixture server for a corpus of news pages.
+Serves saved pages from a directory, or a deterministic generated corpus.
+"""
+
+import hashlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+WORDS = (
+    "city council government plan energy climate market company workers school students "
+    "research scientists report study health hospital public transport budget local national "
+    "new technology data online service price cost growth economy change people community "
+    "program project water food farmers weather season travel tourism museum culture sport"
+).split()
+
+TOPICS = [
+    "City Opens New Solar Park",
+    "Scientists Study Sleep Habits of Teenagers",
+    "Local Farmers Adapt to Dry Summer",
+    "Museum Brings Ancient History to Life",
+    "Train Company Tests Driverless Trains",
+    "School Replaces Homework With Projects",
+    "Coffee Prices Rise After Poor Harvest",
+    "Volunteers Clean Up River Banks",
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} | Daily Bench News</title>
+<meta property="og:title" content="{title}">
+<meta name="author" content="Bench Reporter">
+<meta property="article:published_time" content="2024-05-{day:02d}T09:00:00Z">
+</head>
+<body>
+<nav><a href="/">Home</a> <a href="/world">World</a> <a href="/science">Science</a></nav>
+<article>
+<h1>{title}</h1>
+{paragraphs}
+</article>
+<footer>Copyright Daily Bench News</footer>
+</body>
+</html>
+"""
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 18))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def generate_corpus(count: int, seed: int = 0) -> Dict[str, str]:
+    """
+    Generate news pages of varied length.
+
+    Every fifth page is long enough to exceed the default rewrite token budget,
+    so the condensing path is exercised as well.
+
+    Args:
+        count: Number of pages
+        seed: Random seed; the same seed always yields the same corpus
+
+    Returns:
+        Mapping of URL path to page HTML
+    """
+    rng = random.Random(seed)
+    pages = {}
+    for index in range(count):
+        title = f"{TOPICS[index % len(TOPICS)]} ({index + 1})"
+        paragraph_count = rng.randint(40, 60) if index % 5 == 4 else rng.randint(4, 12)
+        paragraphs = '\n'.join(
+            f"<p>{' '.join(_sentence(rng) for _ in range(rng.randint(3, 6)))}</p>"
+            for _ in range(paragraph_count)
+        )
+        pages[f"/articles/{index + 1:03d}.html"] = PAGE_TEMPLATE.format(
+            title=title, day=index % 28 + 1, paragraphs=paragraphs
+        )
+    return pages
+
+
+def load_corpus(directory: Union[str, Path]) -> Dict[str, str]:
+    """
+    Load saved pages (*.html) from a directory.
+
+    Args:
+        directory: Directory of saved news pages
+
+    Returns:
+        Mapping of URL path to page HTML
+    """
+    pages = {}
+    for path in sorted(Path(directory).glob('*.html')):
+        pages[f"/articles/{path.name}"] = path.read_text(encoding='utf-8', errors='replace')
+    return pages
+
+
+class CorpusServer:
+    """Serves a corpus on 127.0.0.1 from a background thread; use as a context manager."""
+
+    def __init__(self, pages: Dict[str, str]):
+        """
+        Initialize the server.
+
+        Args:
+            pages: Mapping of URL path to page HTML
+        """
+        self.pages = {path: html.encode('utf-8') for path, html in pages.items()}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def urls(self) -> List[str]:
+        """Absolute URLs of every page, in path order."""
+        host, port = self._server.server_address[:2]
+        return [f"http://{host}:{port}{path}" for path in sorted(self.pages)]
+
+    def start(self) -> 'CorpusServer':
+        pages = self.pages
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'CorpusServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
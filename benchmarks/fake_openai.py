@@ -0,0 +1,217 @@
+"""
+Stand-in OpenAI-compatible chat completions endpoint.
+Answers each lesson section with canned JSON after a sampled latency, and can
+inject 429 responses to exercise the rate-limit governor.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+VOCABULARY = {'vocabulary': [
+    {'word': word, 'definition': f"A common word used to talk about {word}.", 'example': f"The {word} changed a lot this year."}
+    for word in ('council', 'budget', 'research', 'harvest', 'volunteer', 'transport', 'climate', 'community')
+]}
+QUESTIONS = {'questions': [{'question': f"Question {i}: what do you think about the main idea of the article?"} for i in range(1, 6)]}
+FURTHER_QUESTIONS = {'questions': [{'question': f"Further question {i}: how does this topic affect your country?"} for i in range(1, 6)]}
+ARTICLE_BODY = ("The city has a new plan. " * 12 + "\n\n") * 4
+CHUNK_SUMMARY = "The article explains the plan, the people involved and what happens next. " * 3
+
+
+@dataclass
+class LatencyModel:
+    """Distribution of simulated response times, in seconds."""
+    kind: str = 'fixed'
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyModel':
+        """
+        Parse a latency spec.
+
+        Supported forms: "fixed:SECONDS", "uniform:LOW,HIGH" and
+        "lognormal:MEDIAN,SIGMA" (a heavy-tailed distribution close to real API latency).
+
+        Args:
+            spec: Latency specification
+
+        Returns:
+            LatencyModel
+        """
+        kind, _, values = spec.partition(':')
+        numbers = [float(value) for value in values.split(',') if value]
+        if kind == 'fixed' and len(numbers) == 1:
+            return cls(kind, numbers[0])
+        if kind in ('uniform', 'lognormal') and len(numbers) == 2:
+            return cls(kind, numbers[0], numbers[1])
+        raise ValueError(f"Invalid latency spec {spec!r}; use fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'uniform':
+            return rng.uniform(self.a, self.b)
+        if self.kind == 'lognormal':
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        return self.a
+
+
+def _completion(model: str, content: str, prompt_tokens: int) -> Dict[str, Any]:
+    return {
+        'id': 'chatcmpl-bench',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': max(1, len(content) // 4),
+            'total_tokens': prompt_tokens + max(1, len(content) // 4)
+        }
+    }
+
+
+def _stream_events(model: str, content: str, prompt_tokens: int, include_usage: bool) -> bytes:
+    """Server-sent events for a streamed completion: the content a word at a time, then the usage."""
+    completion = _completion(model, content, prompt_tokens)
+    base = {key: completion[key] for key in ('id', 'created', 'model')}
+    words = content.split(' ')
+    chunks = [
+        {**base, 'object': 'chat.completion.chunk',
+         'choices': [{'index': 0, 'delta': {'content': word if i == 0 else ' ' + word}, 'finish_reason': None}]}
+        for i, word in enumerate(words)
+    ]
+    chunks.append({**base, 'object': 'chat.completion.chunk',
+                   'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+    if include_usage:
+        chunks.append({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': completion['usage']})
+    events = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks] + ["data: [DONE]\n\n"]
+    return ''.join(events).encode('utf-8')
+
+
+def answer(messages: Any) -> str:
+    """Pick a canned answer for a request based on its system prompt."""
+    system_prompt = messages[0]['content'] if messages else ''
+    if 'definitions' in system_prompt:
+        return json.dumps({'definitions': [
+            {'word': item['word'], 'definition': item['definition']} for item in VOCABULARY['vocabulary']
+        ]})
+    if 'vocabulary' in system_prompt:
+        return json.dumps(VOCABULARY)
+    if 'rewriting' in system_prompt:
+        return ARTICLE_BODY
+    if 'condensing' in system_prompt:
+        return CHUNK_SUMMARY
+    if 'advanced' in system_prompt:
+        return json.dumps(FURTHER_QUESTIONS)
+    return json.dumps(QUESTIONS)
+
+
+class FakeOpenAIServer:
+    """Serves POST /v1/chat/completions on 127.0.0.1, streamed on request; use as a context manager."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None, error_rate: float = 0.0, seed: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            latency: Response time distribution (default: no delay)
+            error_rate: Fraction of requests answered with 429 and retry-after-ms
+            seed: Random seed for latency and error sampling
+        """
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.requests = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to OpenAI(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _next(self):
+        """Sample (delay, rate_limited) for one request."""
+        with self._lock:
+            self.requests += 1
+            limited = self._rng.random() < self.error_rate
+            if limited:
+                self.rate_limited += 1
+            return self.latency.sample(self._rng), limited
+
+    def start(self) -> 'FakeOpenAIServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                delay, limited = server._next()
+                time.sleep(delay)
+
+                if not limited and request.get('stream'):
+                    messages = request.get('messages', [])
+                    prompt_tokens = sum(len(message.get('content') or '') for message in messages) // 4
+                    include_usage = bool((request.get('stream_options') or {}).get('include_usage'))
+                    body = _stream_events(request.get('model', 'gpt-4o-mini'), answer(messages), prompt_tokens,
+                                          include_usage)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/event-stream')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                if limited:
+                    status = 429
+                    payload = {'error': {'message': 'Rate limit reached (benchmark)', 'type': 'requests',
+                                         'code': 'rate_limit_exceeded'}}
+                    headers = {'retry-after-ms': '50'}
+                else:
+                    status = 200
+                    messages = request.get('messages', [])
+                    prompt_tokens = sum(len(message.get('content') or '') for message in messages) // 4
+                    payload = _completion(request.get('model', 'gpt-4o-mini'), answer(messages), prompt_tokens)
+                    headers = {'x-ratelimit-remaining-requests': '10000', 'x-ratelimit-reset-requests': '1ms'}
+
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the conversion pipeline.
+
+Starts the corpus server and the stand-in OpenAI endpoint, then measures
+EngooNewsAgent.convert_article one article at a time and the batch path with
+parallel workers. Reports p50/p95 latency, throughput and peak RSS, and can
+compare against a saved baseline to catch regressions.
+
+Usage:
+    python -m benchmarks.harness --articles 20 --latency lognormal:0.4,0.5 --workers 8
+    python -m benchmarks.harness --json-output bench.json
+    python -m benchmarks.harness --baseline bench.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Make the src package importable when run from a checkout
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from benchmarks.corpus import CorpusServer, generate_corpus, load_corpus
+from benchmarks.fake_openai import FakeOpenAIServer, LatencyModel
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_agent(base_url: str, max_concurrency: int = 16):
+    """
+    Build an agent wired to the stand-in OpenAI endpoint, with caches disabled.
+
+    Args:
+        base_url: Base URL of the fake OpenAI server
+        max_concurrency: Ceiling for the rate-limit governor
+
+    Returns:
+        EngooNewsAgent
+    """
+    from openai import OpenAI
+    from src.agent import EngooNewsAgent
+    from src.processor import ContentProcessor
+    from src.rate_limit import RateLimitGovernor
+    from src.scraper import WebScraper
+
+    client = OpenAI(api_key='benchmark', base_url=base_url, max_retries=0)
+    processor = ContentProcessor(
+        client,
+        concurrent=True,
+        governor=RateLimitGovernor(max_concurrency=max_concurrency, base_delay=0.05)
+    )
+    return EngooNewsAgent(processor, scraper=WebScraper())
+
+
+def _stats(summary) -> Dict[str, Any]:
+    return {
+        'articles': len(summary.items),
+        'failed': summary.failed,
+        'p50_seconds': round(summary.latency_percentile(50), 4),
+        'p95_seconds': round(summary.latency_percentile(95), 4),
+        'throughput_per_minute': round(summary.throughput_per_minute, 2),
+        'wall_seconds': round(summary.wall_seconds, 4)
+    }
+
+
+def bench_single(agent: Any, urls: List[str]) -> Dict[str, Any]:
+    """Convert articles one at a time with convert_article."""
+    from src.batch import BatchItemResult, BatchSummary
+
+    summary = BatchSummary()
+    start = time.perf_counter()
+    for index, url in enumerate(urls, 1):
+        item_start = time.perf_counter()
+        result = agent.convert_article(url)
+        summary.items.append(BatchItemResult(index, url, result['success'], time.perf_counter() - item_start,
+                                             error=result.get('error')))
+    summary.wall_seconds = time.perf_counter() - start
+    return _stats(summary)
+
+
+def bench_batch(agent: Any, urls: List[str], workers: int) -> Dict[str, Any]:
+    """Convert articles through run_batch with a worker pool."""
+    from src.batch import run_batch
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = run_batch(agent, urls, output_dir, workers=workers)
+    stats = _stats(summary)
+    stats['workers'] = workers
+    return stats
+
+
+def run_benchmark(articles: int = 20,
+                  latency: str = 'lognormal:0.3,0.5',
+                  workers: int = 8,
+                  error_rate: float = 0.0,
+                  corpus_dir: Optional[str] = None,
+                  seed: int = 0,
+                  modes: tuple = ('single', 'batch')) -> Dict[str, Any]:
+    """
+    Run the benchmark and return a report.
+
+    Args:
+        articles: Number of generated pages (ignored with corpus_dir)
+        latency: Latency spec for the fake OpenAI server, see LatencyModel.parse
+        workers: Parallel conversions for the batch path
+        error_rate: Fraction of OpenAI requests answered with 429
+        corpus_dir: Directory of saved *.html pages to serve instead of the generated corpus
+        seed: Random seed for the corpus and the latency samples
+        modes: Which paths to run: 'single' and/or 'batch'
+
+    Returns:
+        Report dictionary
+    """
+    pages = load_corpus(corpus_dir) if corpus_dir else generate_corpus(articles, seed=seed)
+    if not pages:
+        raise ValueError(f"No *.html pages found in {corpus_dir}")
+
+    report: Dict[str, Any] = {
+        'config': {'articles': len(pages), 'latency': latency, 'workers': workers,
+                   'error_rate': error_rate, 'seed': seed}
+    }
+    with CorpusServer(pages) as corpus, \
+            FakeOpenAIServer(LatencyModel.parse(latency), error_rate=error_rate, seed=seed) as openai_server:
+        agent = build_agent(openai_server.base_url)
+        if 'single' in modes:
+            report['single'] = bench_single(agent, corpus.urls)
+        if 'batch' in modes:
+            report['batch'] = bench_batch(agent, corpus.urls, workers)
+        report['openai_requests'] = openai_server.requests
+        report['openai_rate_limited'] = openai_server.rate_limited
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List regressions of report against baseline.
+
+    A regression is a p95 latency or peak RSS more than tolerance above the
+    baseline, a throughput more than tolerance below it, or any failed article.
+
+    Args:
+        report: Current report
+        baseline: Saved report to compare with
+        tolerance: Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        Human-readable regression descriptions; empty if none
+    """
+    regressions = []
+    for mode in ('single', 'batch'):
+        current, previous = report.get(mode), baseline.get(mode)
+        if not current or not previous:
+            continue
+        if current['failed']:
+            regressions.append(f"{mode}: {current['failed']} article(s) failed")
+        if current['p95_seconds'] > previous['p95_seconds'] * (1 + tolerance):
+            regressions.append(f"{mode}: p95 {current['p95_seconds']:.3f}s vs baseline {previous['p95_seconds']:.3f}s")
+        if current['throughput_per_minute'] < previous['throughput_per_minute'] * (1 - tolerance):
+            regressions.append(f"{mode}: throughput {current['throughput_per_minute']:.1f}/min "
+                               f"vs baseline {previous['throughput_per_minute']:.1f}/min")
+
+    if report.get('peak_rss_mb') and baseline.get('peak_rss_mb'):
+        if report['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"peak RSS {report['peak_rss_mb']:.0f} MB vs baseline {baseline['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Format a report as a table for the terminal."""
+    config = report['config']
+    lines = [
+        f"Articles: {config['articles']}  latency: {config['latency']}  "
+        f"workers: {config['workers']}  429 rate: {config['error_rate']}",
+        "",
+        f"{'Path':<8} {'p50 (s)':>9} {'p95 (s)':>9} {'per min':>9} {'wall (s)':>9} {'failed':>7}"
+    ]
+    for mode in ('single', 'batch'):
+        stats = report.get(mode)
+        if stats:
+            lines.append(f"{mode:<8} {stats['p50_seconds']:>9.3f} {stats['p95_seconds']:>9.3f} "
+                         f"{stats['throughput_per_minute']:>9.1f} {stats['wall_seconds']:>9.2f} {stats['failed']:>7}")
+    lines.append("")
+    lines.append(f"OpenAI requests: {report['openai_requests']} ({report['openai_rate_limited']} rate limited)")
+    if report.get('peak_rss_mb') is not None:
+        lines.append(f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Engoo conversion pipeline offline")
+    parser.add_argument("--articles", type=int, default=20, help="Number of generated articles (default: 20)")
+    parser.add_argument("--corpus-dir", help="Serve saved *.html pages from this directory instead")
+    parser.add_argument("--latency", default="lognormal:0.3,0.5",
+                        help="OpenAI latency: fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA (default: lognormal:0.3,0.5)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of OpenAI requests answered with 429")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Parallel conversions for the batch path (default: 8)")
+    parser.add_argument("--mode", choices=['single', 'batch', 'both'], default='both', help="Paths to benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json-output", help="Write the report as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with a saved JSON report and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    modes = ('single', 'batch') if args.mode == 'both' else (args.mode,)
+    report = run_benchmark(args.articles, args.latency, args.workers, args.error_rate,
+                           args.corpus_dir, args.seed, modes)
+    print(format_report(report))
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.json_output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
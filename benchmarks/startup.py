@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the command-line tool.
+
+Runs main.py subcommands under `python -X importtime` and reports how long
+their imports take and whether any heavy dependency (langgraph, openai,
+newspaper, ...) was loaded by a command that does not need it. Exits 1 when a
+command imports a heavy module or exceeds the import-time budget.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 250 --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAIN_SCRIPT = Path(__file__).parent.parent / 'main.py'
+
+# Only the conversion path needs these
+HEAVY_MODULES = ('langgraph', 'openai', 'newspaper', 'nltk', 'bs4', 'httpx', 'tiktoken')
+
+# Commands that must start without any heavy module
+LIGHT_COMMANDS = {
+    'help': ['--help'],
+    'convert --help': ['convert', '--help'],
+    'gist --help': ['gist', '--help'],
+    'library search': ['library', 'search', 'startup'],
+    'glossary list': ['glossary', 'list'],
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        Self import time in microseconds of every imported module, by name
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def measure_command(args: List[str], env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Run main.py with the given arguments and measure its imports.
+
+    Args:
+        args: Command-line arguments for main.py
+        env: Extra environment variables
+
+    Returns:
+        Dictionary with 'import_ms', the heavy modules loaded and the exit code
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(MAIN_SCRIPT), *args],
+        capture_output=True, text=True, env={**os.environ, **(env or {})}, timeout=120
+    )
+    modules = parse_importtime(result.stderr)
+    return {
+        'import_ms': sum(modules.values()) / 1000,
+        'heavy_modules': sorted({name for name in modules if name.split('.')[0] in HEAVY_MODULES}),
+        'returncode': result.returncode
+    }
+
+
+def run_startup_benchmark(runs: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure every light command, keeping the fastest of several runs.
+
+    Commands run against empty temporary cache and data directories.
+
+    Args:
+        runs: Runs per command
+
+    Returns:
+        Measurements by command name
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {'ENGOO_CACHE_DIR': str(Path(tmpdir) / 'cache'), 'ENGOO_DATA_DIR': str(Path(tmpdir) / 'data')}
+        report = {}
+        for name, args in LIGHT_COMMANDS.items():
+            measurements = [measure_command(args, env) for _ in range(max(1, runs))]
+            report[name] = min(measurements, key=lambda measurement: measurement['import_ms'])
+        return report
+
+
+def check_budget(report: Dict[str, Dict[str, Any]], budget_ms: float) -> List[str]:
+    """List commands that load heavy modules or import for longer than budget_ms."""
+    problems = []
+    for name, stats in report.items():
+        if stats['heavy_modules']:
+            problems.append(f"{name}: imports {', '.join(stats['heavy_modules'])}")
+        if stats['import_ms'] > budget_ms:
+            problems.append(f"{name}: {stats['import_ms']:.0f} ms of imports exceeds the {budget_ms:.0f} ms budget")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI startup imports")
+    parser.add_argument("--budget-ms", type=float, default=300, help="Import-time budget per command (default: 300)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per command; the fastest counts (default: 3)")
+    args = parser.parse_args(argv)
+
+    report = run_startup_benchmark(args.runs)
+    print(f"{'Command':<16} {'imports (ms)':>13}  heavy modules")
+    for name, stats in report.items():
+        print(f"{name:<16} {stats['import_ms']:>13.1f}  {', '.join(stats['heavy_modules']) or '-'}")
+
+    problems = check_budget(report, args.budget_ms)
+    if problems:
+        print("\nStartup regressions:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print(f"\nAll commands within {args.budget_ms:.0f} ms and free of heavy imports.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
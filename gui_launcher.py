@@ -6,24 +6,45 @@ A simple graphical interface for non-technical users.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
-import os
+import queue
 import sys
 import subprocess
 import threading
+import time
 import webbrowser
 from pathlib import Path
 
+# Friendly names for the conversion stages reported by the agent
+STAGE_LABELS = {
+    "scrape_content": "Downloading article",
+    "validate_content": "Checking article",
+    "process_content": "Writing lesson",
+    "finalize": "Saving lesson"
+}
+
+# The lesson section whose text is streamed into the output pane
+BODY_STAGE = "rewriting article body"
+
 class EngooGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Engoo Daily News Writer")
         self.root.geometry("800x600")
         
+        # The conversion agent lives on one worker thread and is reused for every click
+        self.agent = None
+        self.agent_error = None
+        self.tasks = None
+        self.cancel_event = None
+        
         # Check if setup is complete
         self.setup_complete = self.check_setup()
         
         self.create_widgets()
         
+        if self.setup_complete:
+            self.start_worker()
+        
     def check_setup(self):
         """Check if the tool is properly set up."""
         env_file = Path(".env")
@@ -129,7 +150,17 @@ The setup will:
         self.url_entry = tk.Entry(url_input_frame, font=("Arial", 11))
         self.url_entry.pack(side="left", fill="x", expand=True)
         
-        convert_btn = tk.Button(
+        self.cancel_btn = tk.Button(
+            url_input_frame,
+            text="Cancel",
+            command=self.cancel_conversion,
+            state="disabled",
+            font=("Arial", 10),
+            padx=10
+        )
+        self.cancel_btn.pack(side="right", padx=(10, 0))
+        
+        self.convert_btn = tk.Button(
             url_input_frame,
             text="Convert",
             command=self.convert_article,
@@ -138,7 +169,7 @@ The setup will:
             font=("Arial", 10, "bold"),
             padx=15
         )
-        convert_btn.pack(side="right", padx=(10, 0))
+        self.convert_btn.pack(side="right", padx=(10, 0))
         
         # Options
         options_frame = tk.Frame(url_frame)
@@ -242,55 +273,165 @@ The setup will:
         
         threading.Thread(target=setup_thread, daemon=True).start()
     
+    def start_worker(self):
+        """Start the worker thread, which loads the conversion agent in the background."""
+        if self.tasks is not None:
+            return
+        self.tasks = queue.Queue()
+        self.update_status("Loading the conversion engine...")
+        self.tasks.put(self.load_agent)
+        threading.Thread(target=self.worker_loop, daemon=True).start()
+    
+    def worker_loop(self):
+        """Run the agent load and then conversions one at a time."""
+        while True:
+            task = self.tasks.get()
+            task()
+    
+    def load_agent(self):
+        """Worker thread: load the conversion agent. A failed load is retried by the next conversion."""
+        self.agent_error = None
+        try:
+            sys.path.insert(0, str(Path(__file__).parent / "src"))
+            from src import get_engoo_agent
+            
+            self.agent = get_engoo_agent()
+            self.post(self.update_status, "Ready to convert articles!")
+        except Exception as e:
+            self.agent_error = str(e)
+            self.post(self.update_status, f"Could not load the conversion engine: {e}")
+    
     def convert_article(self):
-        """Convert an article using the CLI tool."""
+        """Convert an article with the in-process agent, showing progress as it happens."""
         url = self.url_entry.get().strip()
         if not url:
             messagebox.showwarning("Input Error", "Please enter an article URL.")
             return
+        if self.tasks is None:
+            self.start_worker()
+        
+        share_online = self.share_online.get()
+        self.cancel_event = threading.Event()
+        cancel_event = self.cancel_event
+        self.convert_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.log_output(f"Converting article: {url}\n")
+        if self.agent is None:
+            self.log_output("Loading the conversion engine...\n")
+        self.update_status("Converting article...")
+        
+        self.tasks.put(lambda: self.run_conversion(url, share_online, cancel_event))
+    
+    def cancel_conversion(self):
+        """Stop the running conversion at its next step."""
+        if self.cancel_event is not None and not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.cancel_btn.config(state="disabled")
+            self.log_output("Cancelling after the current step...\n")
+            self.update_status("Cancelling...")
+    
+    def run_conversion(self, url, share_online, cancel_event):
+        """Worker thread: convert the article, save it and optionally share it."""
+        from src.progress import STARTED
+        
+        start = time.perf_counter()
+        
+        # While the article body streams into the pane, progress lines from the
+        # sections running alongside it are held back so they don't split the text
+        held_lines = []
+        body_streaming = threading.Event()
+        held_lock = threading.Lock()
+        
+        def log_progress(text):
+            with held_lock:
+                if body_streaming.is_set():
+                    held_lines.append(text)
+                    return
+            self.post(self.log_output, text)
+        
+        def release_held_lines(prefix=""):
+            with held_lock:
+                body_streaming.clear()
+                text = prefix + "".join(held_lines)
+                held_lines.clear()
+            if text:
+                self.post(self.log_output, text)
+        
+        def on_progress(stage, status):
+            label = STAGE_LABELS.get(stage, stage.capitalize())
+            elapsed = time.perf_counter() - start
+            if status == STARTED:
+                log_progress(f"[{elapsed:5.1f}s] ▶ {label}...\n")
+                if stage in STAGE_LABELS:
+                    self.post(self.update_status, f"{label}...")
+                if stage == BODY_STAGE:
+                    body_streaming.set()
+            elif stage == BODY_STAGE:
+                release_held_lines(f"\n[{elapsed:5.1f}s] ✓ {label}\n")
+            else:
+                log_progress(f"[{elapsed:5.1f}s] ✓ {label}\n")
+        
+        def on_body_delta(text):
+            self.post(self.log_output, text)
         
-        def convert_thread():
-            try:
-                self.log_output(f"Converting article: {url}\n")
-                self.update_status("Converting article...")
-                
-                # Build command
-                if sys.platform == "win32":
-                    cmd = ["engoo-writer.bat", "convert", url]
-                else:
-                    cmd = ["./engoo-writer", "convert", url]
-                
-                if self.share_online.get():
-                    cmd.append("--gist")
-                
-                # Run command
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=os.getcwd()
-                )
+        try:
+            if self.agent is None:
+                # The last load may have failed on a key or install the user has since fixed
+                self.load_agent()
+            if self.agent is None:
+                raise RuntimeError(self.agent_error or "The conversion engine is not available")
+            
+            result = self.agent.convert_article(url, formats=["html"], on_progress=on_progress,
+                                                cancel_event=cancel_event, on_body_delta=on_body_delta)
+            # A stream cut short by an error or cancellation never reports its end
+            release_held_lines()
+            if result.get("cancelled"):
+                self.post(self.finish_conversion, "⏹️ Conversion cancelled.\n", "Cancelled")
+                return
+            if not result["success"]:
+                self.post(self.finish_conversion, f"❌ Conversion failed: {result['error']}\n", "Error",
+                          ("Error", "Conversion failed. Check the output for details."))
+                return
+            
+            article = result["article"]
+            output_file = Path("engoo_article.html")
+            output_file.write_text(article["html"], encoding="utf-8")
+            lines = [
+                f"✅ Conversion completed in {time.perf_counter() - start:.1f}s!\n",
+                f"📖 Title: {article['title']}\n",
+                f"📝 Vocabulary: {len(article['vocabulary'])} items\n",
+                f"💬 Discussion: {len(article['discussion_questions'])} questions\n",
+                f"📁 Saved to: {output_file.absolute()}\n"
+            ]
+            
+            if share_online and not cancel_event.is_set():
+                self.post(self.log_output, "".join(lines))
+                self.post(self.update_status, "Sharing lesson online...")
+                from src.github_gist import create_shareable_lesson
                 
-                if result.returncode == 0:
-                    self.log_output("✅ Conversion completed successfully!\n")
-                    self.log_output(result.stdout)
-                    
-                    if self.share_online.get():
-                        self.log_output("\n🌐 Lesson shared online!\n")
-                    
-                    self.update_status("Ready")
-                    messagebox.showinfo("Success", "Article converted successfully!")
-                else:
-                    self.log_output(f"❌ Conversion failed:\n{result.stderr}\n")
-                    self.update_status("Error")
-                    messagebox.showerror("Error", "Conversion failed. Check the output for details.")
-                    
-            except Exception as e:
-                self.log_output(f"Error: {str(e)}\n")
-                self.update_status("Error")
-                messagebox.showerror("Error", f"Conversion failed: {str(e)}")
-        
-        threading.Thread(target=convert_thread, daemon=True).start()
+                gist_result = create_shareable_lesson(html_content=article["html"])
+                lines = [
+                    "\n🌐 Lesson shared online!\n",
+                    f"🔗 Shareable link: {gist_result['preview_url']}\n"
+                ]
+            
+            self.post(self.finish_conversion, "".join(lines), "Ready", None, "Article converted successfully!")
+            
+        except Exception as e:
+            self.post(self.finish_conversion, f"Error: {str(e)}\n", "Error", ("Error", f"Conversion failed: {str(e)}"))
+    
+    def finish_conversion(self, text, status, error=None, success_message=None):
+        """Main thread: report the outcome of a conversion and re-enable the controls."""
+        self.log_output(text)
+        self.update_status(status)
+        if hasattr(self, "convert_btn") and self.convert_btn.winfo_exists():
+            self.convert_btn.config(state="normal")
+            self.cancel_btn.config(state="disabled")
+        self.cancel_event = None
+        if error:
+            messagebox.showerror(*error)
+        elif success_message:
+            messagebox.showinfo("Success", success_message)
     
     def list_gists(self):
         """List all shared lessons."""
@@ -337,6 +478,13 @@ The setup will:
                 widget.destroy()
         
         self.create_widgets()
+        
+        if self.setup_complete:
+            self.start_worker()
+    
+    def post(self, func, *args):
+        """Run func on the Tk main thread; worker threads must not touch widgets directly."""
+        self.root.after(0, func, *args)
     
     def log_output(self, text):
         """Add text to the output area."""
@@ -351,7 +499,22 @@ The setup will:
             self.status_bar.config(text=text)
             self.root.update_idletasks()
 
+def relaunch_in_venv():
+    """Re-run the GUI with the setup's virtualenv Python, which has the conversion dependencies."""
+    venv_dir = Path(".venv")
+    python = venv_dir / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python")
+    if not python.exists() or Path(sys.prefix).resolve() == venv_dir.resolve():
+        return
+    # Only switch if that Python can show the window too
+    check = subprocess.run([str(python), "-c", "import tkinter"], capture_output=True)
+    if check.returncode == 0:
+        # os.execv does not quote arguments on Windows, so a path with spaces breaks;
+        # run the GUI as a child process and pass on its exit code instead
+        proc = subprocess.run([str(python), str(Path(__file__).absolute())])
+        sys.exit(proc.returncode)
+
 def main():
+    relaunch_in_venv()
     root = tk.Tk()
     app = EngooGUI(root)
     root.mainloop()
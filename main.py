@@ -5,58 +5,91 @@ A command-line tool to convert online articles to Engoo daily news format.
 """
 
 import argparse
+import logging
+import os
 import sys
-import json
+import threading
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from src import convert_url_to_engoo
+from src.models import EngooArticle
+from src.progress import FINISHED
 
+# Lesson section whose text is streamed to the terminal
+BODY_STAGE = "rewriting article body"
+from src.renderers import FORMAT_EXTENSIONS, format_for_path, parse_formats, render
 
-def save_to_file(result: dict, output_file: str):
-    """Save the conversion result to a file."""
+
+def save_to_file(result: dict, output_file: str, fmt: str = None):
+    """Save the conversion result to a file, in the given format or the one implied by its extension."""
     if result['success']:
-        article = result['article']
+        fmt = fmt or format_for_path(output_file)
+        content = result['article'].get(fmt)
+        if content is None:
+            # Not rendered during conversion; render from the lesson fields
+            content = render(EngooArticle.from_dict(result['article']), fmt)
         
-        if output_file.endswith('.json'):
-            # Save as JSON
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-        elif output_file.endswith('.html'):
-            # Save as HTML
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(article['html'])
-        else:
-            # Save as text
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {article['title']}\n\n")
-                
-                f.write("Vocabulary:\n")
-                for vocab in article['vocabulary']:
-                    f.write(f"- {vocab['word']}: {vocab['definition']}\n")
-                    f.write(f"  Example: {vocab['example']}\n")
-                f.write("\n")
-                
-                f.write("Article:\n")
-                f.write(article['article_body'])
-                f.write("\n\n")
-                
-                f.write("Discussion Questions:\n")
-                for i, question in enumerate(article['discussion_questions'], 1):
-                    f.write(f"{i}. {question}\n")
-                f.write("\n")
-                
-                f.write("Further Discussion:\n")
-                for i, question in enumerate(article['further_discussion_questions'], 1):
-                    f.write(f"{i}. {question}\n")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(content)
         
         print(f"Results saved to: {output_file}")
     else:
         print(f"Cannot save failed conversion: {result['error']}")
 
 
+class HeldLogRecords(logging.Filter):
+    """
+    Holds log records back while the article body streams to the terminal.
+    
+    Sections generated alongside the rewrite keep logging; their lines would
+    otherwise land in the middle of the printed article.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.holding = False
+        self.records = []
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            if self.holding:
+                self.records.append(record)
+                return False
+        return True
+    
+    def hold(self) -> None:
+        """Start holding records back."""
+        with self._lock:
+            self.holding = True
+    
+    def release(self) -> None:
+        """Stop holding and emit the held records."""
+        with self._lock:
+            self.holding = False
+            records, self.records = self.records, []
+        for record in records:
+            for handler in logging.getLogger().handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+def output_paths(output: str, formats: list) -> list:
+    """
+    Pair each requested format with its output file.
+    
+    A single format is written to --output as given (default engoo_article.<ext>);
+    several formats share the --output name with one extension per format.
+    """
+    if len(formats) == 1 and output:
+        return [(formats[0], output)]
+    stem = str(Path(output).with_suffix('')) if output else "engoo_article"
+    return [(fmt, f"{stem}{FORMAT_EXTENSIONS[fmt]}") for fmt in formats]
+
+
 def main():
     """Main command-line interface."""
     parser = argparse.ArgumentParser(
@@ -70,11 +103,64 @@ def main():
     # Convert command (default)
     convert_parser = subparsers.add_parser('convert', help='Convert article to Engoo format')
     convert_parser.add_argument("url", help="URL of the article to convert")
-    convert_parser.add_argument("-o", "--output", help="Output file path (supports .txt, .html, .json)", default=None)
+    convert_parser.add_argument("-o", "--output", help="Output file path (supports .txt, .html, .md, .json)", default=None)
+    convert_parser.add_argument("-f", "--format", help="Output formats, comma-separated: html, text, markdown, json "
+                                "(default: from --output extension, else html)", default=None)
     convert_parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     convert_parser.add_argument("--gist", action="store_true", help="Share lesson via GitHub Gist")
     convert_parser.add_argument("--update-gist", help="Update existing gist (provide gist ID)")
     convert_parser.add_argument("--description", help="Custom description for the gist")
+    convert_parser.add_argument("--offline", action="store_true", help="Only use pages from the local HTTP cache")
+    convert_parser.add_argument("--timings", action="store_true", help="Print a per-stage timing and token breakdown")
+    convert_parser.add_argument("--no-stream", action="store_true", help="Do not print the rewritten article as it is generated")
+    
+    # Batch conversion command
+    batch_parser = subparsers.add_parser('batch', help='Convert many articles from a file of URLs')
+    batch_parser.add_argument("input_file", help="File with one URL per line, or JSON lines with a \"url\" field")
+    batch_parser.add_argument("-o", "--output-dir", default="lessons", help="Directory for the generated lessons (default: lessons)")
+    batch_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of articles converted in parallel (default: 4)")
+    batch_parser.add_argument("--job-id", help="Name of this batch job; re-running a job skips finished URLs and resumes "
+                                                "interrupted ones (default: derived from the URL file and output directory)")
+    batch_parser.add_argument("--restart", action="store_true", help="Forget the job's progress and convert every URL again")
+    batch_parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Run a local HTTP API that converts articles from a job queue')
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    serve_parser.add_argument("-w", "--workers", type=int, default=4, help="Number of articles converted in parallel (default: 4)")
+    serve_parser.add_argument("--queue-size", type=int, default=100, help="Jobs that may wait before new ones are refused (default: 100)")
+    serve_parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    
+    # Lesson library commands
+    library_parser = subparsers.add_parser('library', help='Search lessons saved by earlier conversions')
+    library_subparsers = library_parser.add_subparsers(dest='library_command', help='Library operations')
+    
+    # Search lessons
+    search_parser = library_subparsers.add_parser('search', help='Find lessons by topic, text or vocabulary')
+    search_parser.add_argument('query', nargs='*', help='Search words (omit to list recent lessons)')
+    search_parser.add_argument('--word', help='Find lessons that teach this vocabulary word')
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum number of results')
+    
+    # Show a lesson
+    show_parser = library_subparsers.add_parser('show', help='Show a saved lesson')
+    show_parser.add_argument('lesson_id', type=int, help='ID of the lesson (from library search)')
+    show_parser.add_argument('-f', '--format', default='text', help='Output format: html, text, markdown, json (default: text)')
+    show_parser.add_argument('-o', '--output', help='Write to this file instead of printing')
+    
+    # Glossary review commands
+    glossary_parser = subparsers.add_parser('glossary', help='Review the vocabulary definitions reused across lessons')
+    glossary_subparsers = glossary_parser.add_subparsers(dest='glossary_command', help='Glossary operations')
+    
+    # List definitions
+    glossary_list_parser = glossary_subparsers.add_parser('list', help='List stored definitions, most reused first')
+    glossary_list_parser.add_argument('--unvetted', action='store_true', help='Only definitions nobody has vetted yet')
+    glossary_list_parser.add_argument('--limit', type=int, default=50, help='Maximum number of definitions to show')
+    
+    # Vet a definition
+    vet_parser = glossary_subparsers.add_parser('vet', help='Mark a definition as reviewed, optionally correcting it')
+    vet_parser.add_argument('word', help='The word (any inflection)')
+    vet_parser.add_argument('--definition', help='Corrected definition to store instead')
     
     # Gist management commands
     gist_parser = subparsers.add_parser('gist', help='Manage GitHub Gists')
@@ -83,6 +169,7 @@ def main():
     # List gists
     list_parser = gist_subparsers.add_parser('list', help='List all Engoo lesson gists')
     list_parser.add_argument('--limit', type=int, default=10, help='Maximum number of gists to show')
+    list_parser.add_argument('--refresh', action='store_true', help='Re-list every gist from GitHub instead of syncing changes')
     
     # Delete gist
     delete_parser = gist_subparsers.add_parser('delete', help='Delete a specific gist')
@@ -92,6 +179,22 @@ def main():
     # Get gist details
     get_parser = gist_subparsers.add_parser('get', help='Get details of a specific gist')
     get_parser.add_argument('gist_id', help='ID of the gist to retrieve')
+    get_parser.add_argument('--refresh', action='store_true', help='Fetch the gist from GitHub instead of the local index')
+    
+    # Publish many lessons
+    publish_parser = gist_subparsers.add_parser('publish', help='Publish lesson HTML files or directories, bundled into gists with an index page')
+    publish_parser.add_argument('paths', nargs='+', help='Lesson .html files and/or directories of them (e.g. a batch output directory)')
+    publish_parser.add_argument('--description', help='Description for the gist(s)')
+    publish_parser.add_argument('--separate', action='store_true', help='Create one gist per lesson instead of bundles')
+    publish_parser.add_argument('--private', action='store_true', help='Create secret gists')
+    publish_parser.add_argument('-w', '--workers', type=int, default=4, help='Gists created at once (default: 4)')
+    
+    # Sync command
+    sync_parser = gist_subparsers.add_parser('sync', help="Update a directory's bundle gist, uploading only changed lessons")
+    sync_parser.add_argument('directory', help='Directory of lesson .html files')
+    sync_parser.add_argument('--gist-id', help='Bundle gist to sync to (default: the one this directory was synced to before)')
+    sync_parser.add_argument('--description', help='Description for the gist')
+    sync_parser.add_argument('--private', action='store_true', help='Create a secret gist on first sync')
     
     # Global options
     parser.add_argument("--version", action="version", version="%(prog)s 1.0.0")
@@ -102,7 +205,7 @@ def main():
         return
     
     # Handle legacy usage (direct URL without subcommand)
-    if len(sys.argv) > 1 and not sys.argv[1].startswith('-') and sys.argv[1] not in ['convert', 'gist']:
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-') and sys.argv[1] not in ['convert', 'batch', 'serve', 'library', 'glossary', 'gist']:
         # Insert 'convert' command for backward compatibility
         sys.argv.insert(1, 'convert')
     
@@ -111,6 +214,14 @@ def main():
     # Handle commands
     if args.command == 'convert':
         handle_convert_command(args)
+    elif args.command == 'batch':
+        handle_batch_command(args)
+    elif args.command == 'serve':
+        handle_serve_command(args)
+    elif args.command == 'library':
+        handle_library_command(args)
+    elif args.command == 'glossary':
+        handle_glossary_command(args)
     elif args.command == 'gist':
         handle_gist_command(args)
     else:
@@ -120,14 +231,66 @@ def main():
 def handle_convert_command(args):
     """Handle the convert command."""
     if args.verbose:
-        import logging
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.offline:
+        os.environ['ENGOO_OFFLINE'] = '1'
+    
+    try:
+        if args.format:
+            formats = parse_formats(args.format)
+        else:
+            formats = [format_for_path(args.output) if args.output else 'html']
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    # Only the requested formats are rendered; gist sharing needs the HTML too
+    render_formats = list(formats)
+    if (args.gist or args.update_gist) and 'html' not in render_formats:
+        render_formats.append('html')
+    
     print(f"🔄 Converting article from: {args.url}")
     print("📚 Generating professional Engoo-style format...")
     
-    # Convert the article
-    result = convert_url_to_engoo(args.url)
+    # Print the rewritten article as the model writes it; the questions follow once it is complete
+    streamed = []
+    held_logs = HeldLogRecords()
+    
+    def print_body(text):
+        if not streamed:
+            held_logs.hold()
+            print("\n📰 Rewritten article:\n")
+        streamed.append(text)
+        print(text, end='', flush=True)
+    
+    def end_of_body(stage, status):
+        if stage == BODY_STAGE and status == FINISHED and streamed:
+            print("\n", flush=True)
+            held_logs.release()
+    
+    # Convert the article once, rendering every requested format
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(held_logs)
+    try:
+        if args.no_stream:
+            result = convert_url_to_engoo(args.url, formats=render_formats)
+        else:
+            result = convert_url_to_engoo(args.url, formats=render_formats, on_body_delta=print_body,
+                                          on_progress=end_of_body)
+    finally:
+        for handler in logging.getLogger().handlers:
+            handler.removeFilter(held_logs)
+    if held_logs.holding:
+        # The rewrite failed partway, so its stage never finished
+        print("\n")
+        held_logs.release()
+    
+    if args.timings and result.get('metrics'):
+        from src.metrics import format_timings
+        print("\n⏱️  Timings")
+        print(format_timings(result['metrics']))
+        print()
     
     if result['success']:
         print("✅ Conversion successful!")
@@ -138,15 +301,11 @@ def handle_convert_command(args):
         print(f"💬 Discussion: {len(article['discussion_questions'])} questions")
         print(f"🤔 Further Discussion: {len(article['further_discussion_questions'])} questions")
         
-        if args.output:
-            save_to_file(result, args.output)
-        else:
-            # Default to HTML output
-            default_output = "engoo_article.html"
-            with open(default_output, 'w', encoding='utf-8') as f:
-                f.write(article['html'])
-            print(f"✅ Results saved to: {default_output}")
-            args.output = default_output
+        html_output = None
+        for fmt, path in output_paths(args.output, formats):
+            save_to_file(result, path, fmt)
+            if fmt == 'html':
+                html_output = path
             
         # Handle GitHub Gist sharing
         if args.gist or args.update_gist:
@@ -161,7 +320,10 @@ def handle_convert_command(args):
                     gist_id=args.update_gist
                 )
                 
-                print("✅ Lesson shared successfully!")
+                if gist_result.get('unchanged'):
+                    print("✅ Gist already has this lesson; nothing uploaded")
+                else:
+                    print("✅ Lesson shared successfully!")
                 print(f"🔗 Shareable link: {gist_result['preview_url']}")
                 print(f"📝 Gist URL: {gist_result['gist_url']}")
                 print(f"🆔 Gist ID: {gist_result['gist_id']}")
@@ -176,8 +338,8 @@ def handle_convert_command(args):
             except Exception as e:
                 print(f"❌ Failed to share via gist: {e}")
         else:
-            if args.output and args.output.endswith('.html'):
-                print(f"\n🌐 Local file: file://{Path(args.output).absolute()}")
+            if html_output:
+                print(f"\n🌐 Local file: file://{Path(html_output).absolute()}")
                 print("💡 Use --gist flag to share lesson online with students!")
             
     else:
@@ -185,6 +347,189 @@ def handle_convert_command(args):
         sys.exit(1)
 
 
+def handle_batch_command(args):
+    """Handle the batch command."""
+    from src import get_engoo_agent
+    from src.batch import read_url_file, run_batch, default_job_id, restart_job
+    from src.jobs import JobStore
+    
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        # Per-article INFO logs would drown out the progress lines
+        logging.getLogger().setLevel(logging.WARNING)
+    
+    try:
+        urls = read_url_file(args.input_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read URL file: {e}")
+        sys.exit(1)
+    
+    if not urls:
+        print(f"📭 No URLs found in {args.input_file}")
+        return
+    
+    try:
+        agent = get_engoo_agent()
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        sys.exit(1)
+    
+    job_id = args.job_id or default_job_id(args.input_file, args.output_dir)
+    job_store = JobStore()
+    if args.restart:
+        restart_job(agent, job_store, job_id)
+    
+    print(f"🔄 Converting {len(urls)} articles with {args.workers} workers (job {job_id})...")
+    
+    def report(item, completed, total):
+        if item.skipped:
+            print(f"[{completed}/{total}] ⏭️  done earlier: {item.title} -> {item.output_path}")
+        elif item.success:
+            print(f"[{completed}/{total}] ✅ {item.seconds:.1f}s {item.title} -> {item.output_path}")
+        else:
+            print(f"[{completed}/{total}] ❌ {item.seconds:.1f}s {item.url}: {item.error}")
+    
+    try:
+        summary = run_batch(agent, urls, args.output_dir, workers=args.workers, on_item=report,
+                            job_store=job_store, job_id=job_id)
+    except ValueError as e:
+        print(f"❌ {e} (use --restart or a different --job-id)")
+        sys.exit(1)
+    finally:
+        job_store.close()
+    
+    print("-" * 80)
+    print(f"📚 Converted {summary.succeeded}/{len(summary.items)} articles in {summary.wall_seconds:.1f}s")
+    if summary.skipped:
+        print(f"⏭️  {summary.skipped} finished by an earlier run of job {job_id}")
+    print(f"⚡ Throughput: {summary.throughput_per_minute:.1f} lessons/min")
+    print(f"⏱️  Latency: p50 {summary.latency_percentile(50):.1f}s, p95 {summary.latency_percentile(95):.1f}s")
+    print(f"📁 Output directory: {Path(args.output_dir).absolute()}")
+    
+    if summary.failed:
+        print("🔁 Run the same command again to retry the failed articles")
+        sys.exit(1)
+
+
+def handle_serve_command(args):
+    """Handle the serve command."""
+    from src import get_engoo_agent
+    from src.server import ConversionService, create_server
+    
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    try:
+        # Load the agent once; every request reuses its clients, caches and compiled graph
+        agent = get_engoo_agent()
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        sys.exit(1)
+    
+    service = ConversionService(agent, workers=args.workers, max_queue=args.queue_size)
+    try:
+        server = create_server(service, args.host, args.port)
+    except OSError as e:
+        print(f"❌ Cannot listen on {args.host}:{args.port}: {e}")
+        sys.exit(1)
+    
+    host, port = server.server_address[:2]
+    print(f"🚀 Serving on http://{host}:{port} with {service.workers} workers (queue size {args.queue_size})")
+    print(f"   POST /jobs {{\"url\": ...}}, GET /jobs/<id>, GET /jobs/<id>/result, GET /health, GET /metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+        service.shutdown(wait=False)
+
+
+def handle_library_command(args):
+    """Handle lesson library commands."""
+    from datetime import datetime
+    from src.library import LessonLibrary
+    
+    if args.library_command not in ('search', 'show'):
+        print("❌ Please specify a library command: search or show")
+        sys.exit(1)
+    
+    library = LessonLibrary()
+    try:
+        if args.library_command == 'search':
+            if args.word:
+                matches = library.search_word(args.word, limit=args.limit)
+            else:
+                matches = library.search(' '.join(args.query), limit=args.limit)
+            
+            if not matches:
+                print("📭 No matching lessons found.")
+                return
+            
+            for match in matches:
+                created = datetime.fromtimestamp(match.created_at).strftime('%Y-%m-%d')
+                print(f"{match.id:>5}. {match.title}  ({created})")
+                if match.url:
+                    print(f"       🔗 {match.url}")
+                if match.snippet:
+                    print(f"       {' '.join(match.snippet.split())}")
+            return
+        
+        lesson = library.get(args.lesson_id)
+        if lesson is None:
+            print(f"❌ No lesson with ID {args.lesson_id}")
+            sys.exit(1)
+        
+        try:
+            content = render(lesson.article, parse_formats(args.format)[0])
+        except (ValueError, IndexError):
+            print(f"❌ Unsupported format: {args.format}")
+            sys.exit(1)
+        
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(content)
+            print(f"Results saved to: {args.output}")
+        else:
+            if lesson.url:
+                print(f"Source: {lesson.url}\n")
+            print(content)
+    finally:
+        library.close()
+
+
+def handle_glossary_command(args):
+    """Handle glossary review commands."""
+    from src.glossary import Glossary
+    
+    if args.glossary_command not in ('list', 'vet'):
+        print("❌ Please specify a glossary command: list or vet")
+        sys.exit(1)
+    
+    glossary = Glossary()
+    try:
+        if args.glossary_command == 'vet':
+            if not glossary.vet(args.word, args.definition):
+                print(f"❌ '{args.word}' is not in the glossary (pass --definition to add it)")
+                sys.exit(1)
+            print(f"✅ Vetted '{args.word}'")
+            return
+        
+        entries = glossary.entries(unvetted_only=args.unvetted, limit=args.limit)
+        if not entries:
+            print("📭 No definitions to review." if args.unvetted else "📭 The glossary is empty.")
+            return
+        
+        for entry in entries:
+            mark = '✅' if entry.vetted else '❔'
+            print(f"{mark} {entry.word} ({entry.uses} uses): {entry.definition}")
+        stats = glossary.stats()
+        print(f"\n{stats['vetted']} of {stats['entries']} definitions vetted")
+    finally:
+        glossary.close()
+
+
 def handle_gist_command(args):
     """Handle gist management commands."""
     if args.gist_command == 'list':
@@ -193,42 +538,118 @@ def handle_gist_command(args):
         handle_delete_gist(args)
     elif args.gist_command == 'get':
         handle_get_gist(args)
+    elif args.gist_command == 'publish':
+        handle_publish_gists(args)
+    elif args.gist_command == 'sync':
+        handle_sync_gist(args)
     else:
-        print("❌ Please specify a gist command: list, delete, or get")
+        print("❌ Please specify a gist command: list, delete, get, publish, or sync")
         sys.exit(1)
 
 
-def handle_list_gists(args):
-    """Handle listing gists."""
+def handle_publish_gists(args):
+    """Handle publishing many lessons."""
     try:
         from src.github_gist import GitHubGistClient
         
-        print("📋 Listing your Engoo lesson gists...")
         client = GitHubGistClient()
-        result = client.list_gists()
+        mode = "one gist per lesson" if args.separate else "bundled with an index page"
+        print(f"📤 Publishing lessons ({mode})...")
+        try:
+            results = client.publish_directory(args.paths, bundle=not args.separate, description=args.description,
+                                               public=not args.private, workers=args.workers)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot publish: {e}")
+            sys.exit(1)
         
-        if result['success']:
-            gists = result['gists'][:args.limit]
-            
-            if not gists:
-                print("📭 No Engoo lesson gists found.")
-                print("💡 Create your first lesson with: engoo-writer convert <url> --gist")
-                return
-            
-            print(f"\n📚 Found {result['total_count']} Engoo lesson gists:")
-            print("-" * 80)
+        for result in results:
+            if not result['success']:
+                print(f"❌ {result['error']}")
+                continue
+            print(f"✅ {result['description']}")
+            print(f"   🔗 Shareable link: {result['preview_url']}")
+            print(f"   🆔 Gist ID: {result['gist_id']}")
+            for lesson in result.get('lessons', []):
+                print(f"   • {lesson['title']}: {lesson['preview_url']}")
+        
+        if not all(result['success'] for result in results):
+            sys.exit(1)
             
-            for i, gist in enumerate(gists, 1):
-                print(f"{i}. {gist['description']}")
-                print(f"   🆔 ID: {gist['id']}")
-                print(f"   � Created: {gist['created_at'][:10]}")
-                print(f"   🔗 Preview: {gist['preview_url']}")
-                print(f"   🌐 GitHub: {gist['html_url']}")
-                print()
-                
-        else:
-            print(f"❌ Failed to list gists: {result['error']}")
+    except ValueError as e:
+        print(f"❌ GitHub configuration error: {e}")
+        print("💡 Set your GITHUB_TOKEN environment variable to use gist management.")
+        sys.exit(1)
+
+
+def handle_sync_gist(args):
+    """Handle syncing a lesson directory to its bundle gist."""
+    try:
+        from src.github_gist import GitHubGistClient
+        
+        client = GitHubGistClient()
+        print(f"🔄 Syncing {args.directory}...")
+        try:
+            result = client.sync_bundle(args.directory, gist_id=args.gist_id, description=args.description,
+                                        public=not args.private)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot sync: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ {e}")
             sys.exit(1)
+        
+        if result['created']:
+            print(f"✅ Created bundle with {len(result['lessons'])} lessons")
+        elif result['changed'] or result['removed']:
+            print(f"✅ Uploaded {len(result['changed'])} changed lesson(s), removed {len(result['removed'])}")
+        else:
+            print("✅ Already up to date; nothing uploaded")
+        print(f"   🔗 Shareable link: {result['preview_url']}")
+        print(f"   🆔 Gist ID: {result['gist_id']}")
+            
+    except ValueError as e:
+        print(f"❌ GitHub configuration error: {e}")
+        print("💡 Set your GITHUB_TOKEN environment variable to use gist management.")
+        sys.exit(1)
+
+
+def handle_list_gists(args):
+    """Handle listing gists."""
+    try:
+        import time
+        from src.github_gist import GitHubGistClient, INDEX_MAX_AGE
+        
+        client = GitHubGistClient()
+        
+        # The local index answers the listing; sync it when stale or asked to
+        last_synced = client.index.last_synced_time
+        if args.refresh or last_synced is None or time.time() - last_synced > INDEX_MAX_AGE:
+            print("🔄 Re-listing all your gists..." if args.refresh else "🔄 Syncing your Engoo lesson gists...")
+            sync = client.sync_index(refresh=args.refresh)
+            if not sync['success']:
+                if last_synced is None:
+                    print(f"❌ Failed to list gists: {sync['error']}")
+                    sys.exit(1)
+                print(f"⚠️  Could not sync with GitHub ({sync['error']}); showing saved list")
+        
+        total_count = client.index.count()
+        gists = client.index.list(limit=args.limit)
+        
+        if not gists:
+            print("📭 No Engoo lesson gists found.")
+            print("💡 Create your first lesson with: engoo-writer convert <url> --gist")
+            return
+        
+        print(f"\n📚 Found {total_count} Engoo lesson gists:")
+        print("-" * 80)
+        
+        for i, gist in enumerate(gists, 1):
+            print(f"{i}. {gist['description']}")
+            print(f"   🆔 ID: {gist['id']}")
+            print(f"   � Created: {gist['created_at'][:10]}")
+            print(f"   🔗 Preview: {gist['preview_url']}")
+            print(f"   🌐 GitHub: {gist['html_url']}")
+            print()
             
     except ValueError as e:
         print(f"❌ GitHub configuration error: {e}")
@@ -244,8 +665,8 @@ def handle_delete_gist(args):
         
         client = GitHubGistClient()
         
-        # First, get gist details to confirm
-        gist_result = client.get_gist(args.gist_id)
+        # First, get gist details to confirm (from the local index when possible)
+        gist_result = client.lookup_gist(args.gist_id)
         
         if not gist_result['success']:
             print(f"❌ Failed to find gist {args.gist_id}: {gist_result['error']}")
@@ -286,7 +707,7 @@ def handle_get_gist(args):
         from src.github_gist import GitHubGistClient
         
         client = GitHubGistClient()
-        result = client.get_gist(args.gist_id)
+        result = client.get_gist(args.gist_id) if args.refresh else client.lookup_gist(args.gist_id)
         
         if result['success']:
             gist = result['gist']
@@ -1,5 +1,6 @@
 import os
 import logging
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,44 +14,134 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Process-wide agent shared by library callers, see get_engoo_agent()
+_shared_agent = None
+_shared_agent_lock = threading.Lock()
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ('0', 'false', 'no', 'off', '')
+
 
 def create_engoo_agent():
     """Create and configure the Engoo news agent."""
     try:
-        from openai import OpenAI
+        from openai import OpenAI, AsyncOpenAI
         from .agent import EngooNewsAgent
         from .processor import ContentProcessor
+        from .llm_cache import LLMCache
+        from .http_cache import HTTPCache
+        from .scraper import WebScraper
+        from .tokens import TokenBudget
+        from .rate_limit import get_default_governor
+        from .library import LessonLibrary
+        from .glossary import Glossary
+        from .jobs import create_checkpointer
         
         # Initialize OpenAI client
         openai_api_key = os.getenv('OPENAI_API_KEY')
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
-        openai_client = OpenAI(api_key=openai_api_key)
+        # Retries are left to the shared rate-limit governor, which also
+        # paces concurrency across every worker in the process
+        openai_client = OpenAI(api_key=openai_api_key, max_retries=0)
+        async_openai_client = AsyncOpenAI(api_key=openai_api_key, max_retries=0)
+        
+        # Cache LLM responses so reprocessing an article costs no tokens
+        llm_cache = None
+        if _env_flag('ENGOO_LLM_CACHE', True):
+            llm_cache = LLMCache()
+        
+        # Reuse vocabulary definitions across lessons instead of regenerating them
+        glossary = None
+        if _env_flag('ENGOO_GLOSSARY', True):
+            glossary = Glossary()
         
-        # Create content processor
-        content_processor = ContentProcessor(openai_client)
+        # Create content processor; independent sections run in parallel
+        content_processor = ContentProcessor(
+            openai_client,
+            concurrent=True,
+            cache=llm_cache,
+            async_client=async_openai_client,
+            token_budget=TokenBudget.from_env(),
+            governor=get_default_governor(),
+            glossary=glossary
+        )
         
-        # Create and return agent
-        return EngooNewsAgent(content_processor)
+        # Cache scraped pages on disk; offline mode serves only cached pages
+        http_cache = None
+        offline = _env_flag('ENGOO_OFFLINE', False)
+        if offline or _env_flag('ENGOO_HTTP_CACHE', True):
+            http_cache = HTTPCache(offline=offline)
+        scraper = WebScraper(http_cache=http_cache)
+        
+        # Keep every generated lesson in the local, searchable library
+        library = None
+        if _env_flag('ENGOO_LIBRARY', True):
+            library = LessonLibrary()
+        
+        # Checkpoint batch conversions after every graph node so interrupted jobs resume
+        checkpointer = None
+        if _env_flag('ENGOO_CHECKPOINTS', True):
+            try:
+                checkpointer = create_checkpointer()
+            except ImportError as e:
+                logger.warning(f"langgraph-checkpoint-sqlite not installed, batch jobs resume per URL only: {e}")
+        
+        # Create and return agent; ENGOO_METRICS_LOG appends per-conversion metrics as JSON lines
+        return EngooNewsAgent(
+            content_processor,
+            scraper=scraper,
+            metrics_log=os.getenv('ENGOO_METRICS_LOG'),
+            library=library,
+            checkpointer=checkpointer
+        )
     except ImportError as e:
         logger.error(f"Import error: {e}")
         raise
 
 
-def convert_url_to_engoo(url: str) -> dict:
+def get_engoo_agent():
+    """
+    Get the process-wide Engoo news agent, creating it on first use.
+    
+    The agent is safe to share between threads: its OpenAI client, scraper
+    session and compiled graph are reused, so connections stay alive and the
+    graph is compiled once per process.
+    
+    Returns:
+        The shared EngooNewsAgent
+    """
+    global _shared_agent
+    if _shared_agent is None:
+        with _shared_agent_lock:
+            if _shared_agent is None:
+                _shared_agent = create_engoo_agent()
+    return _shared_agent
+
+
+def convert_url_to_engoo(url: str, formats=('html',), on_body_delta=None, on_progress=None) -> dict:
     """
     Convert an article URL to Engoo daily news format.
     
     Args:
         url: The URL of the article to convert
+        formats: Output formats to render into result['article'] ('html', 'text', 'markdown', 'json')
+        on_body_delta: Optional callback receiving the rewritten article body
+            piece by piece as the model streams it
+        on_progress: Optional callback(stage, status) as stages start and finish
         
     Returns:
         Dictionary containing the conversion result
     """
     try:
-        agent = create_engoo_agent()
-        result = agent.convert_article(url)
+        agent = get_engoo_agent()
+        result = agent.convert_article(url, formats=formats, on_body_delta=on_body_delta, on_progress=on_progress)
         return result
     except Exception as e:
         logger.error(f"Error converting URL {url}: {e}")
@@ -61,6 +152,29 @@ def convert_url_to_engoo(url: str) -> dict:
         }
 
 
+async def convert_url_to_engoo_async(url: str, formats=('html',)) -> dict:
+    """
+    Async variant of convert_url_to_engoo for use inside an event loop.
+    
+    Args:
+        url: The URL of the article to convert
+        formats: Output formats to render, as for convert_url_to_engoo
+        
+    Returns:
+        Dictionary containing the conversion result
+    """
+    try:
+        agent = get_engoo_agent()
+        return await agent.convert_article_async(url, formats=formats)
+    except Exception as e:
+        logger.error(f"Error converting URL {url}: {e}")
+        return {
+            'success': False,
+            'url': url,
+            'error': str(e)
+        }
+
+
 if __name__ == "__main__":
     # Example usage
     example_url = "https://example.com/article"
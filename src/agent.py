@@ -1,15 +1,29 @@
-from typing import Dict, Any, List, Optional, TypedDict
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, TypedDict
 from langgraph.graph import StateGraph, END
+import asyncio
+import functools
 import logging
+import queue
+import threading
 
 try:
     from .models import EngooArticle
     from .scraper import WebScraper
     from .processor import ContentProcessor
+    from .aio import LoopLocalSemaphore
+    from .renderers import parse_formats, render
+    from .library import LessonLibrary
+    from . import metrics
+    from . import progress
 except ImportError:
     from models import EngooArticle
     from scraper import WebScraper
     from processor import ContentProcessor
+    from aio import LoopLocalSemaphore
+    from renderers import parse_formats, render
+    from library import LessonLibrary
+    import metrics
+    import progress
 
 logger = logging.getLogger(__name__)
 
@@ -21,25 +35,59 @@ class AgentState(TypedDict):
     engoo_article: Optional[EngooArticle]
     error: str
     completed: bool
+    lesson_id: Optional[int]
 
 
 class EngooNewsAgent:
     """Main agent class that orchestrates the conversion process using LangGraph."""
     
-    def __init__(self, content_processor: ContentProcessor):
-        self.scraper = WebScraper()
+    def __init__(self,
+                 content_processor: ContentProcessor,
+                 scraper: Optional[WebScraper] = None,
+                 max_concurrent_scrapes: int = 8,
+                 metrics_log: Optional[str] = None,
+                 library: Optional[LessonLibrary] = None,
+                 checkpointer: Optional[Any] = None):
+        """
+        Initialize the agent.
+        
+        Args:
+            content_processor: Processor that turns scraped content into lessons
+            scraper: Scraper for article pages (default: a new WebScraper)
+            max_concurrent_scrapes: Limit on in-flight downloads for convert_article_async
+            metrics_log: Optional JSON-lines file that receives each conversion's metrics
+            library: Optional lesson library that stores every successful conversion
+            checkpointer: Optional LangGraph checkpointer; conversions given a
+                thread_id save their state after every node and resume from it
+        """
+        self.scraper = scraper or WebScraper()
         self.processor = content_processor
+        self.scrape_semaphore = LoopLocalSemaphore(max_concurrent_scrapes)
+        self.metrics_log = metrics_log
+        self.library = library
+        self.checkpointer = checkpointer
         self.graph = self._build_graph()
+        
+        # Runs with a thread_id use a second compilation that checkpoints every node
+        self.checkpointed_graph = self._build_graph(checkpointer=checkpointer) if checkpointer is not None else None
+        
+        # The async graph is compiled on first use of convert_article_async
+        self._async_graph = None
+        self._async_graph_lock = threading.Lock()
     
-    def _build_graph(self):
-        """Build the LangGraph workflow."""
+    def _build_graph(self, use_async: bool = False, checkpointer: Optional[Any] = None):
+        """Build the LangGraph workflow, with async scrape/process nodes and a checkpointer if requested."""
         workflow = StateGraph(AgentState)
         
-        # Add nodes
-        workflow.add_node("scrape_content", self._scrape_content)
-        workflow.add_node("validate_content", self._validate_content)
-        workflow.add_node("process_content", self._process_content)
-        workflow.add_node("finalize", self._finalize)
+        # Add nodes, each timed into the conversion metrics and reported as a progress stage
+        nodes = {
+            "scrape_content": self._ascrape_content if use_async else self._scrape_content,
+            "validate_content": self._validate_content,
+            "process_content": self._aprocess_content if use_async else self._process_content,
+            "finalize": self._finalize
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, self._timed(name, node))
         
         # Add edges
         workflow.set_entry_point("scrape_content")
@@ -55,7 +103,22 @@ class EngooNewsAgent:
         workflow.add_edge("process_content", "finalize")
         workflow.add_edge("finalize", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+    
+    def _timed(self, name: str, node: Callable[[AgentState], Any]) -> Callable[[AgentState], Any]:
+        """Wrap a graph node so its wall time is recorded as a stage and its start and end are reported."""
+        if asyncio.iscoroutinefunction(node):
+            @functools.wraps(node)
+            async def timed_async_node(state: AgentState) -> AgentState:
+                with progress.step(name), metrics.stage(name):
+                    return await node(state)
+            return timed_async_node
+        
+        @functools.wraps(node)
+        def timed_node(state: AgentState) -> AgentState:
+            with progress.step(name), metrics.stage(name):
+                return node(state)
+        return timed_node
     
     def _scrape_content(self, state: AgentState) -> AgentState:
         """Node: Scrape content from the provided URL."""
@@ -75,6 +138,25 @@ class EngooNewsAgent:
         
         return state
     
+    async def _ascrape_content(self, state: AgentState) -> AgentState:
+        """Node: Scrape content from the provided URL (async)."""
+        logger.info(f"Scraping content from: {state['url']}")
+        
+        try:
+            async with self.scrape_semaphore:
+                raw_content = await self.scraper.aextract_article_content(state["url"])
+            if raw_content:
+                state["raw_content"] = raw_content
+                logger.info(f"Successfully scraped content: {raw_content['title']}")
+            else:
+                state["error"] = "Failed to scrape content from URL"
+                logger.error(state["error"])
+        except Exception as e:
+            state["error"] = f"Error during scraping: {str(e)}"
+            logger.error(state["error"])
+        
+        return state
+    
     def _validate_content(self, state: AgentState) -> AgentState:
         """Node: Validate that the scraped content is suitable for processing."""
         if state["error"]:
@@ -113,6 +195,26 @@ class EngooNewsAgent:
         try:
             state["engoo_article"] = self.processor.process_article(state["raw_content"])
             logger.info("Content processing completed successfully")
+        except progress.ConversionCancelled:
+            raise
+        except Exception as e:
+            state["error"] = f"Error during content processing: {str(e)}"
+            logger.error(state["error"])
+        
+        return state
+    
+    async def _aprocess_content(self, state: AgentState) -> AgentState:
+        """Node: Process the raw content into Engoo format (async)."""
+        if state["error"]:
+            return state
+        
+        logger.info("Processing content into Engoo format")
+        
+        try:
+            state["engoo_article"] = await self.processor.aprocess_article(state["raw_content"])
+            logger.info("Content processing completed successfully")
+        except progress.ConversionCancelled:
+            raise
         except Exception as e:
             state["error"] = f"Error during content processing: {str(e)}"
             logger.error(state["error"])
@@ -124,34 +226,162 @@ class EngooNewsAgent:
         if not state["error"] and state["engoo_article"]:
             state["completed"] = True
             logger.info("Article conversion completed successfully")
+            
+            if self.library is not None:
+                # A library problem must not lose the lesson that was just generated
+                try:
+                    state["lesson_id"] = self.library.save(state["engoo_article"], url=state["url"])
+                except Exception as e:
+                    logger.warning(f"Could not save lesson to library: {e}")
         else:
             logger.error(f"Article conversion failed: {state['error']}")
         
         return state
     
-    def convert_article(self, url: str) -> Dict[str, Any]:
+    def convert_article(self,
+                        url: str,
+                        formats: Iterable[str] = ('html',),
+                        thread_id: Optional[str] = None,
+                        on_progress: Optional[progress.ProgressCallback] = None,
+                        cancel_event: Optional[threading.Event] = None,
+                        on_body_delta: Optional[progress.TextCallback] = None) -> Dict[str, Any]:
         """
         Convert an article from a URL to Engoo daily news format.
         
         Args:
             url: The URL of the article to convert
+            formats: Output formats to render ('html', 'text', 'markdown', 'json');
+                each is added to result['article'] under its own name. Pass ()
+                to skip rendering; the lesson fields can be rendered later with
+                renderers.render(EngooArticle.from_dict(result['article']), fmt).
+            thread_id: Checkpoint thread for this conversion. When the agent has a
+                checkpointer, a run of the same URL that was interrupted under this
+                thread resumes after its last completed node instead of starting over.
+            on_progress: Called with (stage, status) as graph nodes and lesson
+                sections start and finish, possibly from worker threads
+            cancel_event: Set it to stop the conversion at the next stage or
+                section; the result then has 'cancelled': True
+            on_body_delta: Stream the article rewrite, calling this with each piece
+                of the body as the model writes it (see also stream_article)
+            
+        Returns:
+            Dictionary containing the result; 'metrics' holds stage timings,
+            bytes downloaded and OpenAI token usage
+        """
+        formats = parse_formats(formats)
+        graph, graph_input, config = self.graph, self._initial_state(url), None
+        if thread_id is not None and self.checkpointed_graph is not None:
+            graph = self.checkpointed_graph
+            config = {"configurable": {"thread_id": thread_id}}
+            if self._is_interrupted(url, config):
+                # A None input continues the pending nodes of the saved run
+                graph_input = None
+        
+        with metrics.collect(url) as conversion_metrics, progress.track(on_progress, cancel_event), \
+                progress.stream_body(on_body_delta):
+            try:
+                final_state = graph.invoke(graph_input, config)
+                result = self._build_result(url, final_state, formats)
+            except progress.ConversionCancelled:
+                result = self._cancelled_result(url)
+        return self._attach_metrics(result, conversion_metrics)
+    
+    async def convert_article_async(self,
+                                    url: str,
+                                    formats: Iterable[str] = ('html',),
+                                    on_progress: Optional[progress.ProgressCallback] = None,
+                                    cancel_event: Optional[threading.Event] = None,
+                                    on_body_delta: Optional[progress.TextCallback] = None) -> Dict[str, Any]:
+        """
+        Convert an article from a URL to Engoo daily news format without blocking the event loop.
+        
+        Many conversions can run concurrently on one loop; downloads and LLM calls
+        are bounded by the scrape and LLM semaphores.
+        
+        Args:
+            url: The URL of the article to convert
+            formats: Output formats to render, as for convert_article
+            on_progress: Progress callback, as for convert_article
+            cancel_event: Cancellation event, as for convert_article
+            on_body_delta: Body stream callback, as for convert_article
+            
+        Returns:
+            Dictionary containing the result, same shape as convert_article
+        """
+        formats = parse_formats(formats)
+        if self._async_graph is None:
+            with self._async_graph_lock:
+                if self._async_graph is None:
+                    self._async_graph = self._build_graph(use_async=True)
+        
+        with metrics.collect(url) as conversion_metrics, progress.track(on_progress, cancel_event), \
+                progress.stream_body(on_body_delta):
+            try:
+                final_state = await self._async_graph.ainvoke(self._initial_state(url))
+                result = self._build_result(url, final_state, formats)
+            except progress.ConversionCancelled:
+                result = self._cancelled_result(url)
+        return self._attach_metrics(result, conversion_metrics)
+    
+    def stream_article(self, url: str, formats: Iterable[str] = ('html',)) -> 'ArticleStream':
+        """
+        Convert an article on a background thread, iterating over the rewritten body as it is written.
+        
+        Example:
+            stream = agent.stream_article(url)
+            for text in stream:
+                print(text, end='', flush=True)
+            result = stream.result
+        
+        Args:
+            url: The URL of the article to convert
+            formats: Output formats to render, as for convert_article
             
         Returns:
-            Dictionary containing the result
+            ArticleStream yielding body text; its result is set once iteration ends
         """
-        # Initialize state
-        initial_state: AgentState = {
+        return ArticleStream(self, url, formats)
+    
+    def _is_interrupted(self, url: str, config: Dict[str, Any]) -> bool:
+        """Check whether the checkpoint thread holds an unfinished run for this URL."""
+        snapshot = self.checkpointed_graph.get_state(config)
+        if snapshot.next and snapshot.values.get("url") == url:
+            logger.info(f"Resuming {url} at {', '.join(snapshot.next)}")
+            return True
+        return False
+    
+    def discard_checkpoint(self, thread_id: str) -> None:
+        """Delete the saved state of a checkpoint thread, e.g. once its lesson has been written."""
+        if self.checkpointer is not None:
+            self.checkpointer.delete_thread(thread_id)
+    
+    def _initial_state(self, url: str) -> AgentState:
+        """Create the starting graph state for a URL."""
+        return {
             "url": url,
             "raw_content": {},
             "engoo_article": None,
             "error": "",
-            "completed": False
+            "completed": False,
+            "lesson_id": None
         }
-        
-        # Run the graph
-        final_state = self.graph.invoke(initial_state)
-        
-        # Return results
+    
+    def _cancelled_result(self, url: str) -> Dict[str, Any]:
+        """Result of a conversion stopped through its cancel event."""
+        logger.info(f"Conversion of {url} cancelled")
+        return {'success': False, 'url': url, 'error': "Conversion cancelled", 'cancelled': True}
+    
+    def _attach_metrics(self, result: Dict[str, Any], conversion_metrics: 'metrics.ConversionMetrics') -> Dict[str, Any]:
+        """Add the conversion metrics to a result and append them to the metrics log."""
+        record = conversion_metrics.to_dict()
+        record['success'] = result['success']
+        result['metrics'] = record
+        if self.metrics_log:
+            metrics.append_metrics_log(self.metrics_log, record)
+        return result
+    
+    def _build_result(self, url: str, final_state: AgentState, formats: List[str]) -> Dict[str, Any]:
+        """Turn the final graph state into the result dictionary, rendering only the requested formats."""
         result = {
             'success': final_state["completed"],
             'url': url,
@@ -160,20 +390,70 @@ class EngooNewsAgent:
         
         if final_state["completed"] and final_state["engoo_article"]:
             engoo_article = final_state["engoo_article"]
-            result['article'] = {
-                'title': engoo_article.title,
-                'vocabulary': [
-                    {
-                        'word': vocab.word,
-                        'definition': vocab.definition,
-                        'example': vocab.example
-                    }
-                    for vocab in engoo_article.vocabulary
-                ],
-                'article_body': engoo_article.article_body,
-                'discussion_questions': [q.question for q in engoo_article.discussion_questions],
-                'further_discussion_questions': [q.question for q in engoo_article.further_discussion_questions],
-                'html': engoo_article.to_html()
-            }
+            result['article'] = engoo_article.to_dict()
+            if final_state.get("lesson_id") is not None:
+                result['lesson_id'] = final_state["lesson_id"]
+            for fmt in formats:
+                result['article'][fmt] = render(engoo_article, fmt)
         
         return result
+
+
+class ArticleStream:
+    """
+    Iterator over the article body of a conversion running on a background thread.
+    
+    Yields body text as the model writes it and stops when the conversion
+    finishes, after which `result` holds the conversion result. Closing the
+    stream early, or leaving its with-block, cancels the conversion.
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, agent: EngooNewsAgent, url: str, formats: Iterable[str] = ('html',)):
+        """
+        Start the conversion.
+        
+        Args:
+            agent: Agent that converts the article
+            url: The URL of the article to convert
+            formats: Output formats to render, as for convert_article
+        """
+        self.result: Optional[Dict[str, Any]] = None
+        self._deltas: queue.Queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(agent, url, list(formats)), daemon=True)
+        self._thread.start()
+    
+    def _run(self, agent: EngooNewsAgent, url: str, formats: List[str]) -> None:
+        try:
+            self.result = agent.convert_article(url, formats, cancel_event=self._cancel_event,
+                                                on_body_delta=self._deltas.put)
+        except Exception as e:
+            logger.error(f"Error converting URL {url}: {e}")
+            self.result = {'success': False, 'url': url, 'error': str(e)}
+        finally:
+            self._deltas.put(self._DONE)
+    
+    def __iter__(self) -> Iterator[str]:
+        return self
+    
+    def __next__(self) -> str:
+        delta = self._deltas.get()
+        if delta is self._DONE:
+            self._deltas.put(self._DONE)
+            self._thread.join()
+            raise StopIteration
+        return delta
+    
+    def close(self) -> None:
+        """Cancel the conversion if it is still running and wait for it to stop."""
+        if self._thread.is_alive():
+            self._cancel_event.set()
+        self._thread.join()
+    
+    def __enter__(self) -> 'ArticleStream':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
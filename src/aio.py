@@ -0,0 +1,38 @@
+"""
+Asyncio helpers shared by the async conversion pipeline.
+"""
+
+import asyncio
+import threading
+import weakref
+
+
+class LoopLocalSemaphore:
+    """
+    Concurrency limit usable from any event loop.
+    
+    asyncio primitives are bound to the loop they are first used on, while the
+    agent outlives individual asyncio.run() calls. Each running loop gets its
+    own semaphore with the same limit.
+    """
+    
+    def __init__(self, value: int):
+        self.value = value
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.value)
+                self._semaphores[loop] = semaphore
+            return semaphore
+    
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore().release()
@@ -0,0 +1,230 @@
+"""
+Batch conversion of many article URLs with bounded parallelism.
+Batches can run as named jobs that record per-URL status and resume after an interruption.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+try:
+    from .jobs import JobStore, DONE, thread_id
+except ImportError:
+    from jobs import JobStore, DONE, thread_id
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of converting a single URL in a batch."""
+    index: int
+    url: str
+    success: bool
+    seconds: float
+    title: Optional[str] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate results of a batch run."""
+    items: List[BatchItemResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.items if item.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.items) - self.succeeded
+
+    @property
+    def skipped(self) -> int:
+        """Items finished by an earlier run of the same job."""
+        return sum(1 for item in self.items if item.skipped)
+
+    @property
+    def throughput_per_minute(self) -> float:
+        """Lessons converted by this run per minute of wall-clock time."""
+        converted = self.succeeded - self.skipped
+        return converted * 60 / self.wall_seconds if self.wall_seconds else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Per-item latency of this run's conversions at the given percentile (0-100), nearest-rank."""
+        latencies = sorted(item.seconds for item in self.items if not item.skipped)
+        if not latencies:
+            return 0.0
+        rank = max(0, math.ceil(percentile / 100 * len(latencies)) - 1)
+        return latencies[rank]
+
+
+def read_url_file(path: Union[str, Path]) -> List[str]:
+    """
+    Read article URLs from a plain text or JSON-lines file.
+
+    Plain text files have one URL per line; blank lines and lines starting with
+    '#' are ignored. JSON lines must be objects with a "url" field.
+
+    Args:
+        path: Path to the URL file
+
+    Returns:
+        List of URLs in file order
+    """
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                try:
+                    url = json.loads(line).get('url')
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON on line {line_number} of {path}: {e}")
+                if not url:
+                    raise ValueError(f"Missing \"url\" on line {line_number} of {path}")
+                urls.append(url)
+            else:
+                urls.append(line)
+    return urls
+
+
+def default_job_id(input_file: Union[str, Path], output_dir: Union[str, Path]) -> str:
+    """Job id for a URL file and output directory, so re-running the same command resumes it."""
+    key = f"{Path(input_file).resolve()}\0{Path(output_dir).resolve()}"
+    return f"{Path(input_file).stem}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
+
+
+def lesson_filename(index: int, title: str) -> str:
+    """Build a stable, filesystem-safe lesson filename from its position and title."""
+    slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:60] or 'lesson'
+    return f"{index:03d}_{slug}.html"
+
+
+def restart_job(agent: Any, job_store: JobStore, job_id: str) -> bool:
+    """
+    Forget a job's progress, including the agent checkpoints of its interrupted items.
+
+    Args:
+        agent: EngooNewsAgent whose checkpointer holds the job's threads
+        job_store: Store holding the job
+        job_id: Job to forget
+
+    Returns:
+        True if the job existed
+    """
+    for job_item in job_store.items(job_id):
+        agent.discard_checkpoint(thread_id(job_id, job_item.position))
+    return job_store.delete(job_id)
+
+
+def run_batch(agent: Any,
+              urls: List[str],
+              output_dir: Union[str, Path],
+              workers: int = 4,
+              on_item: Optional[Callable[[BatchItemResult, int, int], None]] = None,
+              job_store: Optional[JobStore] = None,
+              job_id: Optional[str] = None) -> BatchSummary:
+    """
+    Convert many URLs with one shared agent and a bounded worker pool.
+
+    With a job store and job id, each URL's status is recorded as it changes.
+    Running the same job again skips URLs whose lesson is already written,
+    retries failed ones and resumes interrupted ones from their agent checkpoint.
+
+    Args:
+        agent: EngooNewsAgent used for every conversion
+        urls: Article URLs to convert
+        output_dir: Directory that receives one HTML lesson per successful URL
+        workers: Maximum number of conversions in flight
+        on_item: Optional callback(item, completed, total) invoked as items finish
+        job_store: Optional store for per-URL job status
+        job_id: Job name; required with job_store
+
+    Returns:
+        BatchSummary with per-item results in input order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if job_store is not None and not job_id:
+        raise ValueError("job_id is required when a job store is given")
+
+    def convert_one(index: int, url: str) -> BatchItemResult:
+        start = time.perf_counter()
+        item_thread = None
+        try:
+            if job_store is not None:
+                item_thread = thread_id(job_id, index)
+                job_store.mark_running(job_id, index)
+                result = agent.convert_article(url, thread_id=item_thread)
+            else:
+                result = agent.convert_article(url)
+        except Exception as e:
+            logger.error(f"Error converting URL {url}: {e}")
+            result = {'success': False, 'url': url, 'error': str(e)}
+
+        if not result['success']:
+            if job_store is not None:
+                job_store.mark_failed(job_id, index, result['error'])
+            return BatchItemResult(index, url, False, time.perf_counter() - start, error=result['error'])
+
+        article = result['article']
+        output_path = output_dir / lesson_filename(index, article['title'])
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(article['html'])
+        except OSError as e:
+            # A full disk or unwritable directory fails this lesson, not the whole batch
+            logger.error(f"Error writing lesson for {url}: {e}")
+            error = f"Cannot write {output_path}: {e}"
+            if job_store is not None:
+                job_store.mark_failed(job_id, index, error)
+            return BatchItemResult(index, url, False, time.perf_counter() - start, error=error)
+
+        if job_store is not None:
+            job_store.mark_done(job_id, index, article['title'], str(output_path))
+            # The lesson is on disk, so its checkpoints are no longer needed
+            agent.discard_checkpoint(item_thread)
+
+        return BatchItemResult(index, url, True, time.perf_counter() - start,
+                               title=article['title'], output_path=str(output_path))
+
+    summary = BatchSummary()
+    pending = list(enumerate(urls, 1))
+    if job_store is not None:
+        pending = []
+        for job_item in job_store.start(job_id, urls):
+            if job_item.status == DONE and job_item.output_path and Path(job_item.output_path).exists():
+                summary.items.append(BatchItemResult(job_item.position, job_item.url, True, 0.0,
+                                                     title=job_item.title, output_path=job_item.output_path,
+                                                     skipped=True))
+            else:
+                pending.append((job_item.position, job_item.url))
+        if on_item:
+            for completed, item in enumerate(summary.items, 1):
+                on_item(item, completed, len(urls))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(convert_one, index, url) for index, url in pending]
+        for future in as_completed(futures):
+            item = future.result()
+            summary.items.append(item)
+            if on_item:
+                on_item(item, len(summary.items), len(urls))
+
+    summary.wall_seconds = time.perf_counter() - start
+    summary.items.sort(key=lambda item: item.index)
+    return summary
@@ -0,0 +1,246 @@
+"""
+Local index of Engoo lesson gists.
+Keeps gist metadata in SQLite so listing and lookup need no API call and work offline,
+along with content hashes of the files this tool uploaded, so unchanged lessons are not re-sent.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    from .paths import get_data_dir
+except ImportError:
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a gist file's content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class GistIndex:
+    """SQLite-backed copy of the metadata of one account's Engoo gists."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            path: SQLite database file (default: gists.sqlite3 in the data dir)
+        """
+        self.path = Path(path) if path else get_data_dir() / 'gists.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS gists (
+                id TEXT PRIMARY KEY,
+                description TEXT,
+                public INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                html_url TEXT NOT NULL,
+                preview_url TEXT,
+                files TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                gist_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                PRIMARY KEY (gist_id, filename)
+            );
+            CREATE TABLE IF NOT EXISTS bundle_dirs (
+                path TEXT PRIMARY KEY,
+                gist_id TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def upsert(self, gists: Iterable[Dict[str, Any]]) -> None:
+        """
+        Store or replace gist summaries.
+
+        Args:
+            gists: Summaries as returned by GitHubGistClient.get_gist()['gist'],
+                with 'raw_urls' mapping file names to raw URLs
+        """
+        rows = [
+            (
+                gist['id'], gist.get('description'), int(bool(gist.get('public'))),
+                gist['created_at'], gist['updated_at'], gist['html_url'], gist.get('preview_url'),
+                json.dumps(gist.get('raw_urls') or {name: None for name in gist.get('files', [])})
+            )
+            for gist in gists
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            # A gist changed since we recorded its hashes (e.g. edited on github.com) may differ from them
+            self._conn.executemany(
+                "DELETE FROM file_hashes WHERE gist_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM gists WHERE id = ? AND updated_at = ?)",
+                [(row[0], row[0], row[4]) for row in rows]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO gists (id, description, public, created_at, updated_at, html_url, "
+                "preview_url, files) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def remove(self, gist_ids: Iterable[str]) -> int:
+        """
+        Drop gists from the index.
+
+        Returns:
+            Number of gists removed
+        """
+        ids = [(gist_id,) for gist_id in gist_ids]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM file_hashes WHERE gist_id = ?", ids)
+            self._conn.executemany("DELETE FROM bundle_dirs WHERE gist_id = ?", ids)
+            return self._conn.executemany("DELETE FROM gists WHERE id = ?", ids).rowcount
+
+    def replace_all(self, gists: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole index with a complete listing."""
+        gists = list(gists)
+        listed = {gist['id'] for gist in gists}
+        with self._lock:
+            indexed = [row['id'] for row in self._conn.execute("SELECT id FROM gists").fetchall()]
+        self.remove(gist_id for gist_id in indexed if gist_id not in listed)
+        self.upsert(gists)
+
+    def file_hashes(self, gist_id: str) -> Dict[str, str]:
+        """Content hashes of the files last uploaded to a gist, by filename."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, sha256 FROM file_hashes WHERE gist_id = ?", (gist_id,)
+            ).fetchall()
+        return {row['filename']: row['sha256'] for row in rows}
+
+    def set_file_hashes(self, gist_id: str, hashes: Dict[str, Optional[str]]) -> None:
+        """
+        Record the content of uploaded files.
+
+        Args:
+            gist_id: The gist
+            hashes: Filename to content hash; None marks a file as deleted
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM file_hashes WHERE gist_id = ? AND filename = ?",
+                [(gist_id, filename) for filename, sha256 in hashes.items() if sha256 is None]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes (gist_id, filename, sha256) VALUES (?, ?, ?)",
+                [(gist_id, filename, sha256) for filename, sha256 in hashes.items() if sha256 is not None]
+            )
+
+    def bundle_for(self, path: Union[str, Path]) -> Optional[str]:
+        """Gist id a lesson directory was published to, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT gist_id FROM bundle_dirs WHERE path = ?", (str(Path(path).resolve()),)
+            ).fetchone()
+        return row['gist_id'] if row else None
+
+    def set_bundle(self, path: Union[str, Path], gist_id: str) -> None:
+        """Remember which gist a lesson directory is published to."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bundle_dirs (path, gist_id) VALUES (?, ?)", (str(Path(path).resolve()), gist_id)
+            )
+
+    def get(self, gist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a gist.
+
+        Returns:
+            Gist summary in the shape of GitHubGistClient.get_gist()['gist'], or None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM gists WHERE id = ?", (gist_id,)).fetchone()
+        return self._to_summary(row) if row else None
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List indexed gists, newest first.
+
+        Args:
+            limit: Maximum number of gists to return (default: all)
+
+        Returns:
+            Gist summaries
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM gists ORDER BY created_at DESC, id LIMIT ?", (-1 if limit is None else limit,)
+            ).fetchall()
+        return [self._to_summary(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of indexed gists."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM gists").fetchone()[0]
+
+    @property
+    def last_synced_at(self) -> Optional[str]:
+        """ISO 8601 time at which the last sync started, or None if never synced."""
+        return self._get_state('last_synced_at')
+
+    @property
+    def last_synced_time(self) -> Optional[float]:
+        """Local clock time of the last sync, or None if never synced."""
+        value = self._get_state('last_synced_time')
+        return float(value) if value is not None else None
+
+    def mark_synced(self, synced_at: str) -> None:
+        """
+        Record a completed sync.
+
+        Args:
+            synced_at: ISO 8601 time at which the sync started, used as `since` next time
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                [('last_synced_at', synced_at), ('last_synced_time', str(time.time()))]
+            )
+
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _to_summary(self, row: sqlite3.Row) -> Dict[str, Any]:
+        raw_urls = json.loads(row['files'])
+        return {
+            'id': row['id'],
+            'description': row['description'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'public': bool(row['public']),
+            'files': list(raw_urls),
+            'raw_urls': raw_urls,
+            'html_url': row['html_url'],
+            'preview_url': row['preview_url']
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
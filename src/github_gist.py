@@ -6,22 +6,234 @@ Handles creating, updating, listing, and deleting gists with generated HTML cont
 import os
 import requests
 import json
+import functools
+import hashlib
+import html
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlparse
+
+try:
+    from .http_cache import HTTPCache, FetchedPage
+    from .gist_index import GistIndex, content_hash
+    from .paths import get_cache_dir, get_data_dir
+except ImportError:
+    from http_cache import HTTPCache, FetchedPage
+    from gist_index import GistIndex, content_hash
+    from paths import get_cache_dir, get_data_dir
 
 logger = logging.getLogger(__name__)
 
+# GitHub's largest page size for listing gists
+GISTS_PER_PAGE = 100
+
+# Seconds after which `gist list` syncs the local index before answering
+INDEX_MAX_AGE = 300
+
+# (connect, read) timeouts in seconds for GitHub API requests
+DEFAULT_TIMEOUT = (5, 30)
+
+# Lesson bundles: the generated table of contents, and how many lessons share one gist
+BUNDLE_INDEX_FILENAME = "index.html"
+BUNDLE_MAX_LESSONS = 50
+
+
+def build_bundle_index(description: str, lessons: List[Tuple[str, str]]) -> str:
+    """
+    Build the index page of a lesson bundle.
+    
+    Links are relative to the index, so they resolve to the sibling files of the
+    same gist revision (and stay inside HTMLPreview when the index is previewed there).
+    
+    Args:
+        description: Bundle title
+        lessons: (filename, title) pairs in display order
+        
+    Returns:
+        HTML document
+    """
+    items = '\n'.join(
+        f'            <li><a href="{quote(filename)}">{html.escape(title)}</a></li>' for filename, title in lessons
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(description)}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 0 20px; color: #333; }}
+        h1 {{ color: #2c5aa0; }}
+        li {{ margin: 10px 0; font-size: 1.1em; }}
+        a {{ color: #2c5aa0; }}
+    </style>
+</head>
+<body>
+    <h1>{html.escape(description)}</h1>
+    <ol>
+{items}
+    </ol>
+</body>
+</html>
+"""
+
+
+class GitHubSession(requests.Session):
+    """
+    Session for the GitHub API with pooled keep-alive connections, default
+    timeouts and retries.
+    
+    Server errors (5xx) are retried with backoff for idempotent requests, and
+    connection failures for every request. Rate-limited responses (403/429) are
+    retried after Retry-After, the X-RateLimit-Reset time or, for secondary rate
+    limits without either, an exponential wait. X-RateLimit-Remaining is tracked
+    so that once the quota is used up, requests wait for the reset instead of failing.
+    """
+    
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 pool_size: int = 10,
+                 max_rate_limit_wait: float = 900.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the session.
+        
+        Args:
+            max_retries: Retries for server errors, connection errors and rate limits
+            backoff_factor: Base of the exponential backoff between server error retries, in seconds
+            timeout: Default timeout for requests that do not pass one
+            pool_size: Keep-alive connections kept per host
+            max_rate_limit_wait: Longest single wait for a rate limit to reset, in seconds
+            sleep: Function used to wait (replaceable in tests)
+        """
+        super().__init__()
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            # POST is not retried after it reached the server, so a gist is never created twice
+            allowed_methods=frozenset({'GET', 'HEAD', 'PATCH', 'DELETE'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, **kwargs):
+        """Send a request, waiting out and retrying rate limits."""
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_quota()
+            response = super().request(method, url, **kwargs)
+            self._track(response)
+            
+            delay = self._rate_limit_delay(response, attempt)
+            if delay is None or attempt == self.max_retries:
+                return response
+            logger.warning(f"GitHub rate limit on {method} {url}, retrying in {delay:.0f}s")
+            self._sleep(delay)
+        return response
+    
+    def _wait_for_quota(self) -> None:
+        """Pause until the rate limit resets if the known quota is used up; otherwise reserve one request."""
+        with self._lock:
+            delay = 0.0
+            if self.rate_limit_remaining is not None:
+                if self.rate_limit_remaining <= 0 and self.rate_limit_reset:
+                    delay = min(self.rate_limit_reset - time.time() + 1, self.max_rate_limit_wait)
+                    self.rate_limit_remaining = None
+                else:
+                    # Count requests in flight so concurrent callers do not overshoot the limit
+                    self.rate_limit_remaining -= 1
+        if delay > 0:
+            logger.warning(f"GitHub API quota used up, waiting {delay:.0f}s for it to reset")
+            self._sleep(delay)
+    
+    def _track(self, response: requests.Response) -> None:
+        """Remember the quota reported by the API."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None:
+            return
+        with self._lock:
+            try:
+                self.rate_limit_remaining = int(remaining)
+                self.rate_limit_reset = float(reset) if reset else None
+            except ValueError:
+                pass
+    
+    def _rate_limit_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if it was not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_rate_limit_wait)
+            except ValueError:
+                pass
+        
+        backoff = min(60.0 * 2 ** attempt, self.max_rate_limit_wait)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return min(max(float(response.headers.get('X-RateLimit-Reset')) - time.time() + 1, 0),
+                           self.max_rate_limit_wait)
+            except (TypeError, ValueError):
+                # Quota used up but no usable reset time: back off as for a secondary limit
+                return backoff
+        
+        # Secondary rate limits without a hint: GitHub asks for at least a minute, growing exponentially
+        if response.status_code == 429 or 'rate limit' in response.text.lower():
+            return backoff
+        
+        # A plain 403 (e.g. missing permission) is not retried
+        return None
+
+
 
 class GitHubGistClient:
     """Client for interacting with GitHub Gists API."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self,
+                 github_token: Optional[str] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 max_page_workers: int = 8,
+                 index: Optional[GistIndex] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialize the GitHub Gist client.
         
         Args:
             github_token: GitHub personal access token. If None, will try to get from environment.
+            http_cache: Cache for gist list pages, revalidated with ETags
+                (default: a per-token cache under the cache dir)
+            max_page_workers: Maximum number of list pages fetched at once
+            index: Local index of this account's lesson gists, kept up to date by
+                every create, update, delete and listing (default: a per-token index
+                in the data dir)
+            session: HTTP session for API requests (default: a GitHubSession
+                sized for max_page_workers)
         """
         self.token = github_token or os.getenv('GITHUB_TOKEN')
         if not self.token:
@@ -33,6 +245,18 @@ class GitHubGistClient:
             "Accept": "application/vnd.github.v3+json",
             "Content-Type": "application/json"
         }
+        
+        # Unchanged list pages come back as 304s, which do not count against the rate limit.
+        # Each token gets its own cache and index so one account never sees another's gists.
+        token_key = hashlib.sha256(self.token.encode('utf-8')).hexdigest()[:16]
+        if http_cache is None:
+            http_cache = HTTPCache(get_cache_dir() / 'github' / token_key)
+        if index is None:
+            index = GistIndex(get_data_dir() / 'gists' / f"{token_key}.sqlite3")
+        self.http_cache = http_cache
+        self.index = index
+        self.max_page_workers = max_page_workers
+        self.session = session or GitHubSession(pool_size=max(10, max_page_workers))
     
     def create_gist(self, 
                    content: str, 
@@ -71,7 +295,7 @@ class GitHubGistClient:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/gists",
                 headers=self.headers,
                 data=json.dumps(gist_data)
@@ -93,6 +317,7 @@ class GitHubGistClient:
                 "description": description
             }
             
+            self._record_upload(gist_info, {filename: content})
             logger.info(f"Created gist {gist_info['id']}: {description}")
             return result
             
@@ -108,6 +333,9 @@ class GitHubGistClient:
         """
         Update an existing GitHub Gist.
         
+        Nothing is sent when the gist already holds this exact content and
+        description, as recorded by the local index at the last upload.
+        
         Args:
             gist_id: ID of the gist to update
             content: New HTML content
@@ -115,14 +343,18 @@ class GitHubGistClient:
             description: New description (if None, keeps existing)
             
         Returns:
-            Dictionary containing updated gist information
+            Dictionary containing updated gist information; 'unchanged' is True
+            when the upload was skipped
         """
-        # First get the existing gist to preserve filename if not specified
-        existing_gist_response = self.get_gist(gist_id)
-        if not existing_gist_response['success']:
-            raise Exception(f"Failed to get existing gist: {existing_gist_response['error']}")
+        title = None if description else self._extract_title_from_html(content)
         
-        existing_gist = existing_gist_response['gist']
+        # Get the existing gist only when its filename or description is needed
+        existing_gist = None
+        if not filename or not (description or title):
+            existing_gist_response = self.lookup_gist(gist_id)
+            if not existing_gist_response['success']:
+                raise Exception(f"Failed to get existing gist: {existing_gist_response['error']}")
+            existing_gist = existing_gist_response['gist']
         
         if not filename:
             # Use the first HTML file from existing gist
@@ -134,9 +366,13 @@ class GitHubGistClient:
                 filename = f"engoo_lesson_{timestamp}.html"
         
         if not description:
-            title = self._extract_title_from_html(content)
             description = f"Engoo ESL Lesson: {title}" if title else existing_gist['description']
         
+        unchanged = self._unchanged_result(gist_id, filename, content, description)
+        if unchanged is not None:
+            logger.info(f"Gist {gist_id} already has this content, skipping update")
+            return unchanged
+        
         gist_data = {
             "description": description,
             "files": {
@@ -147,7 +383,7 @@ class GitHubGistClient:
         }
         
         try:
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.base_url}/gists/{gist_id}",
                 headers=self.headers,
                 data=json.dumps(gist_data)
@@ -166,9 +402,11 @@ class GitHubGistClient:
                 "raw_url": raw_url,
                 "preview_url": preview_url,
                 "filename": filename,
-                "description": description
+                "description": description,
+                "unchanged": False
             }
             
+            self._record_upload(gist_info, {filename: content})
             logger.info(f"Updated gist {gist_info['id']}: {description}")
             return result
             
@@ -176,55 +414,265 @@ class GitHubGistClient:
             logger.error(f"Failed to update gist {gist_id}: {e}")
             raise Exception(f"Failed to update gist: {e}")
     
+    def _unchanged_result(self, gist_id: str, filename: str, content: str, description: str) -> Optional[Dict[str, Any]]:
+        """Build the update result from the index if the gist already holds this content and description."""
+        cached = self.index.get(gist_id)
+        if cached is None or cached['description'] != description:
+            return None
+        raw_url = cached['raw_urls'].get(filename)
+        if not raw_url or self.index.file_hashes(gist_id).get(filename) != content_hash(content):
+            return None
+        return {
+            "gist_id": gist_id,
+            "gist_url": cached['html_url'],
+            "raw_url": raw_url,
+            "preview_url": f"https://htmlpreview.github.io/?{raw_url}",
+            "filename": filename,
+            "description": description,
+            "unchanged": True
+        }
+    
+    def _record_upload(self, gist_info: Dict[str, Any], files: Dict[str, Optional[str]]) -> None:
+        """Index a gist returned by a write and remember the content of the files sent (None: deleted)."""
+        # Our own write moves updated_at, which makes the index drop the gist's hashes; keep those of untouched files
+        kept = self.index.file_hashes(gist_info["id"])
+        self.index.upsert([self._summarize_gist(gist_info)])
+        self.index.set_file_hashes(gist_info["id"], {**kept, **{
+            filename: content_hash(content) if content is not None else None for filename, content in files.items()
+        }})
+    
+    def create_bundle(self,
+                      lessons: Dict[str, str],
+                      description: Optional[str] = None,
+                      public: bool = True) -> Dict[str, Any]:
+        """
+        Publish several lessons as one multi-file gist with a generated index page, in a single request.
+        
+        Args:
+            lessons: Mapping of gist filename to lesson HTML, in display order
+            description: Description for the gist and title of the index page
+                (default: "Engoo ESL Lessons" with the date)
+            public: Whether the gist should be public
+            
+        Returns:
+            Dictionary with the gist id and URLs; 'preview_url' opens the index
+            page and 'lessons' holds each lesson's filename, title and preview URL
+        """
+        if not lessons:
+            raise ValueError("No lessons to publish")
+        if len(lessons) > BUNDLE_MAX_LESSONS:
+            raise ValueError(f"A bundle holds at most {BUNDLE_MAX_LESSONS} lessons; got {len(lessons)}")
+        if BUNDLE_INDEX_FILENAME in lessons:
+            raise ValueError(f"{BUNDLE_INDEX_FILENAME} is reserved for the bundle's index page")
+        for filename in lessons:
+            if '/' in filename or not filename.strip():
+                raise ValueError(f"Invalid gist filename: {filename!r}")
+        
+        if not description:
+            description = f"Engoo ESL Lessons - {datetime.now().strftime('%Y-%m-%d')}"
+        
+        titles = {filename: self._extract_title_from_html(content) or filename for filename, content in lessons.items()}
+        files = {BUNDLE_INDEX_FILENAME: {"content": build_bundle_index(description, list(titles.items()))}}
+        files.update({filename: {"content": content} for filename, content in lessons.items()})
+        
+        try:
+            response = self.session.post(
+                f"{self.base_url}/gists",
+                headers=self.headers,
+                data=json.dumps({"description": description, "public": public, "files": files})
+            )
+            response.raise_for_status()
+            
+            gist_info = response.json()
+            result = self._bundle_result(self._summarize_gist(gist_info), titles)
+            
+            self._record_upload(gist_info, {name: file["content"] for name, file in files.items()})
+            logger.info(f"Created bundle gist {gist_info['id']} with {len(lessons)} lessons: {description}")
+            return result
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to create bundle gist: {e}")
+            raise Exception(f"Failed to create bundle gist: {e}")
+    
+    def sync_bundle(self,
+                    directory: Union[str, Path],
+                    gist_id: Optional[str] = None,
+                    description: Optional[str] = None,
+                    public: bool = True) -> Dict[str, Any]:
+        """
+        Bring a directory's bundle gist up to date, sending only the lessons that changed.
+        
+        The first sync of a directory creates its bundle; later syncs compare each
+        lesson with the content hash recorded at its last upload and PATCH only new
+        or changed lessons (plus the index page if it changed), and remove lessons
+        deleted from the directory. Nothing is sent when nothing changed.
+        
+        Args:
+            directory: Directory of lesson HTML files
+            gist_id: Bundle gist to sync to (default: the gist this directory was synced to before)
+            description: New description (default: keep the gist's)
+            public: Whether a newly created bundle should be public
+            
+        Returns:
+            Bundle result as for create_bundle, plus 'created', and the 'changed'
+            and 'removed' lesson filenames
+        """
+        directory = Path(directory)
+        lessons = {path.name: path.read_text(encoding='utf-8') for path in sorted(directory.glob('*.html'))}
+        if not lessons:
+            raise ValueError(f"No lesson HTML files in {directory}")
+        
+        gist_id = gist_id or self.index.bundle_for(directory)
+        if gist_id is None:
+            result = self.create_bundle(lessons, description=description, public=public)
+            self.index.set_bundle(directory, result['gist_id'])
+            return {**result, 'created': True, 'changed': list(lessons), 'removed': []}
+        
+        if len(lessons) > BUNDLE_MAX_LESSONS:
+            raise ValueError(f"A bundle holds at most {BUNDLE_MAX_LESSONS} lessons; got {len(lessons)}")
+        if BUNDLE_INDEX_FILENAME in lessons:
+            raise ValueError(f"{BUNDLE_INDEX_FILENAME} is reserved for the bundle's index page")
+        
+        existing_response = self.lookup_gist(gist_id)
+        if not existing_response['success']:
+            raise Exception(f"Failed to get existing gist: {existing_response['error']}")
+        existing_gist = existing_response['gist']
+        description = description or existing_gist['description']
+        
+        titles = {filename: self._extract_title_from_html(content) or filename for filename, content in lessons.items()}
+        files = {BUNDLE_INDEX_FILENAME: build_bundle_index(description, list(titles.items())), **lessons}
+        hashes = self.index.file_hashes(gist_id)
+        changed = {name: content for name, content in files.items() if hashes.get(name) != content_hash(content)}
+        removed = [name for name in existing_gist['files'] if name.endswith('.html') and name not in files]
+        changed_lessons = [name for name in changed if name != BUNDLE_INDEX_FILENAME]
+        self.index.set_bundle(directory, gist_id)
+        
+        if not changed and not removed and description == existing_gist['description']:
+            logger.info(f"Bundle gist {gist_id} is up to date")
+            return {**self._bundle_result(existing_gist, titles), 'created': False, 'changed': [], 'removed': []}
+        
+        gist_data = {
+            "description": description,
+            "files": {**{name: {"content": content} for name, content in changed.items()}, **{name: None for name in removed}}
+        }
+        try:
+            response = self.session.patch(
+                f"{self.base_url}/gists/{gist_id}",
+                headers=self.headers,
+                data=json.dumps(gist_data)
+            )
+            response.raise_for_status()
+            
+            gist_info = response.json()
+            self._record_upload(gist_info, {**changed, **{name: None for name in removed}})
+            logger.info(f"Synced bundle gist {gist_id}: {len(changed_lessons)} changed, {len(removed)} removed")
+            return {**self._bundle_result(self._summarize_gist(gist_info), titles),
+                    'created': False, 'changed': changed_lessons, 'removed': removed}
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to sync bundle gist {gist_id}: {e}")
+            raise Exception(f"Failed to sync bundle gist: {e}")
+    
+    def _bundle_result(self, gist: Dict[str, Any], titles: Dict[str, str]) -> Dict[str, Any]:
+        """Describe a bundle gist (as summarized by _summarize_gist) for callers."""
+        def preview(filename: str) -> str:
+            return f"https://htmlpreview.github.io/?{gist['raw_urls'][filename]}"
+        
+        return {
+            "gist_id": gist["id"],
+            "gist_url": gist["html_url"],
+            "raw_url": gist["raw_urls"][BUNDLE_INDEX_FILENAME],
+            "preview_url": preview(BUNDLE_INDEX_FILENAME),
+            "filename": BUNDLE_INDEX_FILENAME,
+            "description": gist["description"],
+            "lessons": [
+                {"filename": filename, "title": title, "preview_url": preview(filename)}
+                for filename, title in titles.items()
+            ]
+        }
+    
+    def publish_directory(self,
+                          paths: List[Union[str, Path]],
+                          bundle: bool = True,
+                          description: Optional[str] = None,
+                          public: bool = True,
+                          workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Publish lesson HTML files, given directly or as directories of *.html files.
+        
+        In bundle mode lessons are packed BUNDLE_MAX_LESSONS to a gist, one request
+        per gist; otherwise every lesson gets its own gist. Gists are created
+        concurrently, and the session paces requests within GitHub's rate limits.
+        
+        Args:
+            paths: Lesson files and/or directories
+            bundle: Pack lessons into multi-file gists with an index page
+            description: Gist description (bundles get " (part N)" when split)
+            public: Whether the gists should be public
+            workers: Maximum number of gists created at once
+            
+        Returns:
+            One result per gist, in input order; failed gists have 'success': False and 'error'
+        """
+        lesson_paths = []
+        for path in map(Path, paths):
+            lesson_paths.extend(sorted(path.glob('*.html')) if path.is_dir() else [path])
+        if not lesson_paths:
+            raise ValueError("No lesson HTML files found")
+        
+        names = [path.name for path in lesson_paths]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Lesson filenames must be unique within a gist: {', '.join(duplicates)}")
+        
+        if bundle:
+            chunks = [lesson_paths[i:i + BUNDLE_MAX_LESSONS] for i in range(0, len(lesson_paths), BUNDLE_MAX_LESSONS)]
+            
+            def publish(numbered_chunk):
+                number, chunk = numbered_chunk
+                chunk_description = description
+                if description and len(chunks) > 1:
+                    chunk_description = f"{description} (part {number})"
+                lessons = {path.name: path.read_text(encoding='utf-8') for path in chunk}
+                return self.create_bundle(lessons, description=chunk_description, public=public)
+            
+            jobs = list(enumerate(chunks, 1))
+        else:
+            def publish(path):
+                return self.create_gist(path.read_text(encoding='utf-8'), filename=path.name,
+                                        description=description, public=public)
+            
+            jobs = lesson_paths
+        
+        def publish_safely(job):
+            try:
+                return {'success': True, **publish(job)}
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+            return list(executor.map(publish_safely, jobs))
+    
     def list_gists(self) -> Dict[str, Any]:
         """
         List all gists for the authenticated user.
         
+        Every page is fetched (100 gists per page); once the first page reveals
+        the last page number, the remaining pages are fetched concurrently.
+        
         Returns:
             Dictionary with gist information
         """
         try:
-            response = requests.get(f"{self.base_url}/gists", headers=self.headers)
-            response.raise_for_status()
-            
-            gists = response.json()
+            synced_at = self._utc_now()
+            gists = self._list_all_gists()
             
             # Filter and format gists that look like Engoo lessons
-            engoo_gists = []
-            for gist in gists:
-                # Check if it's likely an Engoo lesson
-                is_engoo = False
-                for filename, file_info in gist.get('files', {}).items():
-                    if (filename.endswith('.html') and 
-                        ('engoo' in filename.lower() or 'lesson' in filename.lower() or 'daily' in filename.lower())):
-                        is_engoo = True
-                        break
-                
-                # Also check description
-                description = gist.get('description', '')
-                if any(keyword in description.lower() for keyword in ['engoo', 'lesson', 'esl', 'daily news']):
-                    is_engoo = True
-                
-                if is_engoo:
-                    # Get the first HTML file for preview
-                    html_files = [f for f in gist['files'].keys() if f.endswith('.html')]
-                    preview_url = None
-                    if html_files:
-                        # Use the raw URL from the first HTML file for HTMLPreview
-                        first_html_file = html_files[0]
-                        raw_url = gist['files'][first_html_file]['raw_url']
-                        preview_url = f"https://htmlpreview.github.io/?{raw_url}"
-                    
-                    engoo_gists.append({
-                        'id': gist['id'],
-                        'description': gist.get('description', 'No description'),
-                        'created_at': gist['created_at'],
-                        'updated_at': gist['updated_at'],
-                        'public': gist['public'],
-                        'files': list(gist['files'].keys()),
-                        'html_url': gist['html_url'],
-                        'preview_url': preview_url
-                    })
+            engoo_gists = [self._summarize_gist(gist) for gist in gists if self._is_engoo_gist(gist)]
+            
+            # A complete listing also drops gists deleted outside this tool from the index
+            self.index.replace_all(engoo_gists)
+            self.index.mark_synced(synced_at)
             
             return {
                 'success': True,
@@ -239,6 +687,120 @@ class GitHubGistClient:
                 'error': str(e)
             }
     
+    def sync_index(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Bring the local gist index up to date.
+        
+        After the first full listing, only gists changed since the previous sync
+        are fetched (GitHub's `since` parameter), usually a single small request.
+        Gists deleted outside this tool are only noticed by a refresh.
+        
+        Args:
+            refresh: Re-list every gist instead of syncing incrementally
+            
+        Returns:
+            Dictionary with 'success', 'full' and the number of 'changed' gists, or 'error'
+        """
+        since = None if refresh else self.index.last_synced_at
+        if since is None:
+            result = self.list_gists()
+            if not result['success']:
+                return result
+            return {'success': True, 'full': True, 'changed': result['total_count']}
+        
+        try:
+            synced_at = self._utc_now()
+            gists = self._list_all_gists(since=since)
+        except requests.RequestException as e:
+            logger.error(f"Failed to sync gists: {e}")
+            return {'success': False, 'error': str(e)}
+        
+        self.index.upsert(self._summarize_gist(gist) for gist in gists if self._is_engoo_gist(gist))
+        self.index.remove(gist['id'] for gist in gists if not self._is_engoo_gist(gist))
+        self.index.mark_synced(synced_at)
+        return {'success': True, 'full': False, 'changed': len(gists)}
+    
+    def _utc_now(self) -> str:
+        """Current time in the ISO 8601 form GitHub expects for `since`."""
+        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    def _list_all_gists(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch every page of the user's gists (optionally only those updated since a time), newest first."""
+        fetch_page = functools.partial(self._fetch_page, since=since)
+        first_page = fetch_page(1)
+        links = self._parse_links(first_page.link)
+        
+        if 'last' in links:
+            last_page = int(parse_qs(urlparse(links['last']).query)['page'][0])
+            page_numbers = range(2, last_page + 1)
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_page_workers, len(page_numbers)))) as executor:
+                pages = [first_page] + list(executor.map(fetch_page, page_numbers))
+        else:
+            # No last link: the first page is the only one, or follow next links one by one
+            pages = [first_page]
+            while 'next' in links:
+                page = fetch_page(int(parse_qs(urlparse(links['next']).query)['page'][0]))
+                pages.append(page)
+                links = self._parse_links(page.link)
+        
+        cached = sum(1 for page in pages if page.from_cache)
+        logger.debug(f"Listed gists from {len(pages)} pages ({cached} unchanged)")
+        return [gist for page in pages for gist in json.loads(page.text)]
+    
+    def _fetch_page(self, page: int, since: Optional[str] = None) -> FetchedPage:
+        """Fetch one page of the gist listing, revalidating a cached copy with its ETag."""
+        url = f"{self.base_url}/gists?per_page={GISTS_PER_PAGE}&page={page}"
+        if since is None:
+            # Always revalidate: GitHub's max-age=60 would otherwise serve a listing
+            # from before our own creates and deletes, and replace_all trusts it
+            return self.http_cache.fetch(self.session, url, timeout=DEFAULT_TIMEOUT, headers=self.headers,
+                                         revalidate=True)
+        
+        # Incremental listings differ on every sync, so caching them would only fill the cache
+        response = self.session.get(url, params={'since': since}, headers=self.headers)
+        response.raise_for_status()
+        return FetchedPage(url=url, text=response.text, bytes_downloaded=len(response.content),
+                           link=response.headers.get('Link'))
+    
+    def _parse_links(self, link_header: Optional[str]) -> Dict[str, str]:
+        """Map rel names to URLs from a Link header."""
+        if not link_header:
+            return {}
+        return {link['rel']: link['url'] for link in requests.utils.parse_header_links(link_header) if 'rel' in link}
+    
+    def _is_engoo_gist(self, gist: Dict[str, Any]) -> bool:
+        """Check if a gist is likely an Engoo lesson, by its file names or description."""
+        for filename in gist.get('files', {}):
+            if (filename.endswith('.html') and 
+                ('engoo' in filename.lower() or 'lesson' in filename.lower() or 'daily' in filename.lower())):
+                return True
+        
+        description = gist.get('description') or ''
+        return any(keyword in description.lower() for keyword in ['engoo', 'lesson', 'esl', 'daily news'])
+    
+    def _summarize_gist(self, gist: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a gist from the API for display, with an HTMLPreview link to its index or first HTML file."""
+        html_files = sorted((f for f in gist['files'].keys() if f.endswith('.html')),
+                            key=lambda f: f != BUNDLE_INDEX_FILENAME)
+        preview_url = None
+        if html_files:
+            # Use the raw URL from the first HTML file for HTMLPreview
+            first_html_file = html_files[0]
+            raw_url = gist['files'][first_html_file]['raw_url']
+            preview_url = f"https://htmlpreview.github.io/?{raw_url}"
+        
+        return {
+            'id': gist['id'],
+            'description': gist.get('description', 'No description'),
+            'created_at': gist['created_at'],
+            'updated_at': gist['updated_at'],
+            'public': gist['public'],
+            'files': list(gist['files'].keys()),
+            'raw_urls': {name: info.get('raw_url') for name, info in gist['files'].items()},
+            'html_url': gist['html_url'],
+            'preview_url': preview_url
+        }
+    
     def delete_gist(self, gist_id: str) -> Dict[str, Any]:
         """
         Delete a specific gist.
@@ -250,8 +812,12 @@ class GitHubGistClient:
             Dictionary with deletion status
         """
         try:
-            response = requests.delete(f"{self.base_url}/gists/{gist_id}", headers=self.headers)
+            response = self.session.delete(f"{self.base_url}/gists/{gist_id}", headers=self.headers)
+            if response.status_code == 404:
+                # Already gone on GitHub; make sure the index agrees
+                self.index.remove([gist_id])
             response.raise_for_status()
+            self.index.remove([gist_id])
             
             return {
                 'success': True,
@@ -276,32 +842,16 @@ class GitHubGistClient:
             Dictionary with gist information
         """
         try:
-            response = requests.get(f"{self.base_url}/gists/{gist_id}", headers=self.headers)
+            response = self.session.get(f"{self.base_url}/gists/{gist_id}", headers=self.headers)
             response.raise_for_status()
             
-            gist = response.json()
-            
-            # Get the first HTML file for preview
-            html_files = [f for f in gist['files'].keys() if f.endswith('.html')]
-            preview_url = None
-            if html_files:
-                # Use the raw URL from the first HTML file for HTMLPreview
-                first_html_file = html_files[0]
-                raw_url = gist['files'][first_html_file]['raw_url']
-                preview_url = f"https://htmlpreview.github.io/?{raw_url}"
-            
+            gist_info = response.json()
+            gist = self._summarize_gist(gist_info)
+            if self._is_engoo_gist(gist_info):
+                self.index.upsert([gist])
             return {
                 'success': True,
-                'gist': {
-                    'id': gist['id'],
-                    'description': gist.get('description', 'No description'),
-                    'created_at': gist['created_at'],
-                    'updated_at': gist['updated_at'],
-                    'public': gist['public'],
-                    'files': list(gist['files'].keys()),
-                    'html_url': gist['html_url'],
-                    'preview_url': preview_url
-                }
+                'gist': gist
             }
             
         except requests.RequestException as e:
@@ -311,6 +861,21 @@ class GitHubGistClient:
                 'error': str(e)
             }
     
+    def lookup_gist(self, gist_id: str) -> Dict[str, Any]:
+        """
+        Get details of a gist from the local index, asking the API only if it is not indexed.
+        
+        Args:
+            gist_id: ID of the gist to retrieve
+            
+        Returns:
+            Dictionary with gist information, as for get_gist, plus 'cached'
+        """
+        gist = self.index.get(gist_id)
+        if gist is not None:
+            return {'success': True, 'gist': gist, 'cached': True}
+        return {**self.get_gist(gist_id), 'cached': False}
+    
     def _extract_title_from_html(self, html_content: str) -> Optional[str]:
         """
         Extract article title from HTML content.
@@ -364,6 +929,21 @@ def create_shareable_lesson(html_content: str,
         return client.create_gist(html_content, description=description)
 
 
+def create_shareable_bundle(lessons: Dict[str, str], description: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convenience function to publish several lessons as one gist with an index page.
+    
+    Args:
+        lessons: Mapping of filename to lesson HTML, in display order
+        description: Optional description for the gist
+        
+    Returns:
+        Dictionary with gist information and shareable URLs
+    """
+    client = GitHubGistClient()
+    return client.create_bundle(lessons, description=description)
+
+
 def list_engoo_gists() -> Dict[str, Any]:
     """
     Convenience function to list all Engoo lesson gists.
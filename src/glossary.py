@@ -0,0 +1,226 @@
+"""
+Cross-lesson glossary of vocabulary definitions.
+Definitions are keyed by lemma and stored in SQLite, so words that recur across
+lessons are defined once and reused.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    from .paths import get_data_dir
+except ImportError:
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Plural forms that simple suffix rules get wrong
+_IRREGULAR_LEMMAS = {
+    'children': 'child', 'people': 'person', 'men': 'man', 'women': 'woman',
+    'mice': 'mouse', 'feet': 'foot', 'teeth': 'tooth', 'data': 'data', 'media': 'media',
+    'crises': 'crisis', 'analyses': 'analysis', 'phenomena': 'phenomenon', 'criteria': 'criterion',
+    'news': 'news', 'series': 'series', 'species': 'species', 'means': 'means',
+    'always': 'always', 'perhaps': 'perhaps', 'lens': 'lens',
+    # Words whose "-s"/"-es" ending is not a plural, or whose singular keeps the "e"
+    'yes': 'yes', 'whereas': 'whereas', 'besides': 'besides', 'towards': 'towards',
+    'afterwards': 'afterwards', 'sometimes': 'sometimes', 'bias': 'bias', 'atlas': 'atlas',
+    'canvas': 'canvas', 'alias': 'alias', 'chaos': 'chaos', 'ethos': 'ethos',
+    'shoes': 'shoe', 'toes': 'toe', 'foes': 'foe', 'canoes': 'canoe', 'oboes': 'oboe',
+    'aches': 'ache', 'headaches': 'headache', 'caches': 'cache', 'niches': 'niche', 'quizzes': 'quiz'
+}
+_NO_PLURAL_SUFFIX = ('ss', 'us', 'is', 'ous', 'ics')
+
+
+def lemmatize(word: str) -> str:
+    """
+    Reduce a word to its glossary key.
+
+    Lowercases, trims punctuation and strips regular plural endings. Verb and
+    adjective endings are kept, since stripping them is ambiguous
+    ("unprecedented", "ongoing").
+
+    Args:
+        word: Word as it appears in a lesson
+
+    Returns:
+        Lemma used as the glossary key
+    """
+    lemma = re.sub(r"[^\w\s'-]", '', word.strip().lower()).strip(" '-")
+    if ' ' in lemma or len(lemma) <= 3:
+        return lemma
+    if lemma in _IRREGULAR_LEMMAS:
+        return _IRREGULAR_LEMMAS[lemma]
+    if lemma.endswith(_NO_PLURAL_SUFFIX):
+        return lemma
+    if lemma.endswith('ies'):
+        # "policies" -> "policy", but "dies" -> "die"
+        return lemma[:-3] + 'y' if len(lemma) > 4 else lemma[:-1]
+    if lemma.endswith(('ches', 'shes', 'sses', 'xes', 'zzes', 'oes')):
+        # "goes" -> "go", "does" -> "do", "heroes" -> "hero"
+        return lemma[:-2]
+    if lemma.endswith('s'):
+        return lemma[:-1]
+    return lemma
+
+
+@dataclass
+class GlossaryEntry:
+    """A stored definition."""
+    lemma: str
+    word: str
+    definition: str
+    vetted: bool
+    uses: int
+
+
+class Glossary:
+    """SQLite-backed store of learner definitions keyed by lemma."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (and create if needed) the glossary.
+
+        Args:
+            path: SQLite database file (default: glossary.sqlite3 in the data dir)
+        """
+        self.path = Path(path) if path else get_data_dir() / 'glossary.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS definitions (
+                lemma TEXT PRIMARY KEY,
+                word TEXT NOT NULL,
+                definition TEXT NOT NULL,
+                vetted INTEGER NOT NULL DEFAULT 0,
+                uses INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def lookup(self, words: Iterable[str]) -> Dict[str, str]:
+        """
+        Get stored definitions for words.
+
+        Args:
+            words: Words as they appear in a lesson
+
+        Returns:
+            Mapping of lemma to definition for the words that are in the glossary
+        """
+        lemmas = list(dict.fromkeys(lemmatize(word) for word in words))
+        if not lemmas:
+            return {}
+
+        placeholders = ','.join('?' * len(lemmas))
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT lemma, definition FROM definitions WHERE lemma IN ({placeholders})", lemmas
+            ).fetchall()
+            self._conn.execute(
+                f"UPDATE definitions SET uses = uses + 1 WHERE lemma IN ({placeholders})", lemmas
+            )
+            self.hits += len(rows)
+            self.misses += len(lemmas) - len(rows)
+        return dict(rows)
+
+    def add(self, definitions: Dict[str, str]) -> None:
+        """
+        Store new definitions. Existing entries are kept, so vetted definitions are never overwritten.
+
+        Args:
+            definitions: Mapping of word to definition
+        """
+        now = time.time()
+        rows = [
+            (lemmatize(word), word, definition.strip(), now, now)
+            for word, definition in definitions.items()
+            if word.strip() and definition and definition.strip()
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO definitions (lemma, word, definition, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def entries(self, unvetted_only: bool = False, limit: int = 50) -> List[GlossaryEntry]:
+        """
+        List stored definitions, most reused first, e.g. to review them.
+
+        Args:
+            unvetted_only: Only definitions nobody has vetted yet
+            limit: Maximum number of entries
+
+        Returns:
+            Glossary entries
+        """
+        where = "WHERE vetted = 0" if unvetted_only else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT lemma, word, definition, vetted, uses FROM definitions {where} "
+                "ORDER BY uses DESC, lemma LIMIT ?", (limit,)
+            ).fetchall()
+        return [GlossaryEntry(lemma, word, definition, bool(vetted), uses)
+                for lemma, word, definition, vetted, uses in rows]
+
+    def vet(self, word: str, definition: Optional[str] = None) -> bool:
+        """
+        Mark a definition as reviewed, optionally replacing it.
+
+        Args:
+            word: The word (any inflection)
+            definition: Corrected definition; None keeps the stored one
+
+        Returns:
+            False if there was no definition to vet
+        """
+        now = time.time()
+        lemma = lemmatize(word)
+        with self._lock, self._conn:
+            if definition is None:
+                return self._conn.execute(
+                    "UPDATE definitions SET vetted = 1, updated_at = ? WHERE lemma = ?", (now, lemma)
+                ).rowcount > 0
+            else:
+                self._conn.execute(
+                    """
+                    INSERT INTO definitions (lemma, word, definition, vetted, created_at, updated_at)
+                    VALUES (?, ?, ?, 1, ?, ?)
+                    ON CONFLICT (lemma) DO UPDATE SET definition = excluded.definition, vetted = 1,
+                        updated_at = excluded.updated_at
+                    """,
+                    (lemma, word, definition.strip(), now, now)
+                )
+                return True
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get glossary counters.
+
+        Returns:
+            Dictionary with lookup hits and misses for this process, stored entries and vetted entries
+        """
+        with self._lock:
+            entries, vetted = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(vetted), 0) FROM definitions"
+            ).fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'vetted': vetted}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,349 @@
+"""
+On-disk HTTP cache for scraped pages.
+Stores response bodies with their validators and revalidates with conditional requests.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import requests
+
+try:
+    from .paths import get_cache_dir
+except ImportError:
+    from paths import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# <meta charset="utf-8"> or <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a URL is not in the cache."""
+
+
+def decode_html(response: Any) -> str:
+    """
+    Decode a downloaded page, honouring its <meta charset> when the headers name none.
+
+    Without a charset in Content-Type, requests decodes text/html as ISO-8859-1
+    (and httpx as UTF-8), which garbles pages that declare their encoding in the
+    markup. Like newspaper3k, prefer the declared encoding, then UTF-8.
+
+    Args:
+        response: A requests or httpx response
+
+    Returns:
+        The decoded body
+    """
+    content_type = response.headers.get('Content-Type') or ''
+    if 'charset' in str(content_type).lower():
+        return response.text
+
+    content = response.content
+    match = _META_CHARSET.search(content[:4096])
+    encodings = [match.group(1).decode('ascii')] if match else []
+    for encoding in encodings + ['utf-8']:
+        try:
+            return content.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return response.text
+
+
+@dataclass
+class FetchedPage:
+    """A downloaded or cached page."""
+    url: str
+    text: str
+    from_cache: bool = False  # True when the body was not downloaded (fresh hit or 304)
+    bytes_downloaded: int = 0
+    link: Optional[str] = None  # Link header, for following paginated APIs
+
+
+class HTTPCache:
+    """Disk-backed HTTP cache with ETag / Last-Modified revalidation."""
+
+    def __init__(self,
+                 directory: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 offline: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Where to store entries (default: http/ in the cache dir)
+            max_bytes: Total body size to keep before evicting least recently used pages
+            offline: Serve only from the cache and never touch the network
+        """
+        self.directory = Path(directory) if directory else get_cache_dir() / 'http'
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    def fetch(self,
+              session: requests.Session,
+              url: str,
+              timeout: float = 10,
+              headers: Optional[Dict[str, str]] = None,
+              revalidate: bool = False) -> FetchedPage:
+        """
+        Fetch a URL, using the cached copy when it is fresh or still valid.
+
+        Args:
+            session: Session used for network requests
+            url: The URL to fetch
+            timeout: Request timeout in seconds
+            headers: Extra request headers, e.g. Authorization
+            revalidate: Always send a conditional request, even while the cached
+                copy is within its max-age
+
+        Returns:
+            FetchedPage with the decoded HTML
+
+        Raises:
+            CacheMissError: In offline mode, when the URL has not been cached
+            requests.RequestException: On network or HTTP errors
+        """
+        page, meta, cached_text, conditional_headers = self._lookup(url, revalidate=revalidate)
+        if page is not None:
+            return page
+
+        response = session.get(url, timeout=timeout, headers={**(headers or {}), **conditional_headers})
+        return self._complete(url, meta, cached_text, response)
+
+    async def afetch(self, client: Any, url: str, timeout: float = 10) -> FetchedPage:
+        """
+        Async variant of fetch() using an httpx.AsyncClient.
+
+        Args:
+            client: httpx.AsyncClient used for network requests
+            url: The URL to fetch
+            timeout: Request timeout in seconds
+
+        Returns:
+            FetchedPage with the decoded HTML
+        """
+        page, meta, cached_text, headers = self._lookup(url)
+        if page is not None:
+            return page
+
+        response = await client.get(url, timeout=timeout, headers=headers)
+        return self._complete(url, meta, cached_text, response)
+
+    def _lookup(self, url: str, revalidate: bool = False):
+        """
+        Check the cache before going to the network.
+
+        Args:
+            url: The URL to look up
+            revalidate: Never answer from the cache on freshness alone
+
+        Returns:
+            (page, meta, cached_text, headers): page is set when the request can be
+            answered from the cache; otherwise headers holds the conditional
+            request validators.
+        """
+        meta = self._load_meta(url)
+        body_path = self._body_path(url)
+        cached_text = None
+        if meta is not None and body_path.exists():
+            cached_text = body_path.read_text(encoding='utf-8')
+
+        if self.offline:
+            if cached_text is None:
+                raise CacheMissError(f"{url} is not in the HTTP cache (offline mode)")
+            return self._hit(url, cached_text, meta), meta, cached_text, {}
+
+        if not revalidate and cached_text is not None and time.time() < meta.get('expires_at', 0):
+            logger.debug(f"HTTP cache fresh hit: {url}")
+            return self._hit(url, cached_text, meta), meta, cached_text, {}
+
+        headers = {}
+        if cached_text is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        return None, meta, cached_text, headers
+
+    def _complete(self, url: str, meta: Optional[Dict[str, Any]], cached_text: Optional[str], response: Any) -> FetchedPage:
+        """Handle a network response: revalidate on 304, otherwise store the new body."""
+        if response.status_code == 304 and cached_text is not None:
+            logger.debug(f"HTTP cache revalidated: {url}")
+            meta['expires_at'] = self._expires_at(response.headers)
+            self._write_meta(url, meta)
+            return self._hit(url, cached_text, meta)
+
+        response.raise_for_status()
+        text = decode_html(response)
+        self._store(url, text, response.headers)
+        return FetchedPage(url=url, text=text, bytes_downloaded=len(response.content),
+                           link=response.headers.get('Link'))
+
+    def load_parsed(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get previously extracted article content for a cached page.
+
+        Args:
+            url: The page URL
+
+        Returns:
+            Extracted content dictionary, or None if not stored
+        """
+        meta = self._load_meta(url)
+        if not meta or not meta.get('parsed'):
+            return None
+
+        parsed = dict(meta['parsed'])
+        if parsed.get('publish_date'):
+            parsed['publish_date'] = datetime.fromisoformat(parsed['publish_date'])
+        return parsed
+
+    def store_parsed(self, url: str, content: Dict[str, Any]) -> None:
+        """
+        Attach extracted article content to a cached page, so revalidated pages skip re-parsing.
+
+        Args:
+            url: The page URL
+            content: Extracted content dictionary
+        """
+        meta = self._load_meta(url)
+        if meta is None:
+            return
+
+        parsed = dict(content)
+        if isinstance(parsed.get('publish_date'), datetime):
+            parsed['publish_date'] = parsed['publish_date'].isoformat()
+        meta['parsed'] = parsed
+        self._write_meta(url, meta)
+
+    def _hit(self, url: str, text: str, meta: Optional[Dict[str, Any]] = None) -> FetchedPage:
+        """Mark a cache entry as recently used and wrap it as a page."""
+        try:
+            os.utime(self._body_path(url))
+        except OSError:
+            pass
+        return FetchedPage(url=url, text=text, from_cache=True, link=(meta or {}).get('link'))
+
+    def _store(self, url: str, text: str, headers: Any) -> None:
+        """Store a response body and its validators."""
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            return
+
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'link': headers.get('Link'),
+            'stored_at': time.time(),
+            'expires_at': self._expires_at(headers)
+        }
+        self._atomic_write(self._body_path(url), text.encode('utf-8'))
+        self._write_meta(url, meta)
+        self._evict()
+
+    def _expires_at(self, headers: Any) -> float:
+        """Compute when a response stops being fresh, per Cache-Control and Expires."""
+        now = time.time()
+        cache_control = headers.get('Cache-Control', '').lower()
+
+        if 'no-cache' in cache_control:
+            return now
+
+        for directive in cache_control.split(','):
+            directive = directive.strip()
+            if directive.startswith('max-age='):
+                try:
+                    return now + int(directive.split('=', 1)[1])
+                except ValueError:
+                    return now
+
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return parsedate_to_datetime(expires).timestamp()
+            except (TypeError, ValueError):
+                return now
+
+        # No freshness information: revalidate on every use
+        return now
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            bodies = []
+            total = 0
+            for body_path in self.directory.glob('*.body'):
+                try:
+                    stat = body_path.stat()
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, body_path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, size, body_path in sorted(bodies):
+                if total <= self.max_bytes:
+                    break
+                for path in (body_path, body_path.with_suffix('.json')):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                total -= size
+                logger.debug(f"Evicted HTTP cache entry {body_path.stem}")
+
+    def _key(self, url: str) -> str:
+        """Filename-safe key for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.body"
+
+    def _meta_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.json"
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        """Read the metadata for a URL, if cached."""
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]) -> None:
+        self._atomic_write(self._meta_path(url), json.dumps(meta).encode('utf-8'))
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """Write a file so concurrent readers never see partial content."""
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
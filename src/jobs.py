@@ -0,0 +1,216 @@
+"""
+Resumable batch jobs.
+Per-URL job status is stored in SQLite, and each item's LangGraph run is
+checkpointed under its own thread id so an interrupted conversion resumes from
+its last completed node.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    from .models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from .paths import get_data_dir
+except ImportError:
+    from models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+@dataclass
+class JobItem:
+    """Status of one URL in a job."""
+    position: int
+    url: str
+    status: str = PENDING
+    attempts: int = 0
+    title: Optional[str] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+def thread_id(job_id: str, position: int) -> str:
+    """Checkpoint thread id for one item of a job."""
+    return f"{job_id}:{position}"
+
+
+def checkpoint_serializer():
+    """Checkpoint serializer that may load the lesson dataclasses kept in the graph state."""
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    try:
+        return JsonPlusSerializer(allowed_msgpack_modules=[
+            (cls.__module__, cls.__name__) for cls in (EngooArticle, VocabularyItem, DiscussionQuestion)
+        ])
+    except TypeError:
+        # Older langgraph-checkpoint releases have no allow-list and load any module
+        logger.warning("langgraph-checkpoint predates allowed_msgpack_modules, using the default checkpoint serializer")
+        return JsonPlusSerializer()
+
+
+def create_checkpointer(path: Optional[Union[str, Path]] = None) -> Any:
+    """
+    Create a persistent LangGraph checkpointer.
+
+    Requires the langgraph-checkpoint-sqlite package.
+
+    Args:
+        path: SQLite database file (default: checkpoints.sqlite3 in the data dir)
+
+    Returns:
+        SqliteSaver
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    path = Path(path) if path else get_data_dir() / 'checkpoints.sqlite3'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn, serde=checkpoint_serializer())
+
+
+class JobStore:
+    """SQLite-backed record of batch jobs and the status of each of their URLs."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (and create if needed) the job store.
+
+        Args:
+            path: SQLite database file (default: jobs.sqlite3 in the data dir)
+        """
+        self.path = Path(path) if path else get_data_dir() / 'jobs.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                source TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                title TEXT,
+                output_path TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, position)
+            );
+        """)
+        self._conn.commit()
+
+    def start(self, job_id: str, urls: List[str], source: Optional[str] = None) -> List[JobItem]:
+        """
+        Register a job, or reopen it if it already exists.
+
+        Args:
+            job_id: Job name
+            urls: The job's URLs, in order; positions start at 1
+            source: Where the URLs came from, for display
+
+        Returns:
+            The job's items with their recorded status
+
+        Raises:
+            ValueError: If the job exists with a different URL list
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT position, url FROM job_items WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+            if existing and [row['url'] for row in existing] != list(urls):
+                raise ValueError(f"Job {job_id!r} was started with a different list of URLs")
+
+            self._conn.execute(
+                "INSERT INTO jobs (id, source, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET updated_at = excluded.updated_at",
+                (job_id, source, now, now)
+            )
+            if not existing:
+                self._conn.executemany(
+                    "INSERT INTO job_items (job_id, position, url, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    [(job_id, position, url, PENDING, now) for position, url in enumerate(urls, 1)]
+                )
+        return self.items(job_id)
+
+    def items(self, job_id: str) -> List[JobItem]:
+        """Get a job's items in order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, url, status, attempts, title, output_path, error FROM job_items "
+                "WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [JobItem(**dict(row)) for row in rows]
+
+    def mark_running(self, job_id: str, position: int) -> None:
+        """Record that an item's conversion has started."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, attempts = attempts + 1, error = NULL, updated_at = ? "
+                "WHERE job_id = ? AND position = ?",
+                (RUNNING, time.time(), job_id, position)
+            )
+
+    def mark_done(self, job_id: str, position: int, title: str, output_path: str) -> None:
+        """Record a finished item and where its lesson was written."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, title = ?, output_path = ?, error = NULL, updated_at = ? "
+                "WHERE job_id = ? AND position = ?",
+                (DONE, title, output_path, time.time(), job_id, position)
+            )
+
+    def mark_failed(self, job_id: str, position: int, error: str) -> None:
+        """Record a failed item; it is retried when the job is run again."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, error = ?, updated_at = ? WHERE job_id = ? AND position = ?",
+                (FAILED, error, time.time(), job_id, position)
+            )
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        """Number of items in each status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Forget a job and its item status.
+
+        Returns:
+            True if a job was deleted
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            return self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount > 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,282 @@
+"""
+Local library of generated lessons.
+Lessons are normalised into SQLite tables with an FTS5 index for full-text search.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    from .models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from .paths import get_data_dir
+except ImportError:
+    from models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredLesson:
+    """A lesson as saved in the library."""
+    id: int
+    url: Optional[str]
+    created_at: float
+    updated_at: float
+    article: EngooArticle
+
+
+@dataclass
+class LessonMatch:
+    """A search result."""
+    id: int
+    url: Optional[str]
+    title: str
+    created_at: float
+    snippet: str = ""
+
+
+class LessonLibrary:
+    """SQLite-backed lesson store with full-text search over titles, bodies, vocabulary and questions."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (and create if needed) the library.
+
+        Args:
+            path: SQLite database file (default: library.sqlite3 in the data dir)
+        """
+        self.path = Path(path) if path else get_data_dir() / 'library.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS lessons (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                title TEXT NOT NULL,
+                article_body TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS vocabulary (
+                lesson_id INTEGER NOT NULL REFERENCES lessons (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                definition TEXT NOT NULL,
+                example TEXT NOT NULL,
+                PRIMARY KEY (lesson_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_vocabulary_word ON vocabulary (word COLLATE NOCASE);
+            CREATE TABLE IF NOT EXISTS questions (
+                lesson_id INTEGER NOT NULL REFERENCES lessons (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                level TEXT NOT NULL,
+                question TEXT NOT NULL,
+                PRIMARY KEY (lesson_id, level, position)
+            );
+        """)
+
+        # The FTS row id is the lesson id
+        try:
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS lessons_fts USING fts5(
+                    title, article_body, vocabulary, questions, tokenize='porter unicode61'
+                )
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, library search falls back to LIKE: {e}")
+            self.has_fts = False
+        self._conn.commit()
+
+    def save(self, article: EngooArticle, url: Optional[str] = None) -> int:
+        """
+        Save a lesson; a lesson already stored for the same URL is replaced.
+
+        Args:
+            article: The lesson
+            url: Source article URL
+
+        Returns:
+            The lesson id
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = None
+            if url is not None:
+                row = self._conn.execute("SELECT id FROM lessons WHERE url = ?", (url,)).fetchone()
+
+            if row is None:
+                lesson_id = self._conn.execute(
+                    "INSERT INTO lessons (url, title, article_body, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (url, article.title, article.article_body, now, now)
+                ).lastrowid
+            else:
+                lesson_id = row['id']
+                self._conn.execute(
+                    "UPDATE lessons SET title = ?, article_body = ?, updated_at = ? WHERE id = ?",
+                    (article.title, article.article_body, now, lesson_id)
+                )
+                self._conn.execute("DELETE FROM vocabulary WHERE lesson_id = ?", (lesson_id,))
+                self._conn.execute("DELETE FROM questions WHERE lesson_id = ?", (lesson_id,))
+                if self.has_fts:
+                    self._conn.execute("DELETE FROM lessons_fts WHERE rowid = ?", (lesson_id,))
+
+            self._conn.executemany(
+                "INSERT INTO vocabulary (lesson_id, position, word, definition, example) VALUES (?, ?, ?, ?, ?)",
+                [(lesson_id, i, v.word, v.definition, v.example) for i, v in enumerate(article.vocabulary)]
+            )
+            self._conn.executemany(
+                "INSERT INTO questions (lesson_id, position, level, question) VALUES (?, ?, ?, ?)",
+                [(lesson_id, i, q.level, q.question)
+                 for questions in (article.discussion_questions, article.further_discussion_questions)
+                 for i, q in enumerate(questions)]
+            )
+            if self.has_fts:
+                self._conn.execute(
+                    "INSERT INTO lessons_fts (rowid, title, article_body, vocabulary, questions) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        lesson_id,
+                        article.title,
+                        article.article_body,
+                        '\n'.join(f"{v.word}: {v.definition} {v.example}" for v in article.vocabulary),
+                        '\n'.join(q.question for q in article.discussion_questions + article.further_discussion_questions)
+                    )
+                )
+        return lesson_id
+
+    def get(self, lesson_id: int) -> Optional[StoredLesson]:
+        """
+        Load a lesson by id.
+
+        Args:
+            lesson_id: Id returned by save() or search()
+
+        Returns:
+            StoredLesson, or None if there is no such lesson
+        """
+        with self._lock:
+            lesson = self._conn.execute("SELECT * FROM lessons WHERE id = ?", (lesson_id,)).fetchone()
+            if lesson is None:
+                return None
+            vocabulary = self._conn.execute(
+                "SELECT word, definition, example FROM vocabulary WHERE lesson_id = ? ORDER BY position", (lesson_id,)
+            ).fetchall()
+            questions = self._conn.execute(
+                "SELECT level, question FROM questions WHERE lesson_id = ? ORDER BY position", (lesson_id,)
+            ).fetchall()
+
+        article = EngooArticle(
+            title=lesson['title'],
+            vocabulary=[VocabularyItem(v['word'], v['definition'], v['example']) for v in vocabulary],
+            article_body=lesson['article_body'],
+            discussion_questions=[DiscussionQuestion(q['question'], q['level']) for q in questions if q['level'] != 'further'],
+            further_discussion_questions=[DiscussionQuestion(q['question'], q['level']) for q in questions if q['level'] == 'further']
+        )
+        return StoredLesson(lesson['id'], lesson['url'], lesson['created_at'], lesson['updated_at'], article)
+
+    def search(self, query: str = "", limit: int = 20) -> List[LessonMatch]:
+        """
+        Find lessons by topic, vocabulary or question text.
+
+        Every word in the query must match (as a prefix, with stemming);
+        results are ranked by relevance. An empty query lists the most recent lessons.
+
+        Args:
+            query: Free-text search
+            limit: Maximum number of results
+
+        Returns:
+            Matching lessons, best first
+        """
+        terms = re.findall(r'\w+', query)
+        with self._lock:
+            if not terms:
+                rows = self._conn.execute(
+                    "SELECT id, url, title, created_at, '' AS snippet FROM lessons ORDER BY updated_at DESC LIMIT ?",
+                    (limit,)
+                ).fetchall()
+            elif self.has_fts:
+                fts_query = ' '.join(f'"{term}"*' for term in terms)
+                rows = self._conn.execute(
+                    """
+                    SELECT l.id, l.url, l.title, l.created_at,
+                           snippet(lessons_fts, -1, '[', ']', '...', 12) AS snippet
+                    FROM lessons_fts JOIN lessons l ON l.id = lessons_fts.rowid
+                    WHERE lessons_fts MATCH ?
+                    ORDER BY bm25(lessons_fts, 10.0, 1.0, 5.0, 1.0)
+                    LIMIT ?
+                    """,
+                    (fts_query, limit)
+                ).fetchall()
+            else:
+                conditions = ' AND '.join(
+                    "(l.title LIKE ? OR l.article_body LIKE ? OR EXISTS "
+                    "(SELECT 1 FROM vocabulary v WHERE v.lesson_id = l.id AND v.word LIKE ?))"
+                    for _ in terms
+                )
+                params = [f"%{term}%" for term in terms for _ in range(3)]
+                rows = self._conn.execute(
+                    f"SELECT l.id, l.url, l.title, l.created_at, '' AS snippet FROM lessons l "
+                    f"WHERE {conditions} ORDER BY l.updated_at DESC LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+
+        return [LessonMatch(row['id'], row['url'], row['title'], row['created_at'], row['snippet']) for row in rows]
+
+    def search_word(self, word: str, limit: int = 20) -> List[LessonMatch]:
+        """
+        Find lessons that teach a vocabulary word (case-insensitive exact match).
+
+        Args:
+            word: Vocabulary word
+            limit: Maximum number of results
+
+        Returns:
+            Matching lessons, most recent first, with the definition as snippet
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT l.id, l.url, l.title, l.created_at, v.word || ': ' || v.definition AS snippet
+                FROM vocabulary v JOIN lessons l ON l.id = v.lesson_id
+                WHERE v.word = ? COLLATE NOCASE
+                ORDER BY l.updated_at DESC
+                LIMIT ?
+                """,
+                (word.strip(), limit)
+            ).fetchall()
+        return [LessonMatch(row['id'], row['url'], row['title'], row['created_at'], row['snippet']) for row in rows]
+
+    def delete(self, lesson_id: int) -> bool:
+        """
+        Remove a lesson.
+
+        Returns:
+            True if a lesson was deleted
+        """
+        with self._lock, self._conn:
+            if self.has_fts:
+                self._conn.execute("DELETE FROM lessons_fts WHERE rowid = ?", (lesson_id,))
+            return self._conn.execute("DELETE FROM lessons WHERE id = ?", (lesson_id,)).rowcount > 0
+
+    def count(self) -> int:
+        """Number of stored lessons."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lessons").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
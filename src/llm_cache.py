@@ -0,0 +1,179 @@
+"""
+Persistent cache for OpenAI chat completion responses.
+Responses are content-addressed by the request parameters and stored in SQLite.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    from .paths import get_cache_dir
+except ImportError:
+    from paths import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL and size-bounded LRU eviction."""
+
+    def __init__(self,
+                 path: Optional[Union[str, Path]] = None,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (default: llm_cache.sqlite3 in the cache dir)
+            ttl_seconds: Maximum age of an entry, or None to never expire
+            max_bytes: Total response size to keep before evicting least recently used entries
+        """
+        self.path = Path(path) if path else get_cache_dir() / 'llm_cache.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str,
+                 messages: List[Dict[str, Any]],
+                 temperature: Optional[float] = None,
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the content-addressed cache key for a chat completion request.
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON request parameters
+        """
+        payload = json.dumps({
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'response_format': response_format
+        }, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response content, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, content: str) -> None:
+        """
+        Store a response and evict old entries if the cache is over its size limit.
+
+        Args:
+            key: Cache key from make_key()
+            content: Response content to store
+        """
+        now = time.time()
+        size = len(content.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, size, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_accessed ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} LLM cache entries")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, entries and total stored bytes
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': total
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
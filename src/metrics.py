@@ -0,0 +1,214 @@
+"""
+Per-conversion instrumentation.
+Collects stage timings, download sizes and OpenAI token usage for the
+conversion running in the current context.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_current_metrics: ContextVar[Optional['ConversionMetrics']] = ContextVar('engoo_conversion_metrics', default=None)
+_log_lock = threading.Lock()
+
+
+class ConversionMetrics:
+    """Measurements for a single article conversion."""
+
+    def __init__(self, url: str):
+        """
+        Initialize empty metrics.
+
+        Args:
+            url: The URL being converted
+        """
+        self.url = url
+        self.started_at = time.time()
+        self.total_seconds = 0.0
+        self.stages: Dict[str, float] = {}
+        self.bytes_downloaded = 0
+        self.llm_calls: List[Dict[str, Any]] = []
+        # Section generators record from worker threads
+        self._lock = threading.Lock()
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        """Add wall time spent in a pipeline stage."""
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def record_download(self, num_bytes: int) -> None:
+        """Add bytes fetched from the network."""
+        with self._lock:
+            self.bytes_downloaded += num_bytes
+
+    def record_llm_call(self,
+                        action: Optional[str],
+                        seconds: float,
+                        prompt_tokens: int = 0,
+                        completion_tokens: int = 0,
+                        cached: bool = False) -> None:
+        """
+        Record one chat completion.
+
+        Args:
+            action: Section the call was made for, e.g. "extracting vocabulary"
+            seconds: Wall time of the call, including retries
+            prompt_tokens: Prompt tokens billed
+            completion_tokens: Completion tokens billed
+            cached: True if the response came from the LLM cache
+        """
+        with self._lock:
+            self.llm_calls.append({
+                'action': action,
+                'seconds': round(seconds, 4),
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'cached': cached
+            })
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarise the metrics as a JSON-serialisable dictionary.
+
+        Returns:
+            Dictionary with stage timings, download size, per-call LLM records and totals
+        """
+        with self._lock:
+            calls = list(self.llm_calls)
+            return {
+                'url': self.url,
+                'started_at': self.started_at,
+                'total_seconds': round(self.total_seconds, 4),
+                'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+                'bytes_downloaded': self.bytes_downloaded,
+                'llm': {
+                    'calls': len(calls),
+                    'cache_hits': sum(1 for call in calls if call['cached']),
+                    'prompt_tokens': sum(call['prompt_tokens'] for call in calls),
+                    'completion_tokens': sum(call['completion_tokens'] for call in calls),
+                    'seconds': round(sum(call['seconds'] for call in calls), 4)
+                },
+                'llm_calls': calls
+            }
+
+
+def current_metrics() -> Optional[ConversionMetrics]:
+    """Get the metrics of the conversion running in this context, if any."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def collect(url: str) -> Iterator[ConversionMetrics]:
+    """
+    Collect metrics for one conversion.
+
+    Code called inside the block, including threads started with a copied
+    context and asyncio tasks, records into the yielded object.
+
+    Args:
+        url: The URL being converted
+
+    Yields:
+        The ConversionMetrics being filled
+    """
+    metrics = ConversionMetrics(url)
+    token = _current_metrics.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.total_seconds = time.perf_counter() - start
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a pipeline stage of the current conversion."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.record_stage(name, time.perf_counter() - start)
+
+
+def record_download(num_bytes: int) -> None:
+    """Record downloaded bytes against the current conversion, if any."""
+    metrics = _current_metrics.get()
+    if metrics is not None and num_bytes:
+        metrics.record_download(num_bytes)
+
+
+def record_llm_call(action: Optional[str], seconds: float, usage: Any = None, cached: bool = False) -> None:
+    """
+    Record a chat completion against the current conversion, if any.
+
+    Args:
+        action: Section the call was made for
+        seconds: Wall time of the call
+        usage: The response's usage object (prompt_tokens / completion_tokens)
+        cached: True if the response came from the LLM cache
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    metrics.record_llm_call(
+        action,
+        seconds,
+        prompt_tokens=getattr(usage, 'prompt_tokens', None) or 0,
+        completion_tokens=getattr(usage, 'completion_tokens', None) or 0,
+        cached=cached
+    )
+
+
+def append_metrics_log(path: Union[str, Path], record: Dict[str, Any]) -> None:
+    """
+    Append one metrics record to a JSON-lines log.
+
+    Args:
+        path: Log file path
+        record: Dictionary from ConversionMetrics.to_dict()
+    """
+    line = json.dumps(record, ensure_ascii=False)
+    try:
+        with _log_lock:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+    except OSError as e:
+        logger.warning(f"Could not write metrics log {path}: {e}")
+
+
+def format_timings(metrics: Dict[str, Any]) -> str:
+    """
+    Format a metrics dictionary as a per-stage breakdown for the terminal.
+
+    Args:
+        metrics: Dictionary from ConversionMetrics.to_dict()
+
+    Returns:
+        Multi-line text table
+    """
+    total = metrics['total_seconds'] or 0.0
+    lines = [f"{'Stage':<20} {'Seconds':>9} {'Share':>7}"]
+    for name, seconds in metrics['stages'].items():
+        share = seconds / total * 100 if total else 0.0
+        lines.append(f"{name:<20} {seconds:>9.3f} {share:>6.1f}%")
+    lines.append(f"{'total':<20} {total:>9.3f}")
+
+    llm = metrics['llm']
+    lines.append("")
+    lines.append(f"Downloaded: {metrics['bytes_downloaded']:,} bytes")
+    lines.append(f"OpenAI calls: {llm['calls']} ({llm['cache_hits']} cached), "
+                 f"{llm['prompt_tokens']:,} prompt + {llm['completion_tokens']:,} completion tokens")
+    for call in metrics['llm_calls']:
+        source = "cache" if call['cached'] else f"{call['prompt_tokens']}+{call['completion_tokens']} tokens"
+        lines.append(f"  {call['action'] or 'request':<40} {call['seconds']:>8.3f}s  {source}")
+    return '\n'.join(lines)
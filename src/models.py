@@ -1,7 +1,83 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import os
+import re
+import threading
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), '..', 'engoo_template.html')
+
+_SLOT_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+
+class CompiledTemplate:
+    """A template parsed once into static segments and named slots."""
+    
+    def __init__(self, source: str):
+        """
+        Parse a template.
+        
+        Args:
+            source: Template text with {{name}} placeholders
+        """
+        # re.split with one group alternates static text and slot names
+        parts = _SLOT_PATTERN.split(source)
+        self.segments: List[str] = parts[0::2]
+        self.slots: List[str] = parts[1::2]
+    
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Fill the slots in a single join.
+        
+        Args:
+            values: Slot name to text; unknown slots are left as written
+        
+        Returns:
+            The rendered text
+        """
+        out = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            value = values.get(slot)
+            out.append(value if value is not None else '{{' + slot + '}}')
+            out.append(segment)
+        return ''.join(out)
+
+
+# Compiled templates keyed by path, with the mtime they were read at
+_compiled_templates: Dict[str, Tuple[int, CompiledTemplate]] = {}
+_compiled_templates_lock = threading.Lock()
+
+
+def load_template(path: str = TEMPLATE_PATH) -> Optional[CompiledTemplate]:
+    """
+    Get the compiled template for a path, re-reading it only when its mtime changes.
+    
+    Args:
+        path: Template file path
+    
+    Returns:
+        CompiledTemplate, or None if the file does not exist
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    
+    cached = _compiled_templates.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with _compiled_templates_lock:
+        cached = _compiled_templates.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                template = CompiledTemplate(f.read())
+        except OSError:
+            return None
+        _compiled_templates[path] = (mtime, template)
+        return template
 
 
 @dataclass
@@ -28,57 +104,75 @@ class EngooArticle:
     discussion_questions: List[DiscussionQuestion]
     further_discussion_questions: List[DiscussionQuestion]
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the article to a JSON-serialisable dictionary (the lesson fields of a result)."""
+        return {
+            'title': self.title,
+            'vocabulary': [
+                {
+                    'word': vocab.word,
+                    'definition': vocab.definition,
+                    'example': vocab.example
+                }
+                for vocab in self.vocabulary
+            ],
+            'article_body': self.article_body,
+            'discussion_questions': [q.question for q in self.discussion_questions],
+            'further_discussion_questions': [q.question for q in self.further_discussion_questions]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EngooArticle':
+        """
+        Rebuild an article from to_dict() output, e.g. a result's 'article' entry.
+        
+        Args:
+            data: Dictionary with the lesson fields; extra keys are ignored
+        
+        Returns:
+            EngooArticle
+        """
+        return cls(
+            title=data['title'],
+            vocabulary=[VocabularyItem(v['word'], v['definition'], v['example']) for v in data.get('vocabulary', [])],
+            article_body=data.get('article_body', ''),
+            discussion_questions=[DiscussionQuestion(q, "standard") for q in data.get('discussion_questions', [])],
+            further_discussion_questions=[DiscussionQuestion(q, "further") for q in data.get('further_discussion_questions', [])]
+        )
+    
     def to_html(self) -> str:
         """Convert the article to HTML format exactly like Engoo daily news."""
-        # Read the template
-        template_path = os.path.join(os.path.dirname(__file__), '..', 'engoo_template.html')
-        if os.path.exists(template_path):
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template = f.read()
-        else:
+        # The template is read and parsed once, and again only after it changes
+        template = load_template()
+        if template is None:
             # Fallback to simple template if file not found
             return self._simple_html()
         
-        # Generate vocabulary HTML
-        vocabulary_html = ""
-        for vocab in self.vocabulary:
-            vocabulary_html += f"""
+        return template.render({
+            'title': self.title,
+            'date': datetime.now().strftime('%B %d, %Y'),
+            'vocabulary_items': self._vocabulary_html(),
+            'article_content': self._format_article_content(self.article_body),
+            'discussion_questions': self._questions_html(self.discussion_questions),
+            'further_discussion_questions': self._questions_html(self.further_discussion_questions)
+        })
+    
+    def _vocabulary_html(self) -> str:
+        """Generate the vocabulary items HTML."""
+        return "".join(f"""
             <div class="vocabulary-item">
                 <div class="vocabulary-word">{vocab.word}</div>
                 <div class="vocabulary-definition">{vocab.definition}</div>
                 <div class="vocabulary-example">"{vocab.example}"</div>
-            </div>"""
-        
-        # Generate discussion questions HTML
-        discussion_html = ""
-        for i, question in enumerate(self.discussion_questions, 1):
-            discussion_html += f"""
-            <div class="question-item">
-                <span class="question-number">{i}.</span>
-                <span class="question-text">{question.question}</span>
-            </div>"""
-        
-        # Generate further discussion questions HTML
-        further_discussion_html = ""
-        for i, question in enumerate(self.further_discussion_questions, 1):
-            further_discussion_html += f"""
+            </div>""" for vocab in self.vocabulary)
+    
+    def _questions_html(self, questions: List[DiscussionQuestion]) -> str:
+        """Generate the numbered question items HTML."""
+        return "".join(f"""
             <div class="question-item">
                 <span class="question-number">{i}.</span>
                 <span class="question-text">{question.question}</span>
-            </div>"""
-        
-        # Format article content with proper paragraphs
-        formatted_content = self._format_article_content(self.article_body)
-        
-        # Replace placeholders
-        html = template.replace('{{title}}', self.title)
-        html = html.replace('{{date}}', datetime.now().strftime('%B %d, %Y'))
-        html = html.replace('{{vocabulary_items}}', vocabulary_html)
-        html = html.replace('{{article_content}}', formatted_content)
-        html = html.replace('{{discussion_questions}}', discussion_html)
-        html = html.replace('{{further_discussion_questions}}', further_discussion_html)
-        
-        return html
+            </div>""" for i, question in enumerate(questions, 1))
     
     def _format_article_content(self, content: str) -> str:
         """Format the article content with proper HTML structure."""
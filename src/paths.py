@@ -0,0 +1,48 @@
+"""
+Filesystem locations for caches and local data.
+"""
+
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used for persistent caches.
+    
+    Uses ENGOO_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/engoo-writer
+    (defaulting to ~/.cache/engoo-writer). The directory is created if needed.
+    
+    Returns:
+        Path to the cache directory
+    """
+    cache_dir = os.getenv('ENGOO_CACHE_DIR')
+    if cache_dir:
+        path = Path(cache_dir).expanduser()
+    else:
+        xdg_cache = os.getenv('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+        path = Path(xdg_cache).expanduser() / 'engoo-writer'
+    
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_data_dir() -> Path:
+    """
+    Get the directory used for local data such as the lesson library.
+    
+    Uses ENGOO_DATA_DIR if set, otherwise $XDG_DATA_HOME/engoo-writer
+    (defaulting to ~/.local/share/engoo-writer). The directory is created if needed.
+    
+    Returns:
+        Path to the data directory
+    """
+    data_dir = os.getenv('ENGOO_DATA_DIR')
+    if data_dir:
+        path = Path(data_dir).expanduser()
+    else:
+        xdg_data = os.getenv('XDG_DATA_HOME') or os.path.join('~', '.local', 'share')
+        path = Path(xdg_data).expanduser() / 'engoo-writer'
+    
+    path.mkdir(parents=True, exist_ok=True)
+    return path
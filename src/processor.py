@@ -1,32 +1,103 @@
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, AsyncIterator, Optional, Callable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from openai import OpenAI, AsyncOpenAI
+import asyncio
+import contextlib
+import contextvars
 import json
 import logging
+import time
 
 try:
     from .models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from .llm_cache import LLMCache
+    from .aio import LoopLocalSemaphore
+    from .tokens import TokenBudget, TokenCounter
+    from .rate_limit import RateLimitGovernor, RetriesExhaustedError
+    from .metrics import record_llm_call
+    from .glossary import Glossary, lemmatize
+    from . import progress
 except ImportError:
     from models import EngooArticle, VocabularyItem, DiscussionQuestion
+    from llm_cache import LLMCache
+    from aio import LoopLocalSemaphore
+    from tokens import TokenBudget, TokenCounter
+    from rate_limit import RateLimitGovernor, RetriesExhaustedError
+    from metrics import record_llm_call
+    from glossary import Glossary, lemmatize
+    import progress
 
 logger = logging.getLogger(__name__)
 
+# Map-reduce limits for articles over the rewrite token budget
+MAX_CONDENSE_ROUNDS = 3
+MAX_SUMMARY_WORKERS = 8
+
+# Sent to a body stream whose section failed, since the listener may already show part of it
+STREAM_FALLBACK_NOTICE = "\n\n[The rewrite failed; the saved lesson uses the original article text instead.]\n"
+
 
 class ContentProcessor:
     """Handles content processing using OpenAI API to generate Engoo-style content."""
     
-    def __init__(self, openai_client: OpenAI):
+    def __init__(self,
+                 openai_client: OpenAI,
+                 concurrent: bool = False,
+                 cache: Optional[LLMCache] = None,
+                 async_client: Optional[AsyncOpenAI] = None,
+                 max_concurrent_requests: int = 16,
+                 token_budget: Optional[TokenBudget] = None,
+                 token_counter: Optional[TokenCounter] = None,
+                 governor: Optional[RateLimitGovernor] = None,
+                 glossary: Optional[Glossary] = None):
+        """
+        Initialize the content processor.
+        
+        Args:
+            openai_client: OpenAI client used for all chat completions
+            concurrent: Run independent section generators in parallel threads
+            cache: Optional response cache; identical requests are served from it
+            async_client: AsyncOpenAI client used by aprocess_article
+            max_concurrent_requests: Limit on in-flight async chat completions
+            token_budget: Per-stage limits on article tokens sent to the model
+            token_counter: Tokenizer used to measure articles (default: gpt-4o-mini)
+            governor: Shared rate-limit governor that retries and paces API calls;
+                requests that still fail after its retries fail the whole article
+            glossary: Cross-lesson definition store; when set, the model only picks
+                words and writes examples, and only unknown words are defined
+        """
         self.client = openai_client
+        self.concurrent = concurrent
+        self.cache = cache
+        self.async_client = async_client
+        self.llm_semaphore = LoopLocalSemaphore(max_concurrent_requests)
+        self.token_budget = token_budget or TokenBudget()
+        self.tokens = token_counter or TokenCounter()
+        self.governor = governor
+        self.glossary = glossary
     
-    def process_article(self, raw_content: Dict[str, Any]) -> EngooArticle:
+    def process_article(self,
+                        raw_content: Dict[str, Any],
+                        on_body_delta: Optional[progress.TextCallback] = None) -> EngooArticle:
         """
         Process raw article content into Engoo daily news format.
         
         Args:
             raw_content: Dictionary containing title, text, and metadata
-            
+            on_body_delta: Stream the article rewrite, calling this with each piece
+                of the body as the model writes it; questions are generated as
+                soon as the stream ends
+        
         Returns:
             EngooArticle object with all sections populated
         """
+        with progress.stream_body(on_body_delta):
+            if self.concurrent:
+                return self._process_article_concurrently(raw_content)
+            return self._process_article_sequentially(raw_content)
+    
+    def _process_article_sequentially(self, raw_content: Dict[str, Any]) -> EngooArticle:
+        """Process an article one section at a time."""
         # Extract key vocabulary
         vocabulary = self._extract_vocabulary(raw_content['text'])
         
@@ -47,14 +118,506 @@ class ContentProcessor:
             further_discussion_questions=further_discussion_questions
         )
     
+    def _process_article_concurrently(self, raw_content: Dict[str, Any]) -> EngooArticle:
+        """
+        Process an article by running the section generators as a dependency graph.
+        
+        Vocabulary extraction runs alongside the rewrite; both question generators
+        start as soon as the rewritten body is available. Wall-clock time is about
+        two LLM round-trips instead of four.
+        """
+        title = raw_content['title']
+        text = raw_content['text']
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            vocabulary_future = self._submit(executor, self._extract_vocabulary, text)
+            
+            # The rewrite gates the question generators, so run it on this thread
+            article_body = self._rewrite_article_body(title, text)
+            
+            discussion_future = self._submit(executor, self._generate_discussion_questions, title, article_body)
+            further_future = self._submit(executor, self._generate_further_discussion_questions, title, article_body)
+            
+            return EngooArticle(
+                title=title,
+                vocabulary=vocabulary_future.result(),
+                article_body=article_body,
+                discussion_questions=discussion_future.result(),
+                further_discussion_questions=further_future.result()
+            )
+    
+    async def aprocess_article(self,
+                               raw_content: Dict[str, Any],
+                               on_body_delta: Optional[progress.TextCallback] = None) -> EngooArticle:
+        """
+        Process raw article content into Engoo daily news format on the event loop.
+        
+        Uses the same dependency graph as concurrent mode: vocabulary alongside the
+        rewrite, then both question generators together.
+        
+        Args:
+            raw_content: Dictionary containing title, text, and metadata
+            on_body_delta: Stream the article rewrite, as for process_article
+        
+        Returns:
+            EngooArticle object with all sections populated
+        """
+        if self.async_client is None:
+            raise ValueError("aprocess_article requires an AsyncOpenAI client")
+        
+        with progress.stream_body(on_body_delta):
+            return await self._aprocess_article(raw_content)
+    
+    async def _aprocess_article(self, raw_content: Dict[str, Any]) -> EngooArticle:
+        """Run the async section graph for aprocess_article."""
+        title = raw_content['title']
+        text = raw_content['text']
+        
+        vocabulary_task = asyncio.ensure_future(self._aextract_vocabulary(text))
+        try:
+            article_body = await self._arewrite_article_body(title, text)
+            discussion_questions, further_discussion_questions = await asyncio.gather(
+                self._agenerate_discussion_questions(title, article_body),
+                self._agenerate_further_discussion_questions(title, article_body)
+            )
+            vocabulary = await vocabulary_task
+        finally:
+            vocabulary_task.cancel()
+        
+        return EngooArticle(
+            title=title,
+            vocabulary=vocabulary,
+            article_body=article_body,
+            discussion_questions=discussion_questions,
+            further_discussion_questions=further_discussion_questions
+        )
+    
+    def stream_article_body(self, title: str, text: str) -> Iterator[str]:
+        """
+        Rewrite an article for ESL learners, yielding the body as the model writes it.
+        
+        Long articles are condensed first, as in process_article. Unlike the lesson
+        pipeline there is no fallback text: API errors propagate to the caller.
+        
+        Args:
+            title: Article title
+            text: Original article text
+        
+        Yields:
+            Pieces of the rewritten body; joined and stripped, they are the article_body
+        """
+        source_text = self._condense_article(title, text)
+        params = self._rewrite_request(title, source_text)
+        key, cached = self._cache_lookup("rewriting article body", params)
+        if cached is not None:
+            yield cached
+            return
+        
+        pieces = []
+        for delta in self._iter_completion("rewriting article body", **params):
+            pieces.append(delta)
+            yield delta
+        self._cache_store(key, ''.join(pieces))
+    
+    def _submit(self, executor: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any):
+        """Submit fn in a copy of the caller's context, so metrics follow the work."""
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+    
+    def _cache_lookup(self, action: Optional[str], params: Dict[str, Any]):
+        """
+        Look a request up in the response cache.
+        
+        Returns:
+            (key, cached): the cached content on a hit, otherwise the key to store
+            the fresh response under; both None without a cache
+        
+        A hit is recorded in the conversion metrics. Nothing is stored here: the
+        caller caches a fresh response with _cache_store once it has parsed.
+        """
+        if self.cache is None:
+            return None, None
+        
+        start = time.perf_counter()
+        key = LLMCache.make_key(
+            params['model'],
+            params['messages'],
+            params.get('temperature'),
+            params.get('response_format')
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug("LLM cache hit")
+            record_llm_call(action, time.perf_counter() - start, cached=True)
+            return None, cached
+        return key, None
+    
+    def _cache_store(self, key: Optional[str], content: Optional[str]) -> None:
+        """Cache a response that was usable; key is None for cached or uncacheable responses."""
+        if key is not None and content:
+            self.cache.set(key, content)
+    
+    def _create_completion(self, action: Optional[str] = None, **params: Any) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Run a chat completion, going through the response cache when configured.
+        
+        Args:
+            action: Section being generated, recorded in the conversion metrics
+            **params: Keyword arguments for client.chat.completions.create
+        
+        Returns:
+            (content, key): message content of the first choice, and the cache key
+            to store it under once it parses (None if it came from the cache)
+        """
+        key, cached = self._cache_lookup(action, params)
+        if cached is not None:
+            return cached, None
+        
+        start = time.perf_counter()
+        if self.governor is None:
+            response = self.client.chat.completions.create(**params)
+        else:
+            # The raw response exposes the x-ratelimit-* headers to the governor
+            response = self.governor.call(
+                lambda: self.client.chat.completions.with_raw_response.create(**params)
+            ).parse()
+        record_llm_call(action, time.perf_counter() - start, getattr(response, 'usage', None))
+        return response.choices[0].message.content, key
+    
+    async def _acreate_completion(self, action: Optional[str] = None, **params: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Async variant of _create_completion, bounded by the LLM semaphore."""
+        key, cached = self._cache_lookup(action, params)
+        if cached is not None:
+            return cached, None
+        
+        start = time.perf_counter()
+        async with self.llm_semaphore:
+            if self.governor is None:
+                response = await self.async_client.chat.completions.create(**params)
+            else:
+                raw_response = await self.governor.acall(
+                    lambda: self.async_client.chat.completions.with_raw_response.create(**params)
+                )
+                response = raw_response.parse()
+        record_llm_call(action, time.perf_counter() - start, getattr(response, 'usage', None))
+        return response.choices[0].message.content, key
+    
+    def _iter_completion(self, action: Optional[str] = None, **params: Any) -> Iterator[str]:
+        """
+        Stream a chat completion from the API, yielding its text as it arrives.
+        
+        The finished stream is recorded in the metrics; the response cache is left
+        to the caller.
+        """
+        start = time.perf_counter()
+        params = dict(params, stream=True, stream_options={"include_usage": True})
+        usage = None
+        with contextlib.ExitStack() as stack:
+            if self.governor is None:
+                stream = self.client.chat.completions.create(**params)
+            else:
+                # The governor slot is held until the stream is read or closed, so
+                # a streaming rewrite counts against the concurrency limit
+                raw_response = self.governor.call(
+                    lambda: self.client.chat.completions.with_raw_response.create(**params), hold=True
+                )
+                stack.callback(self.governor.release)
+                stream = raw_response.parse()
+            stack.enter_context(contextlib.closing(stream))
+            for chunk in stream:
+                # With include_usage the last chunk has no choices, only the token counts
+                usage = chunk.usage or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        record_llm_call(action, time.perf_counter() - start, usage)
+    
+    async def _aiter_completion(self, action: Optional[str] = None, **params: Any) -> AsyncIterator[str]:
+        """Async variant of _iter_completion, holding an LLM semaphore (and governor) slot while streaming."""
+        start = time.perf_counter()
+        params = dict(params, stream=True, stream_options={"include_usage": True})
+        usage = None
+        async with self.llm_semaphore, contextlib.AsyncExitStack() as stack:
+            if self.governor is None:
+                stream = await self.async_client.chat.completions.create(**params)
+            else:
+                raw_response = await self.governor.acall(
+                    lambda: self.async_client.chat.completions.with_raw_response.create(**params), hold=True
+                )
+                stack.callback(self.governor.release)
+                stream = raw_response.parse()
+            stack.push_async_callback(stream.close)
+            async for chunk in stream:
+                usage = chunk.usage or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        record_llm_call(action, time.perf_counter() - start, usage)
+    
+    def _stream_completion(self, action: str, on_delta: progress.TextCallback,
+                           **params: Any) -> Tuple[str, Optional[str]]:
+        """
+        Run a chat completion as a stream, passing each piece of text to on_delta.
+        
+        A cached response is passed on whole.
+        
+        Returns:
+            (text, key) as for _create_completion
+        """
+        key, cached = self._cache_lookup(action, params)
+        if cached is not None:
+            self._deliver(on_delta, cached)
+            return cached, None
+        
+        pieces = []
+        with contextlib.closing(self._iter_completion(action, **params)) as deltas:
+            for delta in deltas:
+                progress.check_cancelled()
+                pieces.append(delta)
+                self._deliver(on_delta, delta)
+        return ''.join(pieces), key
+    
+    async def _astream_completion(self, action: str, on_delta: progress.TextCallback,
+                                  **params: Any) -> Tuple[str, Optional[str]]:
+        """Async variant of _stream_completion."""
+        key, cached = self._cache_lookup(action, params)
+        if cached is not None:
+            self._deliver(on_delta, cached)
+            return cached, None
+        
+        pieces = []
+        deltas = self._aiter_completion(action, **params)
+        try:
+            async for delta in deltas:
+                progress.check_cancelled()
+                pieces.append(delta)
+                self._deliver(on_delta, delta)
+        finally:
+            await deltas.aclose()
+        return ''.join(pieces), key
+    
+    def _deliver(self, on_delta: progress.TextCallback, delta: str) -> None:
+        """Hand streamed text to the listener; a broken display must not lose the section."""
+        try:
+            on_delta(delta)
+        except Exception as e:
+            logger.warning(f"Body stream callback failed: {e}")
+    
+    def _run_section(self,
+                     action: str,
+                     params: Dict[str, Any],
+                     parse: Callable[[Optional[str]], Any],
+                     fallback: Any,
+                     stream_to: Optional[progress.TextCallback] = None) -> Any:
+        """
+        Request one lesson section and parse it, falling back on any error.
+        
+        RetriesExhaustedError propagates: a section missing because the API kept
+        failing would produce a broken lesson, so the conversion fails instead.
+        Each section is reported as a progress stage and is where a cancelled
+        conversion stops. With stream_to, the response is streamed to it as it
+        arrives; if it then fails, stream_to is sent STREAM_FALLBACK_NOTICE, as the
+        text it already received is not what the lesson will contain.
+        """
+        try:
+            with progress.step(action):
+                if stream_to is not None:
+                    content, key = self._stream_completion(action, stream_to, **params)
+                else:
+                    content, key = self._create_completion(action, **params)
+                result = parse(content)
+            # Cached only once it parses, so a malformed response is requested again next time
+            self._cache_store(key, content)
+            return result
+        except (RetriesExhaustedError, progress.ConversionCancelled):
+            raise
+        except Exception as e:
+            logger.error(f"Error {action}: {e}")
+            if stream_to is not None:
+                self._deliver(stream_to, STREAM_FALLBACK_NOTICE)
+            return fallback
+    
+    async def _arun_section(self,
+                            action: str,
+                            params: Dict[str, Any],
+                            parse: Callable[[Optional[str]], Any],
+                            fallback: Any,
+                            stream_to: Optional[progress.TextCallback] = None) -> Any:
+        """Async variant of _run_section."""
+        try:
+            with progress.step(action):
+                if stream_to is not None:
+                    content, key = await self._astream_completion(action, stream_to, **params)
+                else:
+                    content, key = await self._acreate_completion(action, **params)
+                result = parse(content)
+            self._cache_store(key, content)
+            return result
+        except (RetriesExhaustedError, progress.ConversionCancelled):
+            raise
+        except Exception as e:
+            logger.error(f"Error {action}: {e}")
+            if stream_to is not None:
+                self._deliver(stream_to, STREAM_FALLBACK_NOTICE)
+            return fallback
+    
     def _extract_vocabulary(self, text: str) -> List[VocabularyItem]:
         """Extract and define key vocabulary words from the article."""
+        if self.glossary is not None:
+            return self._extract_vocabulary_with_glossary(text)
+        return self._run_section("extracting vocabulary", self._vocabulary_request(text), self._parse_vocabulary, [])
+    
+    def _extract_vocabulary_with_glossary(self, text: str) -> List[VocabularyItem]:
+        """Pick words with article-specific examples, reusing glossary definitions and defining only new words."""
+        selection = self._run_section("selecting vocabulary", self._vocabulary_selection_request(text),
+                                      self._parse_vocabulary_selection, [])
+        definitions = self.glossary.lookup(word for word, _ in selection)
+        missing = [word for word, _ in selection if lemmatize(word) not in definitions]
+        if missing:
+            new_definitions = self._run_section("defining vocabulary", self._definitions_request(missing),
+                                                self._parse_definitions, {})
+            self.glossary.add(new_definitions)
+            definitions.update({lemmatize(word): definition for word, definition in new_definitions.items()})
+        return self._build_vocabulary(selection, definitions)
+    
+    def _rewrite_article_body(self, title: str, original_text: str) -> str:
+        """Rewrite the article body to be suitable for ESL learners."""
+        source_text = self._condense_article(title, original_text)
+        # Fallback to truncated original
+        return self._run_section("rewriting article body", self._rewrite_request(title, source_text),
+                                 self._parse_article_body, original_text[:500], stream_to=progress.body_listener())
+    
+    def _generate_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
+        """Generate discussion questions based on the article."""
+        return self._run_section("generating discussion questions", self._discussion_request(title, article_body),
+                                 self._parse_discussion_questions, [])
+    
+    def _generate_further_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
+        """Generate further discussion questions for more advanced discussion."""
+        return self._run_section("generating further discussion questions", self._further_discussion_request(title, article_body),
+                                 self._parse_further_discussion_questions, [])
+    
+    async def _aextract_vocabulary(self, text: str) -> List[VocabularyItem]:
+        """Async variant of _extract_vocabulary."""
+        if self.glossary is not None:
+            return await self._aextract_vocabulary_with_glossary(text)
+        return await self._arun_section("extracting vocabulary", self._vocabulary_request(text), self._parse_vocabulary, [])
+    
+    async def _aextract_vocabulary_with_glossary(self, text: str) -> List[VocabularyItem]:
+        """Async variant of _extract_vocabulary_with_glossary."""
+        selection = await self._arun_section("selecting vocabulary", self._vocabulary_selection_request(text),
+                                             self._parse_vocabulary_selection, [])
+        definitions = self.glossary.lookup(word for word, _ in selection)
+        missing = [word for word, _ in selection if lemmatize(word) not in definitions]
+        if missing:
+            new_definitions = await self._arun_section("defining vocabulary", self._definitions_request(missing),
+                                                       self._parse_definitions, {})
+            self.glossary.add(new_definitions)
+            definitions.update({lemmatize(word): definition for word, definition in new_definitions.items()})
+        return self._build_vocabulary(selection, definitions)
+    
+    async def _arewrite_article_body(self, title: str, original_text: str) -> str:
+        """Async variant of _rewrite_article_body."""
+        source_text = await self._acondense_article(title, original_text)
+        return await self._arun_section("rewriting article body", self._rewrite_request(title, source_text),
+                                        self._parse_article_body, original_text[:500],
+                                        stream_to=progress.body_listener())
+    
+    async def _agenerate_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
+        """Async variant of _generate_discussion_questions."""
+        return await self._arun_section("generating discussion questions", self._discussion_request(title, article_body),
+                                        self._parse_discussion_questions, [])
+    
+    async def _agenerate_further_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
+        """Async variant of _generate_further_discussion_questions."""
+        return await self._arun_section("generating further discussion questions", self._further_discussion_request(title, article_body),
+                                        self._parse_further_discussion_questions, [])
+    
+    def _condense_article(self, title: str, text: str) -> str:
+        """
+        Fit an article into the rewrite token budget.
+        
+        Articles within budget are returned unchanged. Longer ones are split into
+        chunks that are summarised in parallel (map) and joined in order (reduce),
+        repeating until the result fits.
+        """
+        for _ in range(MAX_CONDENSE_ROUNDS):
+            if self.tokens.count(text) <= self.token_budget.rewrite:
+                return text
+            
+            chunks = self.tokens.split(text, self.token_budget.chunk)
+            words_per_chunk = self._summary_words(len(chunks))
+            logger.info(f"Condensing article into {len(chunks)} chunk summaries")
+            
+            with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_SUMMARY_WORKERS)) as executor:
+                futures = [
+                    self._submit(executor, self._summarize_chunk, title, chunk, words_per_chunk)
+                    for chunk in chunks
+                ]
+                summaries = [future.result() for future in futures]
+            text = '\n\n'.join(summaries)
+        
+        return self.tokens.truncate(text, self.token_budget.rewrite)
+    
+    async def _acondense_article(self, title: str, text: str) -> str:
+        """Async variant of _condense_article."""
+        for _ in range(MAX_CONDENSE_ROUNDS):
+            if self.tokens.count(text) <= self.token_budget.rewrite:
+                return text
+            
+            chunks = self.tokens.split(text, self.token_budget.chunk)
+            words_per_chunk = self._summary_words(len(chunks))
+            logger.info(f"Condensing article into {len(chunks)} chunk summaries")
+            
+            summaries = await asyncio.gather(*(
+                self._asummarize_chunk(title, chunk, words_per_chunk) for chunk in chunks
+            ))
+            text = '\n\n'.join(summaries)
+        
+        return self.tokens.truncate(text, self.token_budget.rewrite)
+    
+    def _summary_words(self, chunk_count: int) -> int:
+        """Word target per chunk summary so the merged summaries fit the rewrite budget."""
+        # English averages about 0.75 words per token
+        return max(40, int(self.token_budget.rewrite * 0.75 / chunk_count))
+    
+    def _summarize_chunk(self, title: str, chunk: str, words: int) -> str:
+        """Summarise one chunk of a long article (map step)."""
+        return self._run_section("summarising article chunk", self._summary_request(title, chunk, words),
+                                 self._parse_article_body, self.tokens.truncate(chunk, int(words / 0.75)))
+    
+    async def _asummarize_chunk(self, title: str, chunk: str, words: int) -> str:
+        """Async variant of _summarize_chunk."""
+        return await self._arun_section("summarising article chunk", self._summary_request(title, chunk, words),
+                                        self._parse_article_body, self.tokens.truncate(chunk, int(words / 0.75)))
+    
+    def _summary_request(self, title: str, chunk: str, words: int) -> Dict[str, Any]:
+        """Build the chat completion request for summarising one article chunk."""
+        prompt = f"""
+        The following is one part of a longer news article titled "{title}".
+        Summarise this part in at most {words} words.
+        
+        Keep every fact, name, number and quote that matters to the story, in the original order.
+        Do not add information or commentary.
+        
+        Article part:
+        {chunk}
+        """
+        
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a news editor condensing long articles without losing key facts."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3
+        )
+    
+    def _vocabulary_request(self, text: str) -> Dict[str, Any]:
+        """Build the chat completion request for vocabulary extraction."""
         prompt = f"""
         From the following article text, extract 8-10 key vocabulary words that would be useful for ESL learners. 
         For each word, provide a clear definition and an example sentence using the word.
         
         Article text:
-        {text[:3000]}  # Limit text length
+        {self.tokens.truncate(text, self.token_budget.vocabulary)}
         
         Return the response as a JSON array with objects containing "word", "definition", and "example" fields.
         Focus on words that are:
@@ -64,42 +627,121 @@ class ContentProcessor:
         - Not too advanced (avoid highly technical jargon)
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert ESL teacher creating vocabulary lists for intermediate English learners."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            vocab_data = json.loads(response.choices[0].message.content)
-            vocabulary = []
-            
-            for item in vocab_data.get('vocabulary', []):
-                vocabulary.append(VocabularyItem(
-                    word=item['word'],
-                    definition=item['definition'],
-                    example=item['example']
-                ))
-            
-            return vocabulary[:10]  # Limit to 10 items
-            
-        except Exception as e:
-            logger.error(f"Error extracting vocabulary: {e}")
-            return []
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher creating vocabulary lists for intermediate English learners."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
     
-    def _rewrite_article_body(self, title: str, original_text: str) -> str:
-        """Rewrite the article body to be suitable for ESL learners."""
+    def _parse_vocabulary(self, response_content: Optional[str]) -> List[VocabularyItem]:
+        """Parse the vocabulary JSON response."""
+        vocab_data = json.loads(response_content)
+        vocabulary = []
+        
+        for item in vocab_data.get('vocabulary', []):
+            vocabulary.append(VocabularyItem(
+                word=item['word'],
+                definition=item['definition'],
+                example=item['example']
+            ))
+        
+        return vocabulary[:10]  # Limit to 10 items
+    
+    def _vocabulary_selection_request(self, text: str) -> Dict[str, Any]:
+        """Build the request that picks vocabulary words and writes examples, without definitions."""
+        prompt = f"""
+        From the following article text, extract 8-10 key vocabulary words that would be useful for ESL learners. 
+        For each word, write an example sentence that uses the word in the context of this article.
+        Do not write definitions.
+        
+        Article text:
+        {self.tokens.truncate(text, self.token_budget.vocabulary)}
+        
+        Return the response as a JSON array with objects containing "word" and "example" fields.
+        Give each word in its dictionary form (e.g. "initiative", not "initiatives").
+        Focus on words that are:
+        - Important for understanding the article
+        - Useful for intermediate ESL learners
+        - Not too basic (avoid words like "the", "and", "is")
+        - Not too advanced (avoid highly technical jargon)
+        """
+        
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher creating vocabulary lists for intermediate English learners."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+    
+    def _parse_vocabulary_selection(self, response_content: Optional[str]) -> List[tuple]:
+        """Parse the selected words into (word, example) pairs."""
+        vocab_data = json.loads(response_content)
+        selection = [
+            (item['word'].strip(), item.get('example', ''))
+            for item in vocab_data.get('vocabulary', [])
+            if item.get('word', '').strip()
+        ]
+        return selection[:10]  # Limit to 10 items
+    
+    def _definitions_request(self, words: List[str]) -> Dict[str, Any]:
+        """Build one request that defines every word missing from the glossary."""
+        word_list = "\n".join(f"- {word}" for word in words)
+        prompt = f"""
+        Write a clear, simple definition of each word below for intermediate ESL learners.
+        Define the most common meaning of the word; do not include example sentences.
+        
+        Words:
+        {word_list}
+        
+        Return the response as JSON with a "definitions" array of objects containing "word" and "definition" fields.
+        """
+        
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher writing learner dictionary definitions."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+    
+    def _parse_definitions(self, response_content: Optional[str]) -> Dict[str, str]:
+        """Parse the definitions JSON response into a word -> definition mapping."""
+        data = json.loads(response_content)
+        return {
+            item['word']: item['definition']
+            for item in data.get('definitions', [])
+            if item.get('word') and item.get('definition')
+        }
+    
+    def _build_vocabulary(self, selection: List[tuple], definitions: Dict[str, str]) -> List[VocabularyItem]:
+        """Combine selected words and examples with their definitions; words left undefined are dropped."""
+        vocabulary = []
+        for word, example in selection:
+            definition = definitions.get(lemmatize(word))
+            if definition is None:
+                logger.warning(f"No definition for vocabulary word '{word}', skipping it")
+                continue
+            vocabulary.append(VocabularyItem(word=word, definition=definition, example=example))
+        return vocabulary
+    
+    def _rewrite_request(self, title: str, original_text: str) -> Dict[str, Any]:
+        """Build the chat completion request for the article rewrite."""
         prompt = f"""
         Rewrite the following article to be suitable for intermediate ESL learners while maintaining the key information and news value.
         
         Title: {title}
         
         Original article:
-        {original_text[:4000]}  # Limit text length
+        {original_text}
         
         Guidelines:
         - Use clear, simple sentence structures
@@ -111,24 +753,21 @@ class ContentProcessor:
         - Use present tense when possible
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert ESL teacher rewriting news articles for intermediate English learners."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error rewriting article body: {e}")
-            return original_text[:500]  # Fallback to truncated original
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher rewriting news articles for intermediate English learners."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
     
-    def _generate_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
-        """Generate discussion questions based on the article."""
+    def _parse_article_body(self, response_content: Optional[str]) -> str:
+        """Parse the rewritten article body."""
+        return response_content.strip()
+    
+    def _discussion_request(self, title: str, article_body: str) -> Dict[str, Any]:
+        """Build the chat completion request for discussion questions."""
         prompt = f"""
         Based on the following article, create 4-5 discussion questions that would help ESL learners practice speaking and thinking about the topic.
         
@@ -145,52 +784,18 @@ class ContentProcessor:
         Return as a JSON array with objects containing "question" field.
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert ESL teacher creating discussion questions for intermediate English learners."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            response_content = response.choices[0].message.content
-            if not response_content:
-                logger.error("Empty response from OpenAI for discussion questions")
-                return []
-                
-            questions_data = json.loads(response_content)
-            logger.debug(f"Discussion questions response: {questions_data}")
-            questions = []
-            
-            # Try multiple possible keys for the questions array
-            questions_array = (questions_data.get('questions', []) or 
-                             questions_data.get('discussion_questions', []) or
-                             questions_data.get('items', []) or
-                             list(questions_data.values())[0] if questions_data else [])
-            
-            for item in questions_array:
-                if isinstance(item, dict) and 'question' in item:
-                    questions.append(DiscussionQuestion(
-                        question=item['question'],
-                        level="standard"
-                    ))
-                elif isinstance(item, str):
-                    questions.append(DiscussionQuestion(
-                        question=item,
-                        level="standard"
-                    ))
-            
-            return questions
-            
-        except Exception as e:
-            logger.error(f"Error generating discussion questions: {e}")
-            return []
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher creating discussion questions for intermediate English learners."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
     
-    def _generate_further_discussion_questions(self, title: str, article_body: str) -> List[DiscussionQuestion]:
-        """Generate further discussion questions for more advanced discussion."""
+    def _further_discussion_request(self, title: str, article_body: str) -> Dict[str, Any]:
+        """Build the chat completion request for further discussion questions."""
         prompt = f"""
         Based on the following article, create 3-4 more advanced discussion questions that encourage deeper thinking and broader connections.
         
@@ -207,46 +812,50 @@ class ContentProcessor:
         Return as a JSON array with objects containing "question" field.
         """
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert ESL teacher creating advanced discussion questions for intermediate to advanced English learners."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            response_content = response.choices[0].message.content
-            if not response_content:
-                logger.error("Empty response from OpenAI for further discussion questions")
-                return []
-                
-            questions_data = json.loads(response_content)
-            logger.debug(f"Further discussion questions response: {questions_data}")
-            questions = []
-            
-            # Try multiple possible keys for the questions array
-            questions_array = (questions_data.get('questions', []) or 
-                             questions_data.get('discussion_questions', []) or
-                             questions_data.get('items', []) or
-                             list(questions_data.values())[0] if questions_data else [])
-            
-            for item in questions_array:
-                if isinstance(item, dict) and 'question' in item:
-                    questions.append(DiscussionQuestion(
-                        question=item['question'],
-                        level="further"
-                    ))
-                elif isinstance(item, str):
-                    questions.append(DiscussionQuestion(
-                        question=item,
-                        level="further"
-                    ))
-            
-            return questions
-            
-        except Exception as e:
-            logger.error(f"Error generating further discussion questions: {e}")
+        return dict(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert ESL teacher creating advanced discussion questions for intermediate to advanced English learners."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+    
+    def _parse_discussion_questions(self, response_content: Optional[str]) -> List[DiscussionQuestion]:
+        """Parse the discussion questions JSON response."""
+        return self._parse_questions(response_content, "standard", "discussion questions")
+    
+    def _parse_further_discussion_questions(self, response_content: Optional[str]) -> List[DiscussionQuestion]:
+        """Parse the further discussion questions JSON response."""
+        return self._parse_questions(response_content, "further", "further discussion questions")
+    
+    def _parse_questions(self, response_content: Optional[str], level: str, label: str) -> List[DiscussionQuestion]:
+        """Parse a questions JSON response into DiscussionQuestion objects of the given level."""
+        if not response_content:
+            logger.error(f"Empty response from OpenAI for {label}")
             return []
+        
+        questions_data = json.loads(response_content)
+        logger.debug(f"{label.capitalize()} response: {questions_data}")
+        questions = []
+        
+        # Try multiple possible keys for the questions array
+        questions_array = (questions_data.get('questions', []) or 
+                         questions_data.get('discussion_questions', []) or
+                         questions_data.get('items', []) or
+                         list(questions_data.values())[0] if questions_data else [])
+        
+        for item in questions_array:
+            if isinstance(item, dict) and 'question' in item:
+                questions.append(DiscussionQuestion(
+                    question=item['question'],
+                    level=level
+                ))
+            elif isinstance(item, str):
+                questions.append(DiscussionQuestion(
+                    question=item,
+                    level=level
+                ))
+        
+        return questions
@@ -0,0 +1,104 @@
+"""
+Progress reporting, body streaming and cancellation for a running conversion.
+Like the conversion metrics, the callbacks and cancel event are bound to the
+current context, so graph nodes and section generators on worker threads
+report to the caller that started the conversion.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STARTED = 'started'
+FINISHED = 'finished'
+
+# Called with (stage, status): graph nodes such as "scrape_content" and lesson
+# sections such as "rewriting article body", each STARTED then FINISHED
+ProgressCallback = Callable[[str, str], None]
+
+# Called with each piece of the rewritten article body as the model writes it
+TextCallback = Callable[[str], None]
+
+_current: ContextVar[Optional[Tuple[Optional[ProgressCallback], Optional[threading.Event]]]] = ContextVar(
+    'engoo_conversion_progress', default=None
+)
+
+_body_listener: ContextVar[Optional[TextCallback]] = ContextVar('engoo_body_listener', default=None)
+
+
+class ConversionCancelled(Exception):
+    """Raised inside a conversion once its cancel event is set."""
+
+
+@contextmanager
+def track(on_progress: Optional[ProgressCallback] = None,
+          cancel_event: Optional[threading.Event] = None) -> Iterator[None]:
+    """
+    Report the progress of the conversion run inside the block, and let it be cancelled.
+
+    Args:
+        on_progress: Called from the converting thread(s) as stages start and finish
+        cancel_event: Once set, the conversion raises ConversionCancelled at its
+            next stage or section boundary
+    """
+    token = _current.set((on_progress, cancel_event))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def check_cancelled() -> None:
+    """Raise ConversionCancelled if the current conversion was cancelled."""
+    current = _current.get()
+    if current is not None and current[1] is not None and current[1].is_set():
+        raise ConversionCancelled("Conversion cancelled")
+
+
+def report(stage: str, status: str) -> None:
+    """Send a progress update for the current conversion, if anyone is listening."""
+    current = _current.get()
+    if current is None or current[0] is None:
+        return
+    # A broken progress display must not fail the conversion
+    try:
+        current[0](stage, status)
+    except Exception as e:
+        logger.warning(f"Progress callback failed for {stage}: {e}")
+
+
+@contextmanager
+def step(stage: str) -> Iterator[None]:
+    """Run a block as a reported stage, first checking for cancellation."""
+    check_cancelled()
+    report(stage, STARTED)
+    yield
+    report(stage, FINISHED)
+
+
+@contextmanager
+def stream_body(on_delta: Optional[TextCallback]) -> Iterator[None]:
+    """
+    Stream the article rewrite of the conversion run inside the block.
+
+    Args:
+        on_delta: Called with each piece of body text as it arrives; None
+            leaves any listener bound by an enclosing block in place
+    """
+    if on_delta is None:
+        yield
+        return
+    token = _body_listener.set(on_delta)
+    try:
+        yield
+    finally:
+        _body_listener.reset(token)
+
+
+def body_listener() -> Optional[TextCallback]:
+    """Get the callback that wants the article body streamed, if any."""
+    return _body_listener.get()
@@ -0,0 +1,286 @@
+"""
+Process-wide rate-limit governor for OpenAI calls.
+Retries transient failures with jittered exponential backoff and adapts the
+number of concurrent requests (AIMD) to the limits the API reports.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+class RetriesExhaustedError(Exception):
+    """Raised when a call still fails after all retries."""
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI reset duration such as "20ms", "1s" or "6m0s" into seconds.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts:
+        return None
+    scale = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+class RateLimitGovernor:
+    """Shared concurrency limiter with retry, backoff and AIMD adjustment."""
+
+    def __init__(self,
+                 max_concurrency: int = 16,
+                 min_concurrency: int = 1,
+                 max_retries: int = 6,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0):
+        """
+        Initialize the governor.
+
+        Args:
+            max_concurrency: Upper bound on concurrent requests
+            min_concurrency: Lower bound the limit never drops below
+            max_retries: Retries per call before giving up
+            base_delay: Initial backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def call(self, fn: Callable[[], Any], hold: bool = False) -> Any:
+        """
+        Run fn under the concurrency limit, retrying transient failures.
+
+        Args:
+            fn: Callable making one API request; its result may expose .headers
+            hold: Keep the request slot after fn succeeds, e.g. while a streamed
+                response is read; the caller must release() it
+
+        Returns:
+            The result of fn
+
+        Raises:
+            RetriesExhaustedError: If a transient failure persists past max_retries
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                self.release()
+                time.sleep(self._handle_error(e, attempt))
+                continue
+            except BaseException:
+                # Cancellation or KeyboardInterrupt must not leak the slot
+                self.release()
+                raise
+            if not hold:
+                self.release()
+            self._on_success(getattr(result, 'headers', None))
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], hold: bool = False) -> Any:
+        """Async variant of call(); fn returns an awaitable."""
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire()
+            try:
+                result = await fn()
+            except Exception as e:
+                self.release()
+                await asyncio.sleep(self._handle_error(e, attempt))
+                continue
+            except BaseException:
+                # Cancellation or KeyboardInterrupt must not leak the slot
+                self.release()
+                raise
+            if not hold:
+                self.release()
+            self._on_success(getattr(result, 'headers', None))
+            return result
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        with self._cond:
+            while True:
+                wait = self._wait_time()
+                if wait <= 0:
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait)
+
+    async def aacquire(self) -> None:
+        """Wait on the event loop until a request slot is available."""
+        while True:
+            with self._cond:
+                wait = self._wait_time()
+                if wait <= 0:
+                    self.in_flight += 1
+                    return
+            await asyncio.sleep(min(wait, 0.05))
+
+    def release(self) -> None:
+        """Return a request slot."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get governor counters.
+
+        Returns:
+            Dictionary with the current limit, in-flight requests, retries and 429 count
+        """
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'retries': self.retries,
+                'rate_limited': self.rate_limited
+            }
+
+    def _wait_time(self) -> float:
+        """Seconds until a slot may be taken; 0 if one is free now. Caller holds the lock."""
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            return pause
+        if self.in_flight < int(self.limit):
+            return 0
+        # Woken by release(); the timeout only guards against missed notifications
+        return 1.0
+
+    def _on_success(self, headers: Any) -> None:
+        """Additive increase, and pause if the reported remaining quota is exhausted."""
+        with self._cond:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if headers is not None:
+                self._apply_headers(headers)
+            self._cond.notify_all()
+
+    def _handle_error(self, error: Exception, attempt: int) -> float:
+        """
+        Decide how long to wait before retrying a failed call.
+
+        Raises:
+            The original error if it is not retryable
+            RetriesExhaustedError: If no retries remain
+        """
+        if not isinstance(error, RETRYABLE_ERRORS):
+            raise error
+        if isinstance(error, openai.RateLimitError) and getattr(error, 'code', None) == 'insufficient_quota':
+            raise error
+        if attempt >= self.max_retries:
+            raise RetriesExhaustedError(f"OpenAI request failed after {attempt + 1} attempts: {error}") from error
+
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        retry_after = None
+        if headers is not None:
+            retry_after_ms = parse_reset_duration(headers.get('retry-after-ms'))
+            if retry_after_ms is not None:
+                retry_after = retry_after_ms / 1000
+            else:
+                retry_after = parse_reset_duration(headers.get('retry-after'))
+
+        # Full jitter keeps many workers from retrying in lockstep
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.base_delay)
+
+        with self._cond:
+            self.retries += 1
+            if isinstance(error, openai.RateLimitError):
+                self.rate_limited += 1
+                self._decrease()
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            if headers is not None:
+                self._apply_headers(headers)
+
+        logger.warning(f"OpenAI request failed ({error.__class__.__name__}), retrying in {delay:.1f}s "
+                       f"(attempt {attempt + 1}/{self.max_retries})")
+        return delay
+
+    def _decrease(self) -> None:
+        """Multiplicative decrease, at most once per second so one burst of 429s halves once."""
+        now = time.monotonic()
+        if now - self._last_decrease >= 1.0:
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            self._last_decrease = now
+            logger.info(f"Rate limited; concurrency limit lowered to {int(self.limit)}")
+
+    def _apply_headers(self, headers: Any) -> None:
+        """Pause new requests until reset when x-ratelimit-remaining-* reaches zero. Caller holds the lock."""
+        for kind in ('requests', 'tokens'):
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            if remaining is None:
+                continue
+            try:
+                remaining = int(remaining)
+            except ValueError:
+                continue
+            if remaining <= 0:
+                reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+                if reset:
+                    self._paused_until = max(self._paused_until, time.monotonic() + reset)
+                    logger.info(f"OpenAI {kind} quota exhausted; pausing for {reset:.1f}s")
+
+
+_default_governor = None
+_default_governor_lock = threading.Lock()
+
+
+def get_default_governor() -> RateLimitGovernor:
+    """
+    Get the process-wide governor shared by all workers.
+
+    The concurrency ceiling comes from ENGOO_MAX_LLM_CONCURRENCY (default 16).
+
+    Returns:
+        The shared RateLimitGovernor
+    """
+    global _default_governor
+    if _default_governor is None:
+        with _default_governor_lock:
+            if _default_governor is None:
+                _default_governor = RateLimitGovernor(
+                    max_concurrency=int(os.getenv('ENGOO_MAX_LLM_CONCURRENCY', 16))
+                )
+    return _default_governor
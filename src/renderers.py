@@ -0,0 +1,132 @@
+"""
+Output formats for Engoo lessons.
+Each format is rendered only when requested, from the EngooArticle itself.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Union
+
+try:
+    from .models import EngooArticle
+except ImportError:
+    from models import EngooArticle
+
+# Output file extension for each format
+FORMAT_EXTENSIONS = {
+    'html': '.html',
+    'text': '.txt',
+    'markdown': '.md',
+    'json': '.json'
+}
+
+
+def render_html(article: EngooArticle) -> str:
+    """Render the lesson as a standalone Engoo-style HTML page."""
+    return article.to_html()
+
+
+def render_text(article: EngooArticle) -> str:
+    """Render the lesson as plain text."""
+    lines = [f"Title: {article.title}", "", "Vocabulary:"]
+    for vocab in article.vocabulary:
+        lines.append(f"- {vocab.word}: {vocab.definition}")
+        lines.append(f"  Example: {vocab.example}")
+    lines += ["", "Article:", article.article_body, "", "Discussion Questions:"]
+    lines += [f"{i}. {q.question}" for i, q in enumerate(article.discussion_questions, 1)]
+    lines += ["", "Further Discussion:"]
+    lines += [f"{i}. {q.question}" for i, q in enumerate(article.further_discussion_questions, 1)]
+    return '\n'.join(lines) + '\n'
+
+
+def render_markdown(article: EngooArticle) -> str:
+    """Render the lesson as Markdown."""
+    lines = [f"# {article.title}", "", "## Vocabulary", ""]
+    for vocab in article.vocabulary:
+        lines.append(f"- **{vocab.word}**: {vocab.definition}  ")
+        lines.append(f"  *Example: {vocab.example}*")
+    lines += ["", "## Article", ""]
+    for para in article.article_body.split('\n\n'):
+        para = para.strip()
+        if not para:
+            continue
+        # Headers are marked with ** by the rewrite prompt
+        if para.startswith('**') and para.endswith('**'):
+            lines += [f"### {para.strip('*').strip()}", ""]
+        else:
+            lines += [para, ""]
+    lines += ["## Discussion", ""]
+    lines += [f"{i}. {q.question}" for i, q in enumerate(article.discussion_questions, 1)]
+    lines += ["", "## Further Discussion", ""]
+    lines += [f"{i}. {q.question}" for i, q in enumerate(article.further_discussion_questions, 1)]
+    return '\n'.join(lines) + '\n'
+
+
+def render_json(article: EngooArticle) -> str:
+    """Render the lesson fields as JSON, without any rendered copies of the lesson."""
+    return json.dumps(article.to_dict(), indent=2, ensure_ascii=False)
+
+
+RENDERERS: Dict[str, Callable[[EngooArticle], str]] = {
+    'html': render_html,
+    'text': render_text,
+    'markdown': render_markdown,
+    'json': render_json
+}
+
+
+def parse_formats(formats: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Normalise and validate requested output formats.
+
+    Args:
+        formats: Format names, or a comma-separated string such as "html,markdown"
+
+    Returns:
+        Format names in request order, without duplicates
+
+    Raises:
+        ValueError: If a format is not supported
+    """
+    if isinstance(formats, str):
+        formats = formats.split(',')
+
+    result = []
+    for fmt in formats:
+        fmt = fmt.strip().lower()
+        if not fmt:
+            continue
+        if fmt not in RENDERERS:
+            raise ValueError(f"Unsupported format '{fmt}' (choose from {', '.join(RENDERERS)})")
+        if fmt not in result:
+            result.append(fmt)
+    return result
+
+
+def render(article: EngooArticle, fmt: str) -> str:
+    """
+    Render a lesson in one format.
+
+    Args:
+        article: The lesson
+        fmt: One of 'html', 'text', 'markdown' or 'json'
+
+    Returns:
+        The rendered lesson
+    """
+    renderer = RENDERERS.get(fmt)
+    if renderer is None:
+        raise ValueError(f"Unsupported format '{fmt}' (choose from {', '.join(RENDERERS)})")
+    return renderer(article)
+
+
+def format_for_path(path: Union[str, Path]) -> str:
+    """Pick the output format from a file extension; unknown extensions get plain text."""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.htm', '.html'):
+        return 'html'
+    if suffix in ('.md', '.markdown'):
+        return 'markdown'
+    if suffix == '.json':
+        return 'json'
+    return 'text'
@@ -1,35 +1,153 @@
+import asyncio
+import threading
+import weakref
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-from typing import Optional, Dict, Any
+import requests.adapters
+from typing import TYPE_CHECKING, Optional, Dict, Any
 import logging
 
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    from .http_cache import HTTPCache, FetchedPage, decode_html
+    from .metrics import record_download
+except ImportError:
+    from http_cache import HTTPCache, FetchedPage, decode_html
+    from metrics import record_download
+
 logger = logging.getLogger(__name__)
 
+# newspaper (which loads nltk) is imported on first parse, keeping CLI startup fast
+Article = None
+
+POOL_SIZE = 32
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def _newspaper_article(url: str):
+    """Create a newspaper3k Article, importing newspaper on first use."""
+    global Article
+    if Article is None:
+        from newspaper import Article
+    return Article(url)
+
 
 class WebScraper:
     """Handles web scraping and content extraction from URLs."""
     
-    def __init__(self):
+    def __init__(self, http_cache: Optional[HTTPCache] = None):
+        """
+        Initialize the scraper.
+        
+        Args:
+            http_cache: Optional on-disk cache used for conditional re-fetches
+        """
+        self.http_cache = http_cache
         self.session = requests.Session()
+        
+        # Keep enough pooled connections for concurrent conversions sharing this scraper
+        adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': USER_AGENT
         })
+        
+        # httpx clients for the async path, one per event loop
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
     
     def extract_article_content(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Extract article content from a given URL.
         
+        The page is downloaded once; the same HTML feeds both newspaper3k and
+        the BeautifulSoup fallback.
+        
+        Args:
+            url: The URL to scrape
+            
+        Returns:
+            Dictionary containing title, text, and metadata
+        """
+        page = self._fetch_page(url)
+        if page is None:
+            return None
+        record_download(page.bytes_downloaded)
+        
+        # Unchanged pages reuse the content extracted last time
+        if page.from_cache:
+            parsed = self.http_cache.load_parsed(url)
+            if parsed:
+                logger.info(f"Using cached content for {url}")
+                return parsed
+        
+        content = self._parse_html(url, page.text)
+        if content and self.http_cache is not None:
+            self.http_cache.store_parsed(url, content)
+        return content
+    
+    async def aextract_article_content(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of extract_article_content.
+        
+        The download uses a pooled httpx.AsyncClient; HTML parsing is CPU-bound
+        and runs in the default executor so it does not block the event loop.
+        
         Args:
             url: The URL to scrape
             
         Returns:
             Dictionary containing title, text, and metadata
         """
+        page = await self._afetch_page(url)
+        if page is None:
+            return None
+        record_download(page.bytes_downloaded)
+        
+        if page.from_cache:
+            parsed = self.http_cache.load_parsed(url)
+            if parsed:
+                logger.info(f"Using cached content for {url}")
+                return parsed
+        
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(None, self._parse_html, url, page.text)
+        if content and self.http_cache is not None:
+            self.http_cache.store_parsed(url, content)
+        return content
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+    
+    def _async_client(self) -> 'httpx.AsyncClient':
+        """Get the httpx client for the running event loop, creating it on first use."""
+        import httpx
+        
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    headers={'User-Agent': USER_AGENT},
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+                )
+                self._async_clients[loop] = client
+            return client
+    
+    def _parse_html(self, url: str, html: str) -> Optional[Dict[str, Any]]:
+        """Extract article content from downloaded HTML."""
         try:
             # Try using newspaper3k first
-            article = Article(url)
-            article.download()
+            article = _newspaper_article(url)
+            article.download(input_html=html)
             article.parse()
             
             if article.title and article.text:
@@ -43,19 +161,45 @@ class WebScraper:
                 }
             
             # Fallback to manual scraping
-            return self._manual_scrape(url)
+            return self._manual_scrape(url, html)
             
         except Exception as e:
             logger.warning(f"Newspaper3k failed for {url}: {e}")
-            return self._manual_scrape(url)
+            return self._manual_scrape(url, html)
     
-    def _manual_scrape(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fallback manual scraping method."""
+    def _fetch_page(self, url: str) -> Optional[FetchedPage]:
+        """Download a page through the pooled session, via the HTTP cache if configured."""
         try:
+            if self.http_cache is not None:
+                return self.http_cache.fetch(self.session, url, timeout=10)
+            
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
+            return FetchedPage(url=url, text=decode_html(response), bytes_downloaded=len(response.content))
+        except Exception as e:
+            logger.error(f"Failed to download {url}: {e}")
+            return None
+    
+    async def _afetch_page(self, url: str) -> Optional[FetchedPage]:
+        """Async variant of _fetch_page."""
+        try:
+            client = self._async_client()
+            if self.http_cache is not None:
+                return await self.http_cache.afetch(client, url, timeout=10)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await client.get(url, timeout=10)
+            response.raise_for_status()
+            return FetchedPage(url=url, text=decode_html(response), bytes_downloaded=len(response.content))
+        except Exception as e:
+            logger.error(f"Failed to download {url}: {e}")
+            return None
+    
+    def _manual_scrape(self, url: str, html: str) -> Optional[Dict[str, Any]]:
+        """Fallback manual scraping method."""
+        from bs4 import BeautifulSoup
+        
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Extract title
             title = None
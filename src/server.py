@@ -0,0 +1,312 @@
+"""
+Local HTTP service that keeps a warm agent and converts articles from a job queue.
+Conversions are accepted into a bounded queue, run on worker threads and polled by job id.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+try:
+    from .renderers import parse_formats
+except ImportError:
+    from renderers import parse_formats
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+@dataclass
+class ServiceJob:
+    """A conversion submitted to the service."""
+    id: str
+    url: str
+    formats: List[str]
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status without the lesson itself."""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'formats': self.formats,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.result.get('error') if self.result else None,
+            'lesson_id': self.result.get('lesson_id') if self.result else None
+        }
+
+
+class ConversionService:
+    """Runs conversions from a bounded queue on a fixed pool of worker threads sharing one agent."""
+
+    def __init__(self, agent: Any, workers: int = 2, max_queue: int = 100, max_finished_jobs: int = 1000):
+        """
+        Initialize the service and start its workers.
+
+        Args:
+            agent: EngooNewsAgent shared by all workers
+            workers: Number of conversions run at once
+            max_queue: Jobs that may wait for a worker before submissions are refused
+            max_finished_jobs: Finished jobs kept for status and result requests; the oldest are dropped
+        """
+        self.agent = agent
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.max_finished_jobs = max_finished_jobs
+        self.started_at = time.time()
+
+        # Unbounded so shutdown sentinels never block; submit() enforces max_queue
+        self._queue: 'queue.Queue[Optional[ServiceJob]]' = queue.Queue()
+        self._jobs: 'OrderedDict[str, ServiceJob]' = OrderedDict()
+        self._finished: 'OrderedDict[str, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._counts = {'submitted': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0}
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"engoo-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, url: str, formats: Any = ('html',)) -> ServiceJob:
+        """
+        Queue a conversion.
+
+        Args:
+            url: Article URL
+            formats: Output formats to render, as for EngooNewsAgent.convert_article
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If a format is unknown
+            QueueFullError: If max_queue jobs are already waiting
+        """
+        job = ServiceJob(id=uuid.uuid4().hex, url=url, formats=parse_formats(formats))
+        with self._lock:
+            if self._queue.qsize() >= self.max_queue:
+                self._counts['rejected'] += 1
+                raise QueueFullError(f"Queue is full ({self.max_queue} jobs waiting)")
+            self._jobs[job.id] = job
+            self._queue.put_nowait(job)
+            self._counts['submitted'] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[ServiceJob]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self) -> None:
+        """Worker loop: run queued jobs until a None sentinel arrives."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._busy += 1
+
+            try:
+                result = self.agent.convert_article(job.url, formats=job.formats)
+            except Exception as e:
+                logger.error(f"Error converting URL {job.url}: {e}")
+                result = {'success': False, 'url': job.url, 'error': str(e)}
+
+            with self._lock:
+                job.result = result
+                job.status = DONE if result['success'] else FAILED
+                job.finished_at = time.time()
+                self._busy -= 1
+                self._counts['succeeded' if result['success'] else 'failed'] += 1
+                self._wait_seconds += job.started_at - job.submitted_at
+                self._run_seconds += job.finished_at - job.started_at
+
+                self._finished[job.id] = None
+                while len(self._finished) > self.max_finished_jobs:
+                    expired, _ = self._finished.popitem(last=False)
+                    self._jobs.pop(expired, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue and worker metrics for sizing the service.
+
+        Returns:
+            Dictionary with worker utilisation, queue depth and capacity,
+            job counters and mean queue wait and run time in seconds
+        """
+        with self._lock:
+            finished = self._counts['succeeded'] + self._counts['failed']
+            return {
+                'uptime_seconds': round(time.time() - self.started_at, 3),
+                'workers': self.workers,
+                'busy_workers': self._busy,
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self.max_queue,
+                **self._counts,
+                'mean_wait_seconds': round(self._wait_seconds / finished, 3) if finished else 0.0,
+                'mean_run_seconds': round(self._run_seconds / finished, 3) if finished else 0.0
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            wait: Run the jobs already queued and block until every worker has
+                exited; otherwise cancel the queued jobs and return at once,
+                leaving running conversions to finish in the background
+        """
+        with self._lock:
+            if not wait:
+                self._cancel_queued()
+            for _ in self._threads:
+                self._queue.put_nowait(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _cancel_queued(self) -> None:
+        """Take every job still waiting off the queue and mark it cancelled. Caller holds the lock."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is None:
+                continue
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            job.result = {'success': False, 'url': job.url, 'error': 'Cancelled: the service shut down'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON API over a ConversionService (set as the server's `service` attribute)."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {'error': message}, headers)
+
+    def do_GET(self):
+        service = self.server.service
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+
+        if parts == ['health']:
+            stats = service.stats()
+            self._send_json(200, {'status': 'ok', 'queue_depth': stats['queue_depth'],
+                                  'busy_workers': stats['busy_workers'], 'workers': stats['workers']})
+        elif parts == ['metrics']:
+            self._send_json(200, service.stats())
+        elif len(parts) in (2, 3) and parts[0] == 'jobs' and parts[2:] in ([], ['result']):
+            job = service.get(parts[1])
+            if job is None:
+                self._send_error(404, f"Unknown job {parts[1]}")
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif job.result is None:
+                # Not finished yet: tell the client where to poll
+                self._send_json(202, job.to_dict(), {'Retry-After': '1'})
+            else:
+                self._send_json(200, job.result)
+        else:
+            self._send_error(404, f"No route for GET {self.path}")
+
+    def do_POST(self):
+        service = self.server.service
+        if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+            self._send_error(404, f"No route for POST {self.path}")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            self._send_error(400, f"Invalid JSON body: {e}")
+            return
+        if not isinstance(request, dict) or not request.get('url') or not isinstance(request['url'], str):
+            self._send_error(400, 'Body must be a JSON object with a "url" string')
+            return
+        formats = request.get('formats', ('html',))
+        if not isinstance(formats, (str, list, tuple)) or not all(isinstance(fmt, str) for fmt in formats):
+            self._send_error(400, '"formats" must be a string or a list of strings')
+            return
+
+        try:
+            job = service.submit(request['url'], formats)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+        except QueueFullError as e:
+            self._send_error(503, str(e), {'Retry-After': '5'})
+            return
+
+        self._send_json(202, job.to_dict(), {'Location': f"/jobs/{job.id}"})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def create_server(service: ConversionService, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server for a conversion service.
+
+    Endpoints:
+        POST /jobs {"url": ..., "formats": [...]}  queue a conversion (202, or 503 when the queue is full)
+        GET /jobs/<id>                             job status
+        GET /jobs/<id>/result                      conversion result once finished (202 while pending)
+        GET /health                                liveness with queue depth and busy workers
+        GET /metrics                               queue, worker and latency metrics
+
+    Args:
+        service: The conversion service
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        ThreadingHTTPServer; call serve_forever() to run it
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
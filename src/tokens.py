@@ -0,0 +1,133 @@
+"""
+Token counting and per-stage token budgets for LLM prompts.
+Uses tiktoken when available and falls back to a character-based estimate.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English prose with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class TokenBudget:
+    """Token limits for the article text sent to each LLM stage."""
+    vocabulary: int = 750  # article text for vocabulary extraction
+    rewrite: int = 1000  # article text for the rewrite; longer articles are condensed first
+    chunk: int = 1500  # size of each chunk summarised in the map step
+
+    @classmethod
+    def from_env(cls) -> 'TokenBudget':
+        """
+        Build a budget from ENGOO_VOCABULARY_TOKENS, ENGOO_REWRITE_TOKENS and ENGOO_CHUNK_TOKENS.
+
+        Returns:
+            TokenBudget with defaults for unset variables
+        """
+        defaults = cls()
+        return cls(
+            vocabulary=int(os.getenv('ENGOO_VOCABULARY_TOKENS', defaults.vocabulary)),
+            rewrite=int(os.getenv('ENGOO_REWRITE_TOKENS', defaults.rewrite)),
+            chunk=int(os.getenv('ENGOO_CHUNK_TOKENS', defaults.chunk))
+        )
+
+
+class TokenCounter:
+    """Counts, truncates and splits text by tokens for a given model."""
+
+    def __init__(self, model: str = "gpt-4o-mini", use_tiktoken: bool = True):
+        """
+        Initialize the counter.
+
+        Args:
+            model: Model whose tokenizer should be used
+            use_tiktoken: Try tiktoken before falling back to the character estimate
+        """
+        self.model = model
+        self.use_tiktoken = use_tiktoken
+        self._encoding = None
+        self._encoding_loaded = False
+        self._lock = threading.Lock()
+
+    def _get_encoding(self):
+        """Load the tiktoken encoding on first use; None if unavailable."""
+        if not self._encoding_loaded:
+            with self._lock:
+                if not self._encoding_loaded:
+                    if self.use_tiktoken:
+                        try:
+                            import tiktoken
+                            self._encoding = tiktoken.encoding_for_model(self.model)
+                        except Exception as e:
+                            logger.warning(f"tiktoken unavailable, estimating tokens from characters: {e}")
+                    self._encoding_loaded = True
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """Count the tokens in text."""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens."""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            tokens = encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return encoding.decode(tokens[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split text into chunks of at most max_tokens tokens.
+
+        Chunks break on paragraph boundaries where possible, then on sentences;
+        oversized sentences are truncated into pieces.
+
+        Args:
+            text: Text to split
+            max_tokens: Maximum tokens per chunk
+
+        Returns:
+            List of chunks in document order
+        """
+        pieces = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if self.count(paragraph) <= max_tokens:
+                pieces.append(paragraph)
+                continue
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+                while sentence:
+                    head = self.truncate(sentence, max_tokens) or sentence[:CHARS_PER_TOKEN]
+                    pieces.append(head)
+                    sentence = sentence[len(head):].strip()
+
+        chunks = []
+        current = []
+        current_tokens = 0
+        for piece in pieces:
+            piece_tokens = self.count(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append('\n\n'.join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+        if current:
+            chunks.append('\n\n'.join(current))
+
+        return chunks
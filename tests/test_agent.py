@@ -0,0 +1,262 @@
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import src
+from src.agent import EngooNewsAgent
+from src.processor import ContentProcessor
+from src.http_cache import FetchedPage
+from src.llm_cache import LLMCache
+from src.metrics import format_timings
+from src.progress import STARTED, FINISHED
+from src.scraper import WebScraper
+from tests.test_processor import FakeChatClient, FakeAsyncChatClient, PROMPT_TOKENS, COMPLETION_TOKENS
+
+RAW_CONTENT = {
+    'title': 'A Sufficiently Long Test Title',
+    'text': 'Article text. ' * 30,
+    'url': 'https://example.com/article'
+}
+STAGES = ['scrape_content', 'validate_content', 'process_content', 'finalize']
+
+
+class TestSharedAgent(unittest.TestCase):
+    """Test cases for the process-wide agent handle."""
+
+    def setUp(self):
+        """Reset the shared agent between tests."""
+        src._shared_agent = None
+
+    def tearDown(self):
+        """Reset the shared agent between tests."""
+        src._shared_agent = None
+
+    @patch('src.create_engoo_agent')
+    def test_agent_created_once_across_threads(self, mock_create):
+        """Test that concurrent callers share a single agent."""
+        mock_create.return_value = Mock()
+        agents = []
+        threads = [threading.Thread(target=lambda: agents.append(src.get_engoo_agent())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_create.assert_called_once()
+        self.assertTrue(all(agent is mock_create.return_value for agent in agents))
+
+    @patch('src.create_engoo_agent')
+    def test_convert_url_reuses_agent(self, mock_create):
+        """Test that convert_url_to_engoo does not rebuild the agent per call."""
+        mock_create.return_value.convert_article.return_value = {'success': True}
+        src.convert_url_to_engoo("https://example.com/a")
+        src.convert_url_to_engoo("https://example.com/b")
+
+        mock_create.assert_called_once()
+        self.assertEqual(mock_create.return_value.convert_article.call_count, 2)
+
+
+class TestAsyncConversion(unittest.TestCase):
+    """Test cases for the async conversion path."""
+
+    def test_async_matches_sync(self):
+        """Test that convert_article_async returns the same result as convert_article."""
+        scraper = Mock()
+        scraper.extract_article_content.return_value = RAW_CONTENT
+        scraper.aextract_article_content = AsyncMock(return_value=RAW_CONTENT)
+        processor = ContentProcessor(FakeChatClient(), async_client=FakeAsyncChatClient())
+        agent = EngooNewsAgent(processor, scraper=scraper)
+
+        sync_result = agent.convert_article(RAW_CONTENT['url'])
+
+        async def convert_many():
+            return await asyncio.gather(*(agent.convert_article_async(RAW_CONTENT['url']) for _ in range(3)))
+
+        async_results = asyncio.run(convert_many())
+
+        # Timings differ between runs
+        sync_result.pop('metrics')
+        self.assertTrue(sync_result['success'])
+        for result in async_results:
+            self.assertEqual(set(result.pop('metrics')['stages']), set(STAGES))
+            self.assertEqual(result, sync_result)
+        self.assertEqual(scraper.aextract_article_content.await_count, 3)
+
+
+class TestConversionMetrics(unittest.TestCase):
+    """Test cases for per-conversion instrumentation."""
+
+    def setUp(self):
+        """Set up an agent with a fake scraper and OpenAI client."""
+        self.scraper = Mock()
+        self.scraper.extract_article_content.return_value = RAW_CONTENT
+        self.client = FakeChatClient()
+        self.processor = ContentProcessor(self.client, concurrent=True)
+
+    def test_result_includes_metrics(self):
+        """Test that stages, LLM calls and token usage are reported."""
+        agent = EngooNewsAgent(self.processor, scraper=self.scraper)
+        result = agent.convert_article(RAW_CONTENT['url'])
+
+        metrics = result['metrics']
+        self.assertEqual(list(metrics['stages']), STAGES)
+        self.assertGreaterEqual(metrics['total_seconds'], sum(metrics['stages'].values()) * 0.99)
+        # Calls made on worker threads are attributed to this conversion
+        self.assertEqual(metrics['llm']['calls'], 4)
+        self.assertEqual(metrics['llm']['prompt_tokens'], 4 * PROMPT_TOKENS)
+        self.assertEqual(metrics['llm']['completion_tokens'], 4 * COMPLETION_TOKENS)
+        self.assertEqual(
+            {call['action'] for call in metrics['llm_calls']},
+            {'extracting vocabulary', 'rewriting article body',
+             'generating discussion questions', 'generating further discussion questions'}
+        )
+
+    def test_cache_hits_and_log(self):
+        """Test that cached responses are counted and metrics are appended to the log."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = LLMCache(Path(temp_dir) / 'llm.sqlite')
+            log_path = Path(temp_dir) / 'metrics.jsonl'
+            processor = ContentProcessor(self.client, cache=cache)
+            agent = EngooNewsAgent(processor, scraper=self.scraper, metrics_log=str(log_path))
+
+            agent.convert_article(RAW_CONTENT['url'])
+            second = agent.convert_article(RAW_CONTENT['url'])
+            cache.close()
+
+            self.assertEqual(second['metrics']['llm']['cache_hits'], 4)
+            self.assertEqual(second['metrics']['llm']['prompt_tokens'], 0)
+
+            records = [json.loads(line) for line in log_path.read_text().splitlines()]
+            self.assertEqual(len(records), 2)
+            self.assertTrue(records[1]['success'])
+            self.assertEqual(records[1]['url'], RAW_CONTENT['url'])
+
+    def test_downloads_are_recorded(self):
+        """Test that bytes fetched by the scraper count towards the conversion."""
+        page = FetchedPage(url=RAW_CONTENT['url'], text='<html></html>', bytes_downloaded=1234)
+        scraper = WebScraper()
+        with patch.object(scraper, '_fetch_page', return_value=page), \
+                patch.object(scraper, '_parse_html', return_value=RAW_CONTENT):
+            result = EngooNewsAgent(self.processor, scraper=scraper).convert_article(RAW_CONTENT['url'])
+
+        self.assertEqual(result['metrics']['bytes_downloaded'], 1234)
+
+    def test_format_timings(self):
+        """Test the CLI breakdown lists every stage."""
+        result = EngooNewsAgent(self.processor, scraper=self.scraper).convert_article(RAW_CONTENT['url'])
+        text = format_timings(result['metrics'])
+
+        for stage in STAGES:
+            self.assertIn(stage, text)
+        self.assertIn("OpenAI calls: 4 (0 cached)", text)
+
+
+
+class TestProgress(unittest.TestCase):
+    """Test cases for progress reporting and cancellation."""
+
+    def setUp(self):
+        """Set up an agent that generates sections one after another."""
+        self.scraper = Mock()
+        self.scraper.extract_article_content.return_value = RAW_CONTENT
+        self.client = FakeChatClient()
+        self.agent = EngooNewsAgent(ContentProcessor(self.client), scraper=self.scraper)
+
+    def test_stages_and_sections_are_reported(self):
+        """Test that every node and lesson section reports its start and end in order."""
+        events = []
+        result = self.agent.convert_article(RAW_CONTENT['url'], on_progress=lambda *event: events.append(event))
+
+        self.assertTrue(result['success'])
+        nodes = [event for event in events if event[0] in STAGES]
+        self.assertEqual(nodes, [(stage, status) for stage in STAGES for status in (STARTED, FINISHED)])
+        sections = [event for event in events if event[0] not in STAGES]
+        self.assertEqual(len(sections), 8)
+        self.assertEqual(sections[0], ('extracting vocabulary', STARTED))
+        processing = events.index(('process_content', STARTED)), events.index(('process_content', FINISHED))
+        self.assertTrue(all(processing[0] < events.index(event) < processing[1] for event in sections))
+
+    def test_cancel_between_sections(self):
+        """Test that a cancelled conversion makes no further LLM calls and returns a cancelled result."""
+        cancel = threading.Event()
+
+        def on_progress(stage, status):
+            if (stage, status) == ('rewriting article body', FINISHED):
+                cancel.set()
+
+        result = self.agent.convert_article(RAW_CONTENT['url'], on_progress=on_progress, cancel_event=cancel)
+
+        self.assertFalse(result['success'])
+        self.assertTrue(result['cancelled'])
+        self.assertEqual(self.client.chat.completions.create.call_count, 2)
+        self.assertNotIn('finalize', result['metrics']['stages'])
+
+    def test_cancel_before_start(self):
+        """Test that an already cancelled conversion does not scrape."""
+        cancel = threading.Event()
+        cancel.set()
+        result = self.agent.convert_article(RAW_CONTENT['url'], cancel_event=cancel)
+
+        self.assertTrue(result['cancelled'])
+        self.scraper.extract_article_content.assert_not_called()
+
+    def test_broken_callback_does_not_fail_conversion(self):
+        """Test that an exception in the progress callback is only logged."""
+        def on_progress(stage, status):
+            raise RuntimeError("display closed")
+
+        with self.assertLogs('src.progress', level='WARNING'):
+            result = self.agent.convert_article(RAW_CONTENT['url'], on_progress=on_progress)
+        self.assertTrue(result['success'])
+
+
+
+class TestArticleStream(unittest.TestCase):
+    """Test cases for streaming the rewritten body out of a conversion."""
+
+    def setUp(self):
+        """Set up an agent with a fake scraper and OpenAI client."""
+        self.scraper = Mock()
+        self.scraper.extract_article_content.return_value = RAW_CONTENT
+        self.client = FakeChatClient(delay=0.05)
+        self.agent = EngooNewsAgent(ContentProcessor(self.client, concurrent=True), scraper=self.scraper)
+
+    def test_questions_start_when_stream_ends(self):
+        """Test that the body is streamed and the question generators follow it."""
+        events = []
+        result = self.agent.convert_article(RAW_CONTENT['url'], on_progress=lambda *event: events.append(event),
+                                            on_body_delta=lambda text: events.append(('body', text)))
+
+        self.assertEqual(result['article']['article_body'], "Rewritten body.")
+        last_delta = max(i for i, event in enumerate(events) if event[0] == 'body')
+        self.assertLess(last_delta, events.index(('generating discussion questions', STARTED)))
+        self.assertLess(last_delta, events.index(('generating further discussion questions', STARTED)))
+
+    def test_iterate_then_read_result(self):
+        """Test the iterator API."""
+        stream = self.agent.stream_article(RAW_CONTENT['url'], formats=['markdown'])
+        pieces = list(stream)
+
+        self.assertEqual(pieces, ['Rewritten', ' body.'])
+        self.assertTrue(stream.result['success'])
+        self.assertIn('markdown', stream.result['article'])
+        self.assertEqual(list(stream), [])
+
+    def test_closing_early_cancels(self):
+        """Test that leaving the stream before the end cancels the conversion."""
+        with self.agent.stream_article(RAW_CONTENT['url']) as stream:
+            self.assertEqual(next(stream), 'Rewritten')
+
+        self.assertTrue(stream.result['cancelled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.batch import read_url_file, run_batch, lesson_filename
+
+
+class TestBatch(unittest.TestCase):
+    """Test cases for batch conversion."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_read_plain_and_jsonl(self):
+        """Test reading URLs from plain text and JSON lines."""
+        url_file = self.tmp_path / 'urls.txt'
+        url_file.write_text(
+            "# weekly set\n"
+            "https://example.com/a\n"
+            "\n"
+            '{"url": "https://example.com/b", "level": "B1"}\n'
+        )
+
+        self.assertEqual(read_url_file(url_file), ["https://example.com/a", "https://example.com/b"])
+
+    def test_lesson_filename(self):
+        """Test that filenames are ordered and filesystem-safe."""
+        self.assertEqual(lesson_filename(7, "AI: What's Next?"), "007_ai-what-s-next.html")
+
+    def test_run_batch_writes_lessons(self):
+        """Test that successful conversions are written and failures reported."""
+        def convert(url):
+            if url.endswith('bad'):
+                return {'success': False, 'url': url, 'error': 'Failed to scrape content from URL'}
+            return {'success': True, 'url': url, 'error': None,
+                    'article': {'title': f"Title {url[-1]}", 'html': f"<html>{url}</html>"}}
+
+        agent = Mock()
+        agent.convert_article.side_effect = convert
+        progress = []
+
+        summary = run_batch(agent, ["https://e.com/1", "https://e.com/bad", "https://e.com/3"],
+                            self.tmp_path / 'out', workers=2,
+                            on_item=lambda item, done, total: progress.append((done, total)))
+
+        self.assertEqual(summary.succeeded, 2)
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual([item.index for item in summary.items], [1, 2, 3])
+        self.assertEqual(sorted(progress), [(1, 3), (2, 3), (3, 3)])
+        self.assertEqual(Path(summary.items[2].output_path).read_text(), "<html>https://e.com/3</html>")
+        self.assertEqual(summary.items[1].error, 'Failed to scrape content from URL')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from benchmarks.fake_openai import FakeOpenAIServer, LatencyModel
+from benchmarks.harness import compare, format_report, run_benchmark
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Smoke tests for the offline benchmark suite."""
+
+    def test_latency_model(self):
+        """Test parsing and sampling latency specs."""
+        rng = random.Random(0)
+        self.assertEqual(LatencyModel.parse("fixed:0.2").sample(rng), 0.2)
+        self.assertTrue(0.1 <= LatencyModel.parse("uniform:0.1,0.3").sample(rng) <= 0.3)
+        self.assertGreater(LatencyModel.parse("lognormal:0.3,0.5").sample(rng), 0)
+        with self.assertRaises(ValueError):
+            LatencyModel.parse("gaussian:1")
+
+    def test_run_benchmark(self):
+        """Test that both paths convert the whole corpus against the local servers."""
+        report = run_benchmark(articles=5, latency='fixed:0', workers=2, error_rate=0.1)
+
+        for mode in ('single', 'batch'):
+            self.assertEqual(report[mode]['articles'], 5)
+            self.assertEqual(report[mode]['failed'], 0)
+            self.assertGreater(report[mode]['throughput_per_minute'], 0)
+        self.assertGreaterEqual(report['openai_requests'], 40)
+        self.assertIn("p95", format_report(report))
+
+    def test_compare_flags_regressions(self):
+        """Test that slower or failing runs are reported against a baseline."""
+        baseline = {'batch': {'failed': 0, 'p95_seconds': 1.0, 'throughput_per_minute': 100.0}, 'peak_rss_mb': 100}
+        same = {'batch': {'failed': 0, 'p95_seconds': 1.1, 'throughput_per_minute': 90.0}, 'peak_rss_mb': 110}
+        slower = {'batch': {'failed': 1, 'p95_seconds': 1.5, 'throughput_per_minute': 60.0}, 'peak_rss_mb': 150}
+
+        self.assertEqual(compare(same, baseline, 0.2), [])
+        self.assertEqual(len(compare(slower, baseline, 0.2)), 4)
+
+
+    def test_streamed_rewrite_over_http(self):
+        """Test streaming the rewrite through the OpenAI client and rate-limit governor."""
+        from openai import OpenAI
+        from src.processor import ContentProcessor
+        from src.rate_limit import RateLimitGovernor
+
+        with FakeOpenAIServer() as server:
+            client = OpenAI(api_key='benchmark', base_url=server.base_url, max_retries=0)
+            processor = ContentProcessor(client, concurrent=True, governor=RateLimitGovernor(max_concurrency=4))
+            deltas = []
+            article = processor.process_article({'title': 'Title', 'text': 'Text.'}, on_body_delta=deltas.append)
+
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual(''.join(deltas).strip(), article.article_body)
+
+
+if __name__ == '__main__':
+    unittest.main()
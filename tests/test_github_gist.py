@@ -0,0 +1,453 @@
+import unittest
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.gist_index import GistIndex
+from src.github_gist import GitHubGistClient, GitHubSession, BUNDLE_INDEX_FILENAME
+from src.http_cache import HTTPCache
+
+
+def make_gist(i):
+    return {
+        'id': f"g{i}",
+        'description': f"Engoo ESL Lesson: Story {i}" if i % 5 else "Dotfiles",
+        'created_at': '2024-05-01T00:00:00Z',
+        'updated_at': '2024-05-01T00:00:00Z',
+        'public': True,
+        'files': {f"engoo_lesson_{i}.html" if i % 5 else "vimrc": {'raw_url': f"https://gist.example/raw/{i}"}},
+        'html_url': f"https://gist.github.com/g{i}"
+    }
+
+
+class FakeGitHub:
+    """Serves GET /gists with Link pagination and ETags; records each request."""
+
+    def __init__(self, count):
+        self.gists = [make_gist(i) for i in range(count)]
+        self.requests = []
+        self.posted = []
+        self.patched = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                gist = make_gist(len(fake.gists))
+                gist.update(description=data['description'], updated_at='2024-06-01T00:00:00Z',
+                            files={name: {'raw_url': f"https://gist.example/raw/{name}"} for name in data['files']})
+                fake.gists.insert(0, gist)
+                with fake.lock:
+                    fake.requests.append(('POST', None, None))
+                    fake.posted.append(data)
+                self.send_json(201, gist)
+
+            def do_PATCH(self):
+                data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                gist = next(gist for gist in fake.gists if gist['id'] == self.path.rsplit('/', 1)[-1])
+                gist.update(description=data.get('description', gist['description']), updated_at='2024-06-02T00:00:00Z')
+                for name, file in data['files'].items():
+                    if file is None:
+                        gist['files'].pop(name, None)
+                    else:
+                        gist['files'][name] = {'raw_url': f"https://gist.example/raw/{name}"}
+                with fake.lock:
+                    fake.requests.append(('PATCH', gist['id'], None))
+                    fake.patched.append(data)
+                self.send_json(200, gist)
+
+            def do_DELETE(self):
+                gist_id = self.path.rsplit('/', 1)[-1]
+                fake.gists = [gist for gist in fake.gists if gist['id'] != gist_id]
+                with fake.lock:
+                    fake.requests.append(('DELETE', gist_id, None))
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                per_page = int(query.get('per_page', ['30'])[0])
+                page = int(query.get('page', ['1'])[0])
+                gists = [gist for gist in fake.gists if gist['updated_at'] >= query.get('since', [''])[0]]
+                items = gists[(page - 1) * per_page:page * per_page]
+                last = max(1, -(-len(gists) // per_page))
+                etag = f'"page-{page}-{len(fake.gists)}"'
+                with fake.lock:
+                    fake.requests.append((page, self.headers.get('If-None-Match'), self.headers.get('Authorization')))
+                if 'since' in query:
+                    self.send_json(200, items)
+                    return
+
+                links = []
+                if page < last:
+                    base = f"http://{self.headers['Host']}/gists?per_page={per_page}"
+                    links = [f'<{base}&page={page + 1}>; rel="next"', f'<{base}&page={last}>; rel="last"']
+
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                body = json.dumps(items).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'private, max-age=60')
+                if links:
+                    self.send_header('Link', ', '.join(links))
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestListGists(unittest.TestCase):
+    """Test cases for listing gists."""
+
+    def setUp(self):
+        """Set up a client with a temporary page cache."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = HTTPCache(Path(self.tmpdir.name) / 'http')
+        self.index = GistIndex(Path(self.tmpdir.name) / 'gists.sqlite3')
+
+    def tearDown(self):
+        """Remove the page cache and index."""
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def make_client(self, base_url):
+        client = GitHubGistClient("test-token", http_cache=self.cache, index=self.index)
+        client.base_url = base_url
+        return client
+
+    def test_lists_every_page(self):
+        """Test that all pages are fetched with the maximum page size."""
+        with FakeGitHub(250) as github:
+            result = self.make_client(github.base_url).list_gists()
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_count'], 200)
+        self.assertEqual(result['gists'][0]['id'], 'g1')
+        self.assertEqual(result['gists'][-1]['id'], 'g249')
+        self.assertEqual(sorted(page for page, _, _ in github.requests), [1, 2, 3])
+        self.assertTrue(all(auth == 'token test-token' for _, _, auth in github.requests))
+
+    def test_unchanged_pages_are_revalidated(self):
+        """Test that a second listing sends ETags and reuses the cached pages."""
+        with FakeGitHub(150) as github:
+            first = self.make_client(github.base_url).list_gists()
+            github.requests.clear()
+            second = self.make_client(github.base_url).list_gists()
+
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(github.requests), [
+            (1, '"page-1-150"', 'token test-token'),
+            (2, '"page-2-150"', 'token test-token')
+        ])
+
+    def test_single_page(self):
+        """Test an account whose gists fit on one page."""
+        with FakeGitHub(3) as github:
+            result = self.make_client(github.base_url).list_gists()
+
+        self.assertEqual([gist['id'] for gist in result['gists']], ['g1', 'g2'])
+        self.assertEqual(len(github.requests), 1)
+
+    def test_listing_fills_the_index(self):
+        """Test that a listing is kept in the local index for offline lookup."""
+        with FakeGitHub(12) as github:
+            client = self.make_client(github.base_url)
+            client.list_gists()
+            requests_made = len(github.requests)
+
+            lookup = client.lookup_gist('g3')
+
+        self.assertEqual(self.index.count(), 9)
+        self.assertTrue(lookup['cached'])
+        self.assertEqual(lookup['gist']['raw_urls'], {'engoo_lesson_3.html': 'https://gist.example/raw/3'})
+        self.assertEqual(len(github.requests), requests_made)
+
+    def test_incremental_sync(self):
+        """Test that later syncs only ask for gists changed since the last one."""
+        with FakeGitHub(12) as github:
+            client = self.make_client(github.base_url)
+            self.assertTrue(client.sync_index()['full'])
+            self.index.mark_synced('2024-05-15T00:00:00Z')
+            github.gists[0]['updated_at'] = '2024-06-01T00:00:00Z'
+            github.gists[0]['description'] = 'Engoo ESL Lesson: Renamed'
+
+            sync = client.sync_index()
+
+        self.assertEqual((sync['full'], sync['changed']), (False, 1))
+        self.assertEqual(self.index.get('g0')['description'], 'Engoo ESL Lesson: Renamed')
+        self.assertNotEqual(self.index.last_synced_at, '2024-05-15T00:00:00Z')
+
+    def test_create_and_delete_update_the_index(self):
+        """Test that gists created or deleted through the client are reflected locally."""
+        with FakeGitHub(0) as github:
+            client = self.make_client(github.base_url)
+            created = client.create_gist("<title>Solar - Daily News</title>", filename="engoo_solar.html")
+            self.assertEqual(self.index.get(created['gist_id'])['description'], "Engoo ESL Lesson: Solar")
+
+            self.assertTrue(client.delete_gist(created['gist_id'])['success'])
+
+        self.assertIsNone(self.index.get(created['gist_id']))
+
+    def test_refresh_within_max_age_sees_new_and_deleted_gists(self):
+        """Test that a listing revalidates cached pages instead of trusting max-age."""
+        with FakeGitHub(3) as github:
+            client = self.make_client(github.base_url)
+            client.list_gists()
+            created = client.create_gist("<title>Solar - Daily News</title>", filename="engoo_solar.html")
+
+            after_create = client.list_gists()
+            self.assertIsNotNone(self.index.get(created['gist_id']))
+
+            client.delete_gist('g1')
+            after_delete = client.list_gists()
+
+        self.assertIn(created['gist_id'], [gist['id'] for gist in after_create['gists']])
+        self.assertNotIn('g1', [gist['id'] for gist in after_delete['gists']])
+        self.assertIsNone(self.index.get('g1'))
+
+
+class TestPublishLessons(unittest.TestCase):
+    """Test cases for publishing many lessons."""
+
+    def setUp(self):
+        """Write three lessons to a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+        self.index = GistIndex(self.tmp_path / 'gists.sqlite3')
+        self.lesson_dir = self.tmp_path / 'lessons'
+        self.lesson_dir.mkdir()
+        for i, title in enumerate(["Solar Park", "Coffee Prices", "Rail & Road"], 1):
+            (self.lesson_dir / f"00{i}_lesson.html").write_text(f"<title>{title} - Daily News</title>")
+
+    def tearDown(self):
+        """Remove the lessons."""
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def make_client(self, base_url):
+        client = GitHubGistClient("test-token", http_cache=HTTPCache(self.tmp_path / 'http'), index=self.index)
+        client.base_url = base_url
+        return client
+
+    def test_bundle_is_one_request(self):
+        """Test that a directory becomes one gist with an index page linking every lesson."""
+        with FakeGitHub(0) as github:
+            results = self.make_client(github.base_url).publish_directory([self.lesson_dir], description="Week 12")
+
+        self.assertEqual(len(github.posted), 1)
+        files = github.posted[0]['files']
+        self.assertEqual(list(files), [BUNDLE_INDEX_FILENAME, '001_lesson.html', '002_lesson.html', '003_lesson.html'])
+        index_html = files[BUNDLE_INDEX_FILENAME]['content']
+        self.assertIn('<a href="001_lesson.html">Solar Park</a>', index_html)
+        self.assertIn('Rail &amp; Road', index_html)
+
+        self.assertTrue(results[0]['success'])
+        self.assertTrue(results[0]['preview_url'].endswith('/raw/index.html'))
+        self.assertEqual([lesson['title'] for lesson in results[0]['lessons']], ["Solar Park", "Coffee Prices", "Rail & Road"])
+        self.assertEqual(self.index.get(results[0]['gist_id'])['preview_url'], results[0]['preview_url'])
+
+    def test_separate_gists(self):
+        """Test publishing one gist per lesson."""
+        with FakeGitHub(0) as github:
+            results = self.make_client(github.base_url).publish_directory([self.lesson_dir], bundle=False, workers=3)
+
+        self.assertEqual(len(github.posted), 3)
+        self.assertEqual([result['filename'] for result in results], ['001_lesson.html', '002_lesson.html', '003_lesson.html'])
+
+    def test_reserved_and_duplicate_names(self):
+        """Test that bundles reject filenames that would collide."""
+        client = self.make_client("http://127.0.0.1:9")
+        with self.assertRaises(ValueError):
+            client.create_bundle({BUNDLE_INDEX_FILENAME: "<html></html>"})
+        with self.assertRaises(ValueError):
+            client.publish_directory([self.lesson_dir / '001_lesson.html', self.lesson_dir / '001_lesson.html'])
+
+    def test_unchanged_update_sends_nothing(self):
+        """Test that re-uploading identical content makes no request."""
+        with FakeGitHub(0) as github:
+            client = self.make_client(github.base_url)
+            created = client.create_gist("<title>Solar Park</title>", filename="lesson.html")
+            github.requests.clear()
+            result = client.update_gist(created['gist_id'], "<title>Solar Park</title>", filename="lesson.html")
+            self.assertTrue(result['unchanged'])
+            self.assertEqual(github.requests, [])
+
+            result = client.update_gist(created['gist_id'], "<title>Solar Park!</title>", filename="lesson.html")
+        self.assertFalse(result['unchanged'])
+        self.assertEqual(github.requests, [('PATCH', created['gist_id'], None)])
+
+    def test_sync_sends_only_changes(self):
+        """Test that syncing a directory creates its bundle once, then patches only what changed."""
+        with FakeGitHub(0) as github:
+            client = self.make_client(github.base_url)
+            created = client.sync_bundle(self.lesson_dir, description="Week 12")
+            self.assertTrue(created['created'])
+
+            github.requests.clear()
+            result = client.sync_bundle(self.lesson_dir)
+            self.assertEqual((result['changed'], result['removed']), ([], []))
+            self.assertEqual(github.requests, [])
+
+            (self.lesson_dir / '002_lesson.html').write_text("<title>Coffee Prices - Daily News</title><p>v2</p>")
+            (self.lesson_dir / '003_lesson.html').unlink()
+            result = client.sync_bundle(self.lesson_dir)
+            self.assertEqual(github.requests, [('PATCH', created['gist_id'], None)])
+            self.assertEqual(list(github.patched[0]['files']), [BUNDLE_INDEX_FILENAME, '002_lesson.html', '003_lesson.html'])
+            self.assertIsNone(github.patched[0]['files']['003_lesson.html'])
+            self.assertEqual((result['changed'], result['removed']), (['002_lesson.html'], ['003_lesson.html']))
+
+            github.requests.clear()
+            client.sync_bundle(self.lesson_dir)
+        self.assertEqual(github.requests, [])
+
+
+class ScriptedServer:
+    """Answers each request with the next (status, headers, body) from a script, repeating the last one."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.methods = []
+
+    def __enter__(self):
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def respond(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                scripted.methods.append(self.command)
+                status, headers, body = scripted.script.pop(0) if len(scripted.script) > 1 else scripted.script[0]
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        self.url = f"http://{host}:{port}/gists"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestGitHubSession(unittest.TestCase):
+    """Test cases for retries and rate limit handling."""
+
+    def setUp(self):
+        """Create a session that records waits instead of sleeping."""
+        self.waits = []
+        self.session = GitHubSession(backoff_factor=0, sleep=self.waits.append)
+
+    def test_server_errors_are_retried(self):
+        """Test that idempotent requests survive transient 5xx responses."""
+        with ScriptedServer([(502, {}, {}), (503, {}, {}), (200, {}, {'ok': True})]) as server:
+            response = self.session.get(server.url)
+
+        self.assertEqual(response.json(), {'ok': True})
+        self.assertEqual(len(server.methods), 3)
+
+    def test_post_is_not_retried_after_server_error(self):
+        """Test that a create that may have reached GitHub is not sent twice."""
+        with ScriptedServer([(502, {}, {}), (201, {}, {'id': 'g1'})]) as server:
+            response = self.session.post(server.url, data='{}')
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(server.methods, ['POST'])
+
+    def test_secondary_rate_limit_is_retried(self):
+        """Test that a secondary rate limit waits for Retry-After and retries."""
+        limited = (403, {'Retry-After': '7'}, {'message': 'You have exceeded a secondary rate limit'})
+        with ScriptedServer([limited, (201, {}, {'id': 'g1'})]) as server:
+            response = self.session.post(server.url, data='{}')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.waits, [7.0])
+
+    def test_malformed_reset_falls_back_to_backoff(self):
+        """Test that an unparseable X-RateLimit-Reset still retries after the backoff delay."""
+        limited = (403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': 'soon'},
+                   {'message': 'API rate limit exceeded'})
+        with ScriptedServer([limited, (201, {}, {'id': 'g1'})]) as server:
+            response = self.session.post(server.url, data='{}')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.waits, [60.0])
+
+    def test_forbidden_is_not_retried(self):
+        """Test that a plain permission error is returned at once."""
+        with ScriptedServer([(403, {}, {'message': 'Resource not accessible by personal access token'})]) as server:
+            response = self.session.delete(server.url)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual((len(server.methods), self.waits), (1, []))
+
+    def test_waits_when_quota_is_used_up(self):
+        """Test that the next request waits for the reset once the quota reaches zero."""
+        reset = str(int(time.time()) + 30)
+        with ScriptedServer([(200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}, []),
+                             (200, {'X-RateLimit-Remaining': '4999'}, [])]) as server:
+            self.session.get(server.url)
+            self.assertEqual(self.session.rate_limit_remaining, 0)
+            self.session.get(server.url)
+
+        self.assertEqual(len(self.waits), 1)
+        self.assertTrue(25 <= self.waits[0] <= 32)
+        self.assertEqual(self.session.rate_limit_remaining, 4999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.glossary import Glossary, lemmatize
+from src.processor import ContentProcessor
+from tests.test_processor import FakeChatClient, FakeAsyncChatClient, make_response
+
+
+class TestLemmatize(unittest.TestCase):
+    """Test cases for glossary keys."""
+
+    def test_plurals(self):
+        """Test that regular and irregular plurals share a key with the singular."""
+        self.assertEqual(lemmatize("Initiatives"), "initiative")
+        self.assertEqual(lemmatize("policies"), "policy")
+        self.assertEqual(lemmatize("taxes"), "tax")
+        self.assertEqual(lemmatize("children"), "child")
+
+    def test_es_and_s_endings_that_are_not_simple_plurals(self):
+        """Test that verb forms and "-e" nouns do not lose too much."""
+        cases = {"does": "do", "goes": "go", "heroes": "hero", "shoes": "shoe", "dies": "die",
+                 "sizes": "size", "headaches": "headache", "quizzes": "quiz", "buzzes": "buzz"}
+        for word, lemma in cases.items():
+            with self.subTest(word=word):
+                self.assertEqual(lemmatize(word), lemma)
+        self.assertNotEqual(lemmatize("does"), lemmatize("doe"))
+
+    def test_unchanged(self):
+        """Test words that must not be stripped."""
+        for word in ("unprecedented", "controversial", "status", "news", "crisis", "climate change",
+                     "yes", "bias", "whereas"):
+            self.assertEqual(lemmatize(word), word)
+
+
+class TestGlossary(unittest.TestCase):
+    """Test cases for the glossary store."""
+
+    def setUp(self):
+        """Open a glossary in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'glossary.sqlite3'
+        self.glossary = Glossary(self.path)
+
+    def tearDown(self):
+        """Close and remove the glossary."""
+        self.glossary.close()
+        self.tmpdir.cleanup()
+
+    def test_add_and_lookup_by_lemma(self):
+        """Test that inflected forms find the stored definition."""
+        self.glossary.add({'initiative': 'A new plan to solve a problem'})
+
+        self.assertEqual(self.glossary.lookup(['Initiatives', 'budget']), {'initiative': 'A new plan to solve a problem'})
+        self.assertEqual(self.glossary.stats()['hits'], 1)
+        self.assertEqual(self.glossary.stats()['misses'], 1)
+
+    def test_vetted_definitions_are_kept(self):
+        """Test that vetted definitions replace generated ones and are not overwritten."""
+        self.glossary.add({'budget': 'Money'})
+        self.glossary.vet('budgets', 'A plan for how to spend money')
+        self.glossary.add({'budget': 'Something else'})
+
+        self.assertEqual(self.glossary.lookup(['budget']), {'budget': 'A plan for how to spend money'})
+        self.assertEqual(self.glossary.stats()['vetted'], 1)
+
+    def test_review_unvetted_entries(self):
+        """Test listing definitions awaiting review and vetting them."""
+        self.glossary.add({'budget': 'Money', 'initiative': 'A new plan'})
+        self.glossary.lookup(['initiatives'])
+
+        self.assertEqual([entry.word for entry in self.glossary.entries(unvetted_only=True)], ['initiative', 'budget'])
+        self.assertTrue(self.glossary.vet('initiatives'))
+        self.assertFalse(self.glossary.vet('deficit'))
+
+        self.assertEqual([entry.word for entry in self.glossary.entries(unvetted_only=True)], ['budget'])
+        self.assertEqual(self.glossary.stats()['vetted'], 1)
+
+    def test_persistence(self):
+        """Test that definitions survive reopening the glossary."""
+        self.glossary.add({'harvest': 'The gathering of crops'})
+        self.glossary.close()
+        self.glossary = Glossary(self.path)
+
+        self.assertEqual(self.glossary.lookup(['harvests']), {'harvest': 'The gathering of crops'})
+
+
+class TestProcessorGlossary(unittest.TestCase):
+    """Test the vocabulary stage with a glossary."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.glossary = Glossary(Path(self.tmpdir.name) / 'glossary.sqlite3')
+        self.raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+    def tearDown(self):
+        """Close and remove the glossary."""
+        self.glossary.close()
+        self.tmpdir.cleanup()
+
+    def _prompts(self, client):
+        return [call.kwargs['messages'][0]['content'] for call in client.chat.completions.create.call_args_list]
+
+    def test_known_words_are_not_redefined(self):
+        """Test that only the first lesson pays for definitions."""
+        first_client = FakeChatClient()
+        first = ContentProcessor(first_client, glossary=self.glossary).process_article(self.raw_content)
+        second_client = FakeChatClient()
+        second = ContentProcessor(second_client, glossary=self.glossary).process_article(self.raw_content)
+
+        self.assertEqual(sum('definitions' in p for p in self._prompts(first_client)), 1)
+        self.assertEqual(sum('definitions' in p for p in self._prompts(second_client)), 0)
+        self.assertEqual(first.vocabulary, second.vocabulary)
+        self.assertEqual(second.vocabulary[0].definition, 'A new idea')
+        self.assertEqual(second.vocabulary[0].example, 'Innovation helps.')
+
+    def test_selection_prompt_asks_for_no_definitions(self):
+        """Test that the vocabulary request only asks for words and examples."""
+        client = FakeChatClient()
+        ContentProcessor(client, glossary=self.glossary).process_article(self.raw_content)
+
+        selection_call = next(call.kwargs for call in client.chat.completions.create.call_args_list
+                              if 'vocabulary' in call.kwargs['messages'][0]['content'])
+        self.assertIn('Do not write definitions', selection_call['messages'][1]['content'])
+
+    def test_undefined_words_are_dropped(self):
+        """Test that a word the definitions call skipped is left out rather than shown without a definition."""
+        client = FakeChatClient()
+        respond = client._respond
+
+        def respond_with_extra_word(**kwargs):
+            if 'vocabulary' in kwargs['messages'][0]['content']:
+                return make_response(json.dumps({'vocabulary': [
+                    {'word': 'innovation', 'example': 'Innovation helps.'},
+                    {'word': 'obscure', 'example': 'An obscure word.'}
+                ]}))
+            return respond(**kwargs)
+
+        client._respond = respond_with_extra_word
+        article = ContentProcessor(client, glossary=self.glossary).process_article(self.raw_content)
+
+        self.assertEqual([v.word for v in article.vocabulary], ['innovation'])
+
+    def test_async_uses_glossary(self):
+        """Test the async pipeline reuses glossary definitions too."""
+        self.glossary.add({'innovation': 'A new idea'})
+        async_client = FakeAsyncChatClient()
+        processor = ContentProcessor(FakeChatClient(), async_client=async_client, glossary=self.glossary)
+
+        article = asyncio.run(processor.aprocess_article(self.raw_content))
+
+        self.assertEqual(article.vocabulary[0].definition, 'A new idea')
+        self.assertEqual(sum('definitions' in p for p in self._prompts(async_client)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.http_cache import HTTPCache, CacheMissError
+from src.scraper import WebScraper
+
+ARTICLE_HTML = """
+<html>
+    <head><title>Local Fixture Article Title</title></head>
+    <body>
+        <article>This is fixture content served by the local test server.</article>
+    </body>
+</html>
+"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves a fixed article with an ETag and configurable Cache-Control."""
+
+    etag = '"v1"'
+    cache_control = 'no-cache'
+    content_type = 'text/html; charset=utf-8'
+    body = ARTICLE_HTML
+    requests_seen = []
+
+    def do_GET(self):
+        FixtureHandler.requests_seen.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+
+        body = self.body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', self.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.send_header('Cache-Control', self.cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Test cases for HTTPCache against a local fixture server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the fixture server."""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/article"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fixture server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        FixtureHandler.requests_seen = []
+        FixtureHandler.etag = '"v1"'
+        FixtureHandler.cache_control = 'no-cache'
+        FixtureHandler.content_type = 'text/html; charset=utf-8'
+        FixtureHandler.body = ARTICLE_HTML
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.session.close()
+        self.tmpdir.cleanup()
+
+    def test_revalidates_with_etag(self):
+        """Test that a second fetch sends If-None-Match and is served from a 304."""
+        cache = HTTPCache(self.tmpdir.name)
+        first = cache.fetch(self.session, self.url)
+        second = cache.fetch(self.session, self.url)
+
+        self.assertFalse(first.from_cache)
+        self.assertGreater(first.bytes_downloaded, 0)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(FixtureHandler.requests_seen[1].get('If-None-Match'), '"v1"')
+
+    def test_fresh_entry_skips_network(self):
+        """Test that max-age responses are served without a request."""
+        FixtureHandler.cache_control = 'max-age=3600'
+        cache = HTTPCache(self.tmpdir.name)
+        cache.fetch(self.session, self.url)
+        page = cache.fetch(self.session, self.url)
+
+        self.assertTrue(page.from_cache)
+        self.assertEqual(len(FixtureHandler.requests_seen), 1)
+
+    def test_changed_page_is_downloaded(self):
+        """Test that a changed ETag results in a full download."""
+        cache = HTTPCache(self.tmpdir.name)
+        cache.fetch(self.session, self.url)
+        FixtureHandler.etag = '"v2"'
+        page = cache.fetch(self.session, self.url)
+
+        self.assertFalse(page.from_cache)
+
+    def test_stores_meta_charset_pages_decoded(self):
+        """Test that a UTF-8 page served without a header charset is cached and replayed intact."""
+        FixtureHandler.content_type = 'text/html'
+        FixtureHandler.body = '<html><head><meta charset="utf-8"><title>Café — naïve</title></head></html>'
+        HTTPCache(self.tmpdir.name).fetch(self.session, self.url)
+        page = HTTPCache(self.tmpdir.name, offline=True).fetch(self.session, self.url)
+
+        self.assertTrue(page.from_cache)
+        self.assertIn('Café — naïve', page.text)
+
+    def test_offline_mode(self):
+        """Test that offline mode serves cached pages and never hits the network."""
+        HTTPCache(self.tmpdir.name).fetch(self.session, self.url)
+        offline = HTTPCache(self.tmpdir.name, offline=True)
+
+        self.assertTrue(offline.fetch(self.session, self.url).from_cache)
+        with self.assertRaises(CacheMissError):
+            offline.fetch(self.session, self.url + "-missing")
+        self.assertEqual(len(FixtureHandler.requests_seen), 1)
+
+    def test_max_bytes_eviction(self):
+        """Test that the cache stays within its size limit."""
+        cache = HTTPCache(self.tmpdir.name, max_bytes=len(ARTICLE_HTML) + 10)
+        cache.fetch(self.session, self.url + "?a")
+        cache.fetch(self.session, self.url + "?b")
+
+        self.assertEqual(len(list(Path(self.tmpdir.name).glob('*.body'))), 1)
+
+    def test_scraper_reuses_parsed_content(self):
+        """Test that the scraper skips re-parsing when the page is unchanged."""
+        scraper = WebScraper(http_cache=HTTPCache(self.tmpdir.name))
+        first = scraper.extract_article_content(self.url)
+
+        with patch.object(scraper, '_parse_html') as mock_parse:
+            second = scraper.extract_article_content(self.url)
+
+        mock_parse.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(second['title'], "Local Fixture Article Title")
+
+
+    def test_async_scraper_revalidates(self):
+        """Test that the async scraper shares the cache and revalidation logic."""
+        scraper = WebScraper(http_cache=HTTPCache(self.tmpdir.name))
+
+        async def scrape_twice():
+            first = await scraper.aextract_article_content(self.url)
+            second = await scraper.aextract_article_content(self.url)
+            await scraper.aclose()
+            return first, second
+
+        first, second = asyncio.run(scrape_twice())
+
+        self.assertEqual(first['title'], "Local Fixture Article Title")
+        self.assertEqual(first, second)
+        self.assertEqual(FixtureHandler.requests_seen[1].get('If-None-Match'), '"v1"')
+
+
+if __name__ == '__main__':
+    unittest.main()
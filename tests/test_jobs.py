@@ -0,0 +1,197 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.agent import EngooNewsAgent
+from src.batch import run_batch, default_job_id, restart_job
+from src.jobs import JobStore, checkpoint_serializer, create_checkpointer, DONE, FAILED, PENDING
+from src.processor import ContentProcessor
+from tests.test_processor import FakeChatClient
+
+
+class TestJobStore(unittest.TestCase):
+    """Test cases for per-URL job status."""
+
+    def setUp(self):
+        """Open a job store in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(Path(self.tmpdir.name) / 'jobs.sqlite3')
+
+    def tearDown(self):
+        """Close and remove the job store."""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_status_is_recorded(self):
+        """Test that item status changes are stored and counted."""
+        items = self.store.start('weekly', ["https://e.com/1", "https://e.com/2"])
+        self.assertEqual([(item.position, item.status) for item in items], [(1, PENDING), (2, PENDING)])
+
+        self.store.mark_running('weekly', 1)
+        self.store.mark_done('weekly', 1, "Title", "/tmp/001_title.html")
+        self.store.mark_running('weekly', 2)
+        self.store.mark_failed('weekly', 2, "Timed out")
+
+        items = self.store.items('weekly')
+        self.assertEqual((items[0].status, items[0].attempts, items[0].output_path), (DONE, 1, "/tmp/001_title.html"))
+        self.assertEqual((items[1].status, items[1].error), (FAILED, "Timed out"))
+        self.assertEqual(self.store.counts('weekly'), {'pending': 0, 'running': 0, 'done': 1, 'failed': 1})
+
+    def test_restarting_keeps_status(self):
+        """Test that starting an existing job returns its recorded progress."""
+        self.store.start('weekly', ["https://e.com/1"])
+        self.store.mark_done('weekly', 1, "Title", "/tmp/out.html")
+
+        self.assertEqual(self.store.start('weekly', ["https://e.com/1"])[0].status, DONE)
+        with self.assertRaises(ValueError):
+            self.store.start('weekly', ["https://e.com/other"])
+
+        self.assertTrue(self.store.delete('weekly'))
+        self.assertEqual(self.store.start('weekly', ["https://e.com/other"])[0].status, PENDING)
+
+
+class TestResumableBatch(unittest.TestCase):
+    """Test cases for resuming batch jobs."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+        self.store = JobStore(self.tmp_path / 'jobs.sqlite3')
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_rerun_skips_finished_urls(self):
+        """Test that a second run converts only the URLs that did not finish."""
+        outcomes = {"https://e.com/1": [True], "https://e.com/2": [False, True]}
+
+        def convert(url, thread_id=None):
+            if not outcomes[url].pop(0):
+                return {'success': False, 'url': url, 'error': 'Rate limited'}
+            return {'success': True, 'url': url, 'error': None,
+                    'article': {'title': f"Title {url[-1]}", 'html': f"<html>{url}</html>"}}
+
+        agent = Mock()
+        agent.convert_article.side_effect = convert
+        urls = list(outcomes)
+
+        first = run_batch(agent, urls, self.tmp_path / 'out', job_store=self.store, job_id='weekly')
+        second = run_batch(agent, urls, self.tmp_path / 'out', job_store=self.store, job_id='weekly')
+
+        self.assertEqual((first.succeeded, first.failed), (1, 1))
+        self.assertEqual((second.succeeded, second.skipped), (2, 1))
+        self.assertTrue(second.items[0].skipped)
+        self.assertEqual(agent.convert_article.call_count, 3)
+        self.assertEqual(agent.convert_article.call_args.kwargs, {'thread_id': 'weekly:2'})
+        self.assertEqual(agent.discard_checkpoint.call_count, 2)
+        self.assertEqual(self.store.counts('weekly')[DONE], 2)
+
+    def test_unwritable_lesson_fails_only_its_item(self):
+        """Test that an error writing one lesson is reported and the batch carries on."""
+        agent = Mock()
+        agent.convert_article.side_effect = lambda url, thread_id=None: {
+            'success': True, 'url': url, 'error': None,
+            'article': {'title': f"Title {url[-1]}", 'html': f"<html>{url}</html>"}}
+        # A directory where the first lesson file should go makes its write fail
+        (self.tmp_path / 'out' / '001_title-1.html').mkdir(parents=True)
+
+        summary = run_batch(agent, ["https://e.com/1", "https://e.com/2"], self.tmp_path / 'out',
+                            job_store=self.store, job_id='weekly')
+
+        self.assertEqual((summary.succeeded, summary.failed), (1, 1))
+        self.assertIn('Cannot write', summary.items[0].error)
+        self.assertEqual(self.store.counts('weekly')[FAILED], 1)
+        self.assertEqual(self.store.counts('weekly')[DONE], 1)
+
+    def test_default_job_id_is_stable(self):
+        """Test that the same command maps to the same job."""
+        self.assertEqual(default_job_id('urls.txt', 'lessons'), default_job_id('./urls.txt', 'lessons/'))
+        self.assertNotEqual(default_job_id('urls.txt', 'lessons'), default_job_id('urls.txt', 'other'))
+        self.assertTrue(default_job_id('urls.txt', 'lessons').startswith('urls-'))
+
+
+class TestAgentCheckpoints(unittest.TestCase):
+    """Test resuming an interrupted conversion from its checkpoint."""
+
+    def setUp(self):
+        """Set up an agent with a persistent checkpointer."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpointer = create_checkpointer(Path(self.tmpdir.name) / 'checkpoints.sqlite3')
+        self.scraper = Mock()
+        self.scraper.extract_article_content.return_value = {
+            'title': 'A Sufficiently Long Test Title',
+            'text': 'Article text. ' * 30
+        }
+        self.processor = ContentProcessor(FakeChatClient())
+        self.agent = EngooNewsAgent(self.processor, scraper=self.scraper, checkpointer=self.checkpointer)
+
+    def tearDown(self):
+        """Close and remove the checkpoints."""
+        self.checkpointer.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_interrupted_run_resumes_after_last_node(self):
+        """Test that a run killed during processing does not scrape again."""
+        process_article = self.processor.process_article
+        self.processor.process_article = Mock(side_effect=KeyboardInterrupt)
+        with self.assertRaises(KeyboardInterrupt):
+            self.agent.convert_article("https://example.com/a", thread_id="job:1")
+
+        self.processor.process_article = process_article
+        result = self.agent.convert_article("https://example.com/a", thread_id="job:1")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['article']['article_body'], "Rewritten body.")
+        self.assertEqual(self.scraper.extract_article_content.call_count, 1)
+        self.assertNotIn('scrape_content', result['metrics']['stages'])
+
+    def test_finished_thread_starts_over(self):
+        """Test that a completed thread runs the whole graph again, and discarding removes it."""
+        self.agent.convert_article("https://example.com/a", thread_id="job:1")
+        self.agent.convert_article("https://example.com/a", thread_id="job:1")
+        self.assertEqual(self.scraper.extract_article_content.call_count, 2)
+
+        self.agent.discard_checkpoint("job:1")
+        self.assertIsNone(self.checkpointer.get_tuple({"configurable": {"thread_id": "job:1"}}))
+
+    def test_restart_discards_interrupted_checkpoints(self):
+        """Test that restarting a job converts its interrupted items from scratch."""
+        store = JobStore(Path(self.tmpdir.name) / 'jobs.sqlite3')
+        self.addCleanup(store.close)
+        store.start('weekly', ["https://example.com/a"])
+        self.processor.process_article = Mock(side_effect=KeyboardInterrupt)
+        with self.assertRaises(KeyboardInterrupt):
+            self.agent.convert_article("https://example.com/a", thread_id="weekly:1")
+
+        self.assertTrue(restart_job(self.agent, store, 'weekly'))
+
+        self.assertIsNone(self.checkpointer.get_tuple({"configurable": {"thread_id": "weekly:1"}}))
+        self.assertEqual(store.items('weekly'), [])
+
+    def test_serializer_without_allow_list(self):
+        """Test that a langgraph-checkpoint without allowed_msgpack_modules falls back to the default serializer."""
+        default = Mock()
+        with patch('langgraph.checkpoint.serde.jsonplus.JsonPlusSerializer',
+                   side_effect=[TypeError("unexpected keyword argument"), default]) as serializer:
+            with self.assertLogs('src.jobs', level='WARNING'):
+                self.assertIs(checkpoint_serializer(), default)
+
+        serializer.assert_called_with()
+
+    def test_without_thread_id_nothing_is_saved(self):
+        """Test that plain conversions do not write checkpoints."""
+        self.agent.convert_article("https://example.com/a")
+
+        self.assertEqual(list(self.checkpointer.list(None)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.agent import EngooNewsAgent
+from src.library import LessonLibrary
+from src.models import VocabularyItem, DiscussionQuestion, EngooArticle
+from src.processor import ContentProcessor
+from tests.test_processor import FakeChatClient
+
+
+def make_article(title, body, words):
+    return EngooArticle(
+        title=title,
+        vocabulary=[VocabularyItem(word, f"meaning of {word}", f"An example with {word}.") for word in words],
+        article_body=body,
+        discussion_questions=[DiscussionQuestion("Do you agree?")],
+        further_discussion_questions=[DiscussionQuestion("What would you change?", "further")]
+    )
+
+
+class TestLessonLibrary(unittest.TestCase):
+    """Test cases for the lesson library."""
+
+    def setUp(self):
+        """Open a library in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.library = LessonLibrary(Path(self.tmpdir.name) / 'library.sqlite3')
+        self.solar_id = self.library.save(
+            make_article("City Opens New Solar Park", "The park produces renewable energy for homes.", ['renewable', 'grid']),
+            url="https://example.com/solar"
+        )
+        self.coffee_id = self.library.save(
+            make_article("Coffee Prices Rise", "A poor harvest pushed prices higher.", ['harvest', 'shortage']),
+            url="https://example.com/coffee"
+        )
+
+    def tearDown(self):
+        """Close and remove the library."""
+        self.library.close()
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test that a saved lesson loads back unchanged."""
+        lesson = self.library.get(self.solar_id)
+
+        self.assertEqual(lesson.url, "https://example.com/solar")
+        self.assertEqual(lesson.article, make_article(
+            "City Opens New Solar Park", "The park produces renewable energy for homes.", ['renewable', 'grid']
+        ))
+        self.assertIsNone(self.library.get(999))
+
+    def test_search_by_topic(self):
+        """Test full-text search across title and body, with prefixes and stemming."""
+        self.assertEqual([m.id for m in self.library.search("solar")], [self.solar_id])
+        self.assertEqual([m.id for m in self.library.search("harvests price")], [self.coffee_id])
+        self.assertEqual([m.id for m in self.library.search("renew")], [self.solar_id])
+        self.assertEqual(self.library.search("volcano"), [])
+
+    def test_search_by_vocabulary(self):
+        """Test finding lessons by vocabulary word."""
+        matches = self.library.search_word("Shortage")
+
+        self.assertEqual([m.id for m in matches], [self.coffee_id])
+        self.assertEqual(matches[0].snippet, "shortage: meaning of shortage")
+
+    def test_empty_query_lists_recent(self):
+        """Test that an empty query lists the latest lessons first."""
+        self.assertEqual([m.id for m in self.library.search("")], [self.coffee_id, self.solar_id])
+
+    def test_same_url_replaces_lesson(self):
+        """Test that re-converting a URL updates its lesson instead of duplicating it."""
+        lesson_id = self.library.save(
+            make_article("Solar Park Doubles in Size", "More panels were added.", ['panel']),
+            url="https://example.com/solar"
+        )
+
+        self.assertEqual(lesson_id, self.solar_id)
+        self.assertEqual(self.library.count(), 2)
+        self.assertEqual(self.library.search("renewable"), [])
+        self.assertEqual([m.id for m in self.library.search("panels")], [self.solar_id])
+        self.assertEqual(self.library.search_word("grid"), [])
+
+    def test_delete(self):
+        """Test removing a lesson and its index entries."""
+        self.assertTrue(self.library.delete(self.coffee_id))
+        self.assertEqual(self.library.search("coffee"), [])
+        self.assertEqual(self.library.search_word("harvest"), [])
+
+    def test_agent_saves_conversions(self):
+        """Test that successful conversions are stored and their id returned."""
+        scraper = Mock()
+        scraper.extract_article_content.return_value = {
+            'title': 'A Sufficiently Long Test Title',
+            'text': 'Article text. ' * 30
+        }
+        agent = EngooNewsAgent(ContentProcessor(FakeChatClient()), scraper=scraper, library=self.library)
+
+        result = agent.convert_article("https://example.com/new")
+
+        lesson = self.library.get(result['lesson_id'])
+        self.assertEqual(lesson.url, "https://example.com/new")
+        self.assertEqual(lesson.article.article_body, "Rewritten body.")
+        self.assertEqual([m.id for m in self.library.search_word("innovation")], [result['lesson_id']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.llm_cache import LLMCache
+from src.processor import ContentProcessor
+from tests.test_processor import FakeChatClient, make_response
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for LLMCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'cache.sqlite3'
+        self.messages = [{"role": "user", "content": "Hello"}]
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_request_parameters(self):
+        """Test that every keyed parameter changes the cache key."""
+        key = LLMCache.make_key("gpt-4o-mini", self.messages, 0.7)
+        self.assertEqual(key, LLMCache.make_key("gpt-4o-mini", self.messages, 0.7))
+        self.assertNotEqual(key, LLMCache.make_key("gpt-4o", self.messages, 0.7))
+        self.assertNotEqual(key, LLMCache.make_key("gpt-4o-mini", self.messages, 0.2))
+        self.assertNotEqual(key, LLMCache.make_key("gpt-4o-mini", self.messages, 0.7, {"type": "json_object"}))
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted and values persist across instances."""
+        cache = LLMCache(self.path)
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", "value")
+        cache.close()
+
+        cache = LLMCache(self.path)
+        self.assertEqual(cache.get("k"), "value")
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 0)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = LLMCache(self.path, ttl_seconds=0.01)
+        cache.set("k", "value")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted first."""
+        cache = LLMCache(self.path, max_bytes=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.get("a")
+        cache.set("c", "cccc")
+
+        self.assertEqual(cache.get("a"), "aaaa")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "cccc")
+
+    def test_processor_reuses_cached_responses(self):
+        """Test that reprocessing an article makes no new API calls."""
+        cache = LLMCache(self.path)
+        raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+        first_client = FakeChatClient()
+        first = ContentProcessor(first_client, cache=cache).process_article(raw_content)
+        second_client = FakeChatClient()
+        second = ContentProcessor(second_client, cache=cache).process_article(raw_content)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first_client.chat.completions.create.call_count, 4)
+        self.assertEqual(second_client.chat.completions.create.call_count, 0)
+
+    def test_malformed_response_is_not_cached(self):
+        """Test that a response that fails to parse is requested again on the next run."""
+        cache = LLMCache(self.path)
+        raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+        broken_client = FakeChatClient()
+        respond = broken_client._respond
+        broken_client._respond = lambda **kwargs: (
+            make_response('{"vocabulary": [{"word": "innov')
+            if 'vocabulary' in kwargs['messages'][0]['content'] else respond(**kwargs))
+        first = ContentProcessor(broken_client, cache=cache).process_article(raw_content)
+
+        retry_client = FakeChatClient()
+        second = ContentProcessor(retry_client, cache=cache).process_article(raw_content)
+        cache.close()
+
+        self.assertEqual(first.vocabulary, [])
+        self.assertEqual([item.word for item in second.vocabulary], ['innovation'])
+        # Only the section that failed to parse is requested again
+        self.assertEqual(retry_client.chat.completions.create.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
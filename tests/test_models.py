@@ -6,7 +6,10 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from src.models import VocabularyItem, DiscussionQuestion, EngooArticle
+from src.models import VocabularyItem, DiscussionQuestion, EngooArticle, CompiledTemplate, load_template
+import src.models as models
+import os
+import tempfile
 
 
 class TestModels(unittest.TestCase):
@@ -77,5 +80,70 @@ class TestModels(unittest.TestCase):
         self.assertIn("Think deeper?", html)
 
 
+class TestCompiledTemplate(unittest.TestCase):
+    """Test cases for the compiled template cache."""
+    
+    def setUp(self):
+        """Create a temporary template file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'template.html')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("<h1>{{title}}</h1>{{article_content}}<title>{{title}}</title>")
+    
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.tmpdir.cleanup()
+    
+    def test_render_fills_slots(self):
+        """Test that slots are filled and unknown placeholders are kept."""
+        template = CompiledTemplate("a{{x}}b{{y}}c{{unknown}}")
+        
+        self.assertEqual(template.segments, ['a', 'b', 'c', ''])
+        self.assertEqual(template.render({'x': '1', 'y': '2'}), "a1b2c{{unknown}}")
+    
+    def test_template_parsed_once(self):
+        """Test that an unchanged template file is not read again."""
+        first = load_template(self.path)
+        with patch('builtins.open', side_effect=AssertionError("template re-read")):
+            second = load_template(self.path)
+        
+        self.assertIs(first, second)
+        self.assertEqual(first.render({'title': 'T', 'article_content': 'C'}), "<h1>T</h1>C<title>T</title>")
+    
+    def test_template_reloaded_on_change(self):
+        """Test that editing the template invalidates the compiled copy."""
+        load_template(self.path)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("<h2>{{title}}</h2>")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        self.assertEqual(load_template(self.path).render({'title': 'T'}), "<h2>T</h2>")
+    
+    def test_missing_template(self):
+        """Test that a missing template yields None."""
+        self.assertIsNone(load_template(os.path.join(self.tmpdir.name, 'missing.html')))
+    
+    def test_to_html_uses_compiled_template(self):
+        """Test that to_html renders every section through the template file."""
+        article = EngooArticle(
+            title="Test Title",
+            vocabulary=[VocabularyItem("innovation", "New idea", "Innovation helps.")],
+            article_body="**Header**\n\nTest content.",
+            discussion_questions=[DiscussionQuestion("What's your opinion?")],
+            further_discussion_questions=[DiscussionQuestion("Think deeper?")]
+        )
+        
+        html = article.to_html()
+        
+        self.assertIn('<h1 class="article-title">Test Title</h1>', html)
+        self.assertIn('<div class="vocabulary-word">innovation</div>', html)
+        self.assertIn('<h3>Header</h3>\n<p>Test content.</p>', html)
+        self.assertIn('<span class="question-number">1.</span>', html)
+        self.assertIn("Think deeper?", html)
+        self.assertNotIn("{{", html)
+        self.assertIn(os.path.abspath(models.TEMPLATE_PATH), {os.path.abspath(p) for p in models._compiled_templates})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,296 @@
+import unittest
+from unittest.mock import Mock
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src import metrics
+from src.llm_cache import LLMCache
+from src.processor import ContentProcessor, STREAM_FALLBACK_NOTICE
+from src.tokens import TokenBudget, TokenCounter
+
+
+PROMPT_TOKENS = 120
+COMPLETION_TOKENS = 30
+
+
+def make_response(content):
+    """Build a mock chat completion response with the given message content."""
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    response.usage.prompt_tokens = PROMPT_TOKENS
+    response.usage.completion_tokens = COMPLETION_TOKENS
+    return response
+
+
+def make_chunk(content, usage=False):
+    """Build a mock streamed chunk carrying content, or only the token usage."""
+    chunk = Mock()
+    chunk.usage = None
+    if usage:
+        chunk.choices = []
+        chunk.usage = Mock(prompt_tokens=PROMPT_TOKENS, completion_tokens=COMPLETION_TOKENS)
+    else:
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = content
+    return chunk
+
+
+class FakeStream:
+    """Streamed chat completion that sends the content a word at a time, then the usage."""
+
+    def __init__(self, content):
+        words = content.split(' ')
+        self.chunks = [make_chunk(word if i == 0 else ' ' + word) for i, word in enumerate(words)]
+        self.chunks.append(make_chunk(None, usage=True))
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncStream(FakeStream):
+    """Async counterpart of FakeStream."""
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChatClient:
+    """Mock OpenAI client that answers based on the system prompt."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.chat = Mock()
+        self.chat.completions.create.side_effect = self._create
+
+    def _create(self, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            response = self._respond(**kwargs)
+            if kwargs.get('stream'):
+                return FakeStream(response.choices[0].message.content)
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _respond(self, **kwargs):
+        system_prompt = kwargs['messages'][0]['content']
+        if 'definitions' in system_prompt:
+            return make_response(json.dumps({'definitions': [
+                {'word': 'innovation', 'definition': 'A new idea'}
+            ]}))
+        if 'vocabulary' in system_prompt:
+            return make_response(json.dumps({'vocabulary': [
+                {'word': 'innovation', 'definition': 'A new idea', 'example': 'Innovation helps.'}
+            ]}))
+        if 'rewriting' in system_prompt:
+            return make_response("Rewritten body.")
+        if 'condensing' in system_prompt:
+            return make_response("Chunk summary.")
+        if 'advanced' in system_prompt:
+            return make_response(json.dumps({'questions': [{'question': 'Why?'}]}))
+        return make_response(json.dumps({'questions': [{'question': 'What do you think?'}]}))
+
+
+class FakeAsyncChatClient(FakeChatClient):
+    """Async counterpart of FakeChatClient for AsyncOpenAI."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(delay)
+        self.chat.completions.create.side_effect = self._acreate
+
+    async def _acreate(self, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            response = self._respond(**kwargs)
+            if kwargs.get('stream'):
+                return FakeAsyncStream(response.choices[0].message.content)
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestContentProcessor(unittest.TestCase):
+    """Test cases for ContentProcessor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+    def test_concurrent_matches_sequential(self):
+        """Test that concurrent mode produces the same article as sequential mode."""
+        sequential = ContentProcessor(FakeChatClient()).process_article(self.raw_content)
+        concurrent = ContentProcessor(FakeChatClient(), concurrent=True).process_article(self.raw_content)
+
+        self.assertEqual(sequential, concurrent)
+        self.assertEqual(concurrent.article_body, "Rewritten body.")
+        self.assertEqual(concurrent.discussion_questions[0].level, "standard")
+        self.assertEqual(concurrent.further_discussion_questions[0].level, "further")
+
+    def test_concurrent_overlaps_requests(self):
+        """Test that independent sections are requested in parallel."""
+        client = FakeChatClient(delay=0.05)
+        ContentProcessor(client, concurrent=True).process_article(self.raw_content)
+
+        self.assertEqual(client.chat.completions.create.call_count, 4)
+        self.assertGreaterEqual(client.max_in_flight, 2)
+
+    def test_async_matches_sequential(self):
+        """Test that the async pipeline produces the same article and overlaps requests."""
+        sequential = ContentProcessor(FakeChatClient()).process_article(self.raw_content)
+        async_client = FakeAsyncChatClient(delay=0.05)
+        processor = ContentProcessor(FakeChatClient(), async_client=async_client)
+
+        result = asyncio.run(processor.aprocess_article(self.raw_content))
+
+        self.assertEqual(result, sequential)
+        self.assertEqual(async_client.chat.completions.create.call_count, 4)
+        self.assertGreaterEqual(async_client.max_in_flight, 2)
+
+    def test_async_requires_async_client(self):
+        """Test that the async pipeline needs an AsyncOpenAI client."""
+        with self.assertRaises(ValueError):
+            asyncio.run(ContentProcessor(FakeChatClient()).aprocess_article(self.raw_content))
+
+
+    def test_long_article_is_condensed_before_rewrite(self):
+        """Test that over-budget articles are summarised in chunks and merged."""
+        client = FakeChatClient()
+        processor = ContentProcessor(
+            client,
+            token_budget=TokenBudget(vocabulary=50, rewrite=100, chunk=60),
+            token_counter=TokenCounter(use_tiktoken=False)
+        )
+        long_text = "\n\n".join(f"Paragraph {i} " + "word " * 40 for i in range(6))
+
+        article = processor.process_article({'title': 'Test Title', 'text': long_text})
+
+        calls = [call.kwargs for call in client.chat.completions.create.call_args_list]
+        summary_calls = [c for c in calls if 'condensing' in c['messages'][0]['content']]
+        rewrite_call = next(c for c in calls if 'rewriting' in c['messages'][0]['content'])
+        vocabulary_call = next(c for c in calls if 'vocabulary' in c['messages'][0]['content'])
+
+        self.assertEqual(len(summary_calls), 6)
+        self.assertIn("Chunk summary.", rewrite_call['messages'][1]['content'])
+        self.assertNotIn("Paragraph 5", rewrite_call['messages'][1]['content'])
+        self.assertNotIn("Paragraph 1", vocabulary_call['messages'][1]['content'])
+        self.assertEqual(article.article_body, "Rewritten body.")
+
+    def test_short_article_is_not_condensed(self):
+        """Test that articles within budget go straight to the rewrite."""
+        client = FakeChatClient()
+        ContentProcessor(client, token_counter=TokenCounter(use_tiktoken=False)).process_article(self.raw_content)
+
+        self.assertEqual(client.chat.completions.create.call_count, 4)
+
+
+
+class TestBodyStreaming(unittest.TestCase):
+    """Test cases for streaming the article rewrite."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+    def rewrite_calls(self, client):
+        return [call.kwargs for call in client.chat.completions.create.call_args_list
+                if 'rewriting' in call.kwargs['messages'][0]['content']]
+
+    def test_rewrite_is_streamed_to_callback(self):
+        """Test that only the rewrite is streamed and the lesson matches the unstreamed one."""
+        client = FakeChatClient()
+        deltas = []
+        with metrics.collect('https://example.com') as conversion_metrics:
+            article = ContentProcessor(client, concurrent=True).process_article(self.raw_content,
+                                                                                on_body_delta=deltas.append)
+
+        self.assertEqual(deltas, ['Rewritten', ' body.'])
+        self.assertEqual(article, ContentProcessor(FakeChatClient()).process_article(self.raw_content))
+        self.assertEqual(self.rewrite_calls(client)[0]['stream_options'], {'include_usage': True})
+        streamed = [call for call in client.chat.completions.create.call_args_list if call.kwargs.get('stream')]
+        self.assertEqual(len(streamed), 1)
+        # Usage from the final chunk is recorded like an ordinary call
+        self.assertEqual(conversion_metrics.to_dict()['llm']['completion_tokens'], 4 * COMPLETION_TOKENS)
+
+    def test_cached_rewrite_is_sent_whole(self):
+        """Test that a streamed rewrite is cached and replayed as one piece."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = LLMCache(Path(temp_dir) / 'llm.sqlite')
+            ContentProcessor(FakeChatClient(), cache=cache).process_article(self.raw_content, on_body_delta=Mock())
+
+            client = FakeChatClient()
+            deltas = []
+            ContentProcessor(client, cache=cache).process_article(self.raw_content, on_body_delta=deltas.append)
+            cache.close()
+
+        self.assertEqual(deltas, ['Rewritten body.'])
+        self.assertEqual(client.chat.completions.create.call_count, 0)
+
+    def test_failed_stream_tells_the_listener(self):
+        """Test that a rewrite failing mid-stream tells the listener the lesson uses the fallback."""
+        class BrokenStream(FakeStream):
+            def __iter__(self):
+                yield self.chunks[0]
+                raise ConnectionError("stream dropped")
+
+        client = FakeChatClient()
+        create = client.chat.completions.create.side_effect
+        client.chat.completions.create.side_effect = lambda **kwargs: (
+            BrokenStream("Rewritten body.") if kwargs.get('stream') else create(**kwargs))
+        deltas = []
+
+        article = ContentProcessor(client).process_article(self.raw_content, on_body_delta=deltas.append)
+
+        self.assertEqual(deltas, ['Rewritten', STREAM_FALLBACK_NOTICE])
+        self.assertEqual(article.article_body, 'Original article text.')
+
+    def test_iterator(self):
+        """Test streaming the rewritten body through the iterator API."""
+        processor = ContentProcessor(FakeChatClient())
+        pieces = list(processor.stream_article_body('Test Title', 'Original article text.'))
+
+        self.assertEqual(''.join(pieces).strip(), "Rewritten body.")
+        self.assertEqual(len(pieces), 2)
+
+    def test_async_stream(self):
+        """Test that the async pipeline streams the rewrite too."""
+        deltas = []
+        async_client = FakeAsyncChatClient()
+        processor = ContentProcessor(FakeChatClient(), async_client=async_client)
+
+        article = asyncio.run(processor.aprocess_article(self.raw_content, on_body_delta=deltas.append))
+
+        self.assertEqual(deltas, ['Rewritten', ' body.'])
+        self.assertEqual(article.article_body, "Rewritten body.")
+        self.assertTrue(self.rewrite_calls(async_client)[0]['stream'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+import unittest
+from unittest.mock import Mock
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import openai
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.rate_limit import RateLimitGovernor, RetriesExhaustedError, parse_reset_duration
+from src.processor import ContentProcessor
+from tests.test_processor import FakeAsyncStream, FakeChatClient, FakeStream
+
+
+def rate_limit_error(headers=None):
+    """Build an openai.RateLimitError carrying the given response headers."""
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class RawResponse:
+    """Stand-in for the raw response returned by with_raw_response.create."""
+
+    def __init__(self, parsed, headers=None):
+        self.parsed = parsed
+        self.headers = headers or {}
+
+    def parse(self):
+        return self.parsed
+
+
+class TestParseResetDuration(unittest.TestCase):
+    """Test cases for parse_reset_duration."""
+
+    def test_formats(self):
+        """Test the duration formats used by the OpenAI headers."""
+        self.assertEqual(parse_reset_duration("20ms"), 0.02)
+        self.assertEqual(parse_reset_duration("1s"), 1)
+        self.assertEqual(parse_reset_duration("6m0s"), 360)
+        self.assertEqual(parse_reset_duration("1.5"), 1.5)
+        self.assertIsNone(parse_reset_duration(None))
+        self.assertIsNone(parse_reset_duration("soon"))
+
+
+class TestRateLimitGovernor(unittest.TestCase):
+    """Test cases for RateLimitGovernor."""
+
+    def test_retries_rate_limit_then_succeeds(self):
+        """Test that a 429 is retried after retry-after and lowers the limit."""
+        governor = RateLimitGovernor(max_concurrency=8, base_delay=0.01)
+        fn = Mock(side_effect=[rate_limit_error({'retry-after-ms': '10'}), 'ok'])
+
+        self.assertEqual(governor.call(fn), 'ok')
+        self.assertEqual(fn.call_count, 2)
+
+        stats = governor.stats()
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['rate_limited'], 1)
+        self.assertEqual(stats['limit'], 4)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_success_grows_limit(self):
+        """Test the additive increase back towards the maximum."""
+        governor = RateLimitGovernor(max_concurrency=8)
+        governor.limit = 2.0
+        for _ in range(4):
+            governor.call(lambda: 'ok')
+
+        self.assertGreaterEqual(governor.stats()['limit'], 3)
+        self.assertLessEqual(governor.limit, 8)
+
+    def test_exhausted_retries_raise(self):
+        """Test that persistent failures raise RetriesExhaustedError."""
+        governor = RateLimitGovernor(max_retries=2, base_delay=0.001)
+        fn = Mock(side_effect=openai.APIConnectionError(request=httpx.Request('POST', 'https://api.openai.com')))
+
+        with self.assertRaises(RetriesExhaustedError):
+            governor.call(fn)
+        self.assertEqual(fn.call_count, 3)
+
+    def test_non_retryable_errors_propagate(self):
+        """Test that other errors are raised without retrying."""
+        governor = RateLimitGovernor(base_delay=0.001)
+        fn = Mock(side_effect=ValueError("bad request"))
+
+        with self.assertRaises(ValueError):
+            governor.call(fn)
+        self.assertEqual(fn.call_count, 1)
+        self.assertEqual(governor.stats()['in_flight'], 0)
+
+    def test_limits_concurrency_across_threads(self):
+        """Test that in-flight calls never exceed the limit."""
+        governor = RateLimitGovernor(max_concurrency=2)
+        lock = threading.Lock()
+        counts = {'current': 0, 'max': 0}
+
+        def work():
+            with lock:
+                counts['current'] += 1
+                counts['max'] = max(counts['max'], counts['current'])
+            time.sleep(0.02)
+            with lock:
+                counts['current'] -= 1
+
+        threads = [threading.Thread(target=governor.call, args=(work,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counts['max'], 2)
+
+    def test_exhausted_quota_pauses_until_reset(self):
+        """Test that remaining-requests of zero holds new calls until the reset."""
+        governor = RateLimitGovernor()
+        governor.call(lambda: RawResponse(None, {
+            'x-ratelimit-remaining-requests': '0',
+            'x-ratelimit-reset-requests': '100ms'
+        }))
+
+        start = time.monotonic()
+        governor.call(lambda: 'ok')
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_async_call_retries(self):
+        """Test the async variant retries the same way."""
+        governor = RateLimitGovernor(base_delay=0.01)
+        attempts = []
+
+        async def fn():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise rate_limit_error({'retry-after-ms': '10'})
+            return 'ok'
+
+        self.assertEqual(asyncio.run(governor.acall(fn)), 'ok')
+        self.assertEqual(len(attempts), 2)
+
+    def test_malformed_retry_after_ms_is_retried(self):
+        """Test that an unparseable retry-after-ms falls back to the backoff delay."""
+        governor = RateLimitGovernor(base_delay=0.01)
+        failures = [rate_limit_error({'retry-after-ms': 'soon'})]
+
+        def fn():
+            if failures:
+                raise failures.pop()
+            return 'ok'
+
+        self.assertEqual(governor.call(fn), 'ok')
+        self.assertEqual(governor.stats()['retries'], 1)
+
+    def test_cancelled_call_releases_slot(self):
+        """Test that cancelling an in-flight acall gives its slot back."""
+        governor = RateLimitGovernor()
+
+        async def run():
+            started = asyncio.Event()
+
+            async def fn():
+                started.set()
+                await asyncio.sleep(10)
+
+            task = asyncio.create_task(governor.acall(fn))
+            await started.wait()
+            self.assertEqual(governor.stats()['in_flight'], 1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        self.assertEqual(governor.stats()['in_flight'], 0)
+
+
+class TestProcessorWithGovernor(unittest.TestCase):
+    """Test ContentProcessor behaviour when calls go through a governor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.raw_content = {'title': 'Test Title', 'text': 'Original article text.'}
+
+    def test_transient_429_still_produces_full_lesson(self):
+        """Test that a rate-limited section is retried instead of replaced by a fallback."""
+        fake = FakeChatClient()
+        failures = [rate_limit_error({'retry-after-ms': '5'})]
+
+        def create(**kwargs):
+            if failures:
+                raise failures.pop()
+            return RawResponse(fake._respond(**kwargs))
+
+        fake.chat.completions.with_raw_response.create.side_effect = create
+        processor = ContentProcessor(fake, governor=RateLimitGovernor(base_delay=0.01))
+
+        article = processor.process_article(self.raw_content)
+
+        self.assertEqual(len(article.vocabulary), 1)
+        self.assertEqual(article.article_body, "Rewritten body.")
+        self.assertEqual(len(article.discussion_questions), 1)
+
+    def test_exhausted_retries_fail_the_article(self):
+        """Test that a section that keeps failing fails the conversion."""
+        fake = FakeChatClient()
+        fake.chat.completions.with_raw_response.create.side_effect = rate_limit_error()
+        processor = ContentProcessor(fake, governor=RateLimitGovernor(max_retries=1, base_delay=0.001))
+
+        with self.assertRaises(RetriesExhaustedError):
+            processor.process_article(self.raw_content)
+
+    def test_stream_holds_slot_until_read(self):
+        """Test that a streamed response keeps its governor slot until it is read or closed."""
+        fake = FakeChatClient()
+        fake.chat.completions.with_raw_response.create.side_effect = lambda **kwargs: RawResponse(
+            FakeStream(fake._respond(**kwargs).choices[0].message.content))
+        governor = RateLimitGovernor()
+        processor = ContentProcessor(fake, governor=governor)
+
+        pieces = processor.stream_article_body('Test Title', 'Original article text.')
+        next(pieces)
+        self.assertEqual(governor.stats()['in_flight'], 1)
+        list(pieces)
+        self.assertEqual(governor.stats()['in_flight'], 0)
+
+        pieces = processor.stream_article_body('Test Title', 'Original article text.')
+        next(pieces)
+        pieces.close()
+        self.assertEqual(governor.stats()['in_flight'], 0)
+
+    def test_async_stream_holds_slot_until_read(self):
+        """Test that the async stream holds its governor slot too."""
+        fake = FakeChatClient()
+
+        async def create(**kwargs):
+            return RawResponse(FakeAsyncStream(fake._respond(**kwargs).choices[0].message.content))
+
+        async_client = Mock()
+        async_client.chat.completions.with_raw_response.create.side_effect = create
+        governor = RateLimitGovernor()
+        processor = ContentProcessor(fake, async_client=async_client, governor=governor)
+
+        async def read():
+            in_flight = []
+            async for _ in processor._aiter_completion(**processor._rewrite_request('Title', 'Text.')):
+                in_flight.append(governor.stats()['in_flight'])
+            return in_flight
+
+        self.assertEqual(asyncio.run(read()), [1, 1])
+        self.assertEqual(governor.stats()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import Mock
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.agent import EngooNewsAgent
+from src.models import VocabularyItem, DiscussionQuestion, EngooArticle
+from src.processor import ContentProcessor
+from src.renderers import format_for_path, parse_formats, render
+from tests.test_processor import FakeChatClient
+
+
+def make_article():
+    return EngooArticle(
+        title="Test Title",
+        vocabulary=[VocabularyItem("innovation", "New idea", "Innovation helps.")],
+        article_body="**Background**\n\nFirst paragraph.\n\nSecond paragraph.",
+        discussion_questions=[DiscussionQuestion("What's your opinion?")],
+        further_discussion_questions=[DiscussionQuestion("Think deeper?", "further")]
+    )
+
+
+class TestRenderers(unittest.TestCase):
+    """Test cases for lesson output formats."""
+
+    def test_text(self):
+        """Test the plain text layout."""
+        self.assertEqual(render(make_article(), 'text'), (
+            "Title: Test Title\n\n"
+            "Vocabulary:\n"
+            "- innovation: New idea\n"
+            "  Example: Innovation helps.\n\n"
+            "Article:\n"
+            "**Background**\n\nFirst paragraph.\n\nSecond paragraph.\n\n"
+            "Discussion Questions:\n"
+            "1. What's your opinion?\n\n"
+            "Further Discussion:\n"
+            "1. Think deeper?\n"
+        ))
+
+    def test_markdown(self):
+        """Test the Markdown layout."""
+        markdown = render(make_article(), 'markdown')
+
+        self.assertTrue(markdown.startswith("# Test Title\n"))
+        self.assertIn("- **innovation**: New idea", markdown)
+        self.assertIn("### Background\n\nFirst paragraph.\n\nSecond paragraph.", markdown)
+        self.assertIn("## Further Discussion\n\n1. Think deeper?", markdown)
+
+    def test_json_round_trip(self):
+        """Test that JSON holds only the lesson fields and rebuilds the article."""
+        data = json.loads(render(make_article(), 'json'))
+
+        self.assertNotIn('html', data)
+        self.assertEqual(EngooArticle.from_dict(data), make_article())
+
+    def test_parse_formats(self):
+        """Test format parsing and validation."""
+        self.assertEqual(parse_formats("html, Markdown,html"), ['html', 'markdown'])
+        self.assertEqual(parse_formats(('json',)), ['json'])
+        with self.assertRaises(ValueError):
+            parse_formats("pdf")
+
+    def test_format_for_path(self):
+        """Test choosing a format from a file extension."""
+        self.assertEqual(format_for_path("lesson.html"), 'html')
+        self.assertEqual(format_for_path("lesson.md"), 'markdown')
+        self.assertEqual(format_for_path("lesson.json"), 'json')
+        self.assertEqual(format_for_path("lesson.txt"), 'text')
+
+
+class TestLazyRendering(unittest.TestCase):
+    """Test that convert_article renders only the requested formats."""
+
+    def setUp(self):
+        """Set up an agent with a fake scraper and OpenAI client."""
+        scraper = Mock()
+        scraper.extract_article_content.return_value = {
+            'title': 'A Sufficiently Long Test Title',
+            'text': 'Article text. ' * 30
+        }
+        self.agent = EngooNewsAgent(ContentProcessor(FakeChatClient()), scraper=scraper)
+
+    def test_default_renders_html_only(self):
+        """Test that the default keeps the HTML for existing callers."""
+        article = self.agent.convert_article("https://example.com/a")['article']
+
+        self.assertIn('<html', article['html'])
+        self.assertNotIn('markdown', article)
+
+    def test_requested_formats(self):
+        """Test rendering several formats from one conversion, or none at all."""
+        article = self.agent.convert_article("https://example.com/a", formats=['markdown', 'json'])['article']
+        self.assertNotIn('html', article)
+        self.assertTrue(article['markdown'].startswith("# A Sufficiently Long Test Title"))
+        self.assertEqual(json.loads(article['json'])['article_body'], "Rewritten body.")
+
+        bare = self.agent.convert_article("https://example.com/a", formats=())['article']
+        self.assertEqual(set(bare), {'title', 'vocabulary', 'article_body',
+                                     'discussion_questions', 'further_discussion_questions'})
+        self.assertIn('<html', render(EngooArticle.from_dict(bare), 'html'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import Mock, patch
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 # Add src to path
@@ -8,6 +10,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from src.scraper import WebScraper
 
+UTF8_ARTICLE_HTML = """<html>
+<head><meta charset="utf-8"><title>Café résumé — naïve</title></head>
+<body><h1>Café résumé — naïve</h1><article>Ein Café in München serves crème brûlée every morning.</article></body>
+</html>
+"""
+
+
+class NoCharsetHandler(BaseHTTPRequestHandler):
+    """Serves a UTF-8 page whose Content-Type names no charset."""
+
+    def do_GET(self):
+        body = UTF8_ARTICLE_HTML.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
 
 class TestWebScraper(unittest.TestCase):
     """Test cases for WebScraper."""
@@ -22,8 +45,11 @@ class TestWebScraper(unittest.TestCase):
         self.assertIn('User-Agent', self.scraper.session.headers)
     
     @patch('src.scraper.Article')
-    def test_extract_article_content_success(self, mock_article_class):
+    @patch('src.scraper.requests.Session.get')
+    def test_extract_article_content_success(self, mock_get, mock_article_class):
         """Test successful article extraction."""
+        mock_get.return_value = Mock(text="<html><body>Test</body></html>", content=b"<html><body>Test</body></html>")
+        
         # Mock Article instance
         mock_article = Mock()
         mock_article.title = "Test Title"
@@ -38,6 +64,7 @@ class TestWebScraper(unittest.TestCase):
         self.assertEqual(result['title'], "Test Title")
         self.assertEqual(result['text'], "Test content for the article.")
         self.assertEqual(result['url'], "https://example.com/article")
+        mock_article.download.assert_called_once_with(input_html="<html><body>Test</body></html>")
     
     @patch('src.scraper.Article')
     @patch('src.scraper.requests.Session.get')
@@ -51,7 +78,7 @@ class TestWebScraper(unittest.TestCase):
         
         # Mock requests response
         mock_response = Mock()
-        mock_response.content = b"""
+        mock_response.text = """
         <html>
             <head><title>Test Title</title></head>
             <body>
@@ -59,6 +86,7 @@ class TestWebScraper(unittest.TestCase):
             </body>
         </html>
         """
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_get.return_value = mock_response
         
         result = self.scraper.extract_article_content("https://example.com/article")
@@ -66,6 +94,25 @@ class TestWebScraper(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result['title'], "Test Title")
         self.assertIn("This is test content.", result['text'])
+        # The page is downloaded once and shared by both parsers
+        mock_get.assert_called_once()
+        mock_article.download.assert_called_once_with(input_html=mock_response.text)
+
+    def test_meta_charset_without_header_charset(self):
+        """Test that a UTF-8 page served as plain text/html is not decoded as ISO-8859-1."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), NoCharsetHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/article"
+            result = self.scraper.extract_article_content(url)
+            fallback = self.scraper._manual_scrape(url, self.scraper._fetch_page(url).text)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(result['title'], "Café résumé — naïve")
+        self.assertEqual(fallback['title'], "Café résumé — naïve")
+        self.assertIn("crème brûlée", fallback['text'])
 
 
 if __name__ == '__main__':
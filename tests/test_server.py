@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import Mock
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.server import ConversionService, QueueFullError, create_server, CANCELLED, DONE, FAILED
+
+
+def convert(url, formats=('html',)):
+    if url.endswith('bad'):
+        return {'success': False, 'url': url, 'error': 'Failed to scrape content from URL'}
+    article = {'title': 'Title'}
+    for fmt in formats:
+        article[fmt] = f"<{fmt}>"
+    return {'success': True, 'url': url, 'error': None, 'article': article}
+
+
+def wait_for(service, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while service.get(job_id).result is None:
+        if time.time() > deadline:
+            raise AssertionError(f"Job {job_id} did not finish")
+        time.sleep(0.01)
+    return service.get(job_id)
+
+
+class TestConversionService(unittest.TestCase):
+    """Test cases for the job queue."""
+
+    def test_jobs_run_on_workers(self):
+        """Test that submitted jobs finish with their results and are counted."""
+        agent = Mock()
+        agent.convert_article.side_effect = convert
+        service = ConversionService(agent, workers=2)
+
+        good = service.submit("https://e.com/1", "html,markdown")
+        bad = service.submit("https://e.com/bad")
+
+        self.assertEqual(wait_for(service, good.id).status, DONE)
+        self.assertEqual(wait_for(service, bad.id).status, FAILED)
+        self.assertEqual(good.result['article']['markdown'], "<markdown>")
+        self.assertEqual(bad.to_dict()['error'], 'Failed to scrape content from URL')
+        stats = service.stats()
+        self.assertEqual((stats['submitted'], stats['succeeded'], stats['failed']), (2, 1, 1))
+        service.shutdown()
+
+    def test_full_queue_is_refused(self):
+        """Test that submissions beyond the queue capacity are rejected."""
+        release = threading.Event()
+        agent = Mock()
+        agent.convert_article.side_effect = lambda url, formats: release.wait() and convert(url, formats)
+        service = ConversionService(agent, workers=1, max_queue=1)
+
+        running = service.submit("https://e.com/1")
+        while service.stats()['busy_workers'] == 0:
+            time.sleep(0.01)
+        service.submit("https://e.com/2")
+
+        with self.assertRaises(QueueFullError):
+            service.submit("https://e.com/3")
+        self.assertEqual(service.stats()['queue_depth'], 1)
+        self.assertEqual(service.stats()['rejected'], 1)
+
+        release.set()
+        wait_for(service, running.id)
+        service.shutdown()
+
+    def test_shutdown_without_wait_cancels_queued_jobs(self):
+        """Test that shutting down a busy service returns at once and cancels the waiting jobs."""
+        release = threading.Event()
+        agent = Mock()
+        agent.convert_article.side_effect = lambda url, formats: release.wait() and convert(url, formats)
+        service = ConversionService(agent, workers=1, max_queue=1)
+
+        running = service.submit("https://e.com/1")
+        while service.stats()['busy_workers'] == 0:
+            time.sleep(0.01)
+        waiting = service.submit("https://e.com/2")
+
+        finished = threading.Event()
+        threading.Thread(target=lambda: (service.shutdown(wait=False), finished.set()), daemon=True).start()
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(waiting.status, CANCELLED)
+        self.assertFalse(waiting.result['success'])
+
+        release.set()
+        self.assertEqual(wait_for(service, running.id).status, DONE)
+        self.assertEqual(agent.convert_article.call_count, 1)
+
+    def test_unknown_format(self):
+        """Test that invalid formats are rejected at submission."""
+        service = ConversionService(Mock(), workers=1)
+        with self.assertRaises(ValueError):
+            service.submit("https://e.com/1", ['pdf'])
+        service.shutdown()
+
+
+class TestHTTPServer(unittest.TestCase):
+    """Test cases for the HTTP API."""
+
+    def setUp(self):
+        """Start the service on a free port."""
+        agent = Mock()
+        agent.convert_article.side_effect = convert
+        self.service = ConversionService(agent, workers=2)
+        self.server = create_server(self.service, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self):
+        """Stop the server and workers."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.shutdown()
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_submit_and_fetch_result(self):
+        """Test the submit, status and result round trip."""
+        status, job = self.request('POST', '/jobs', {'url': 'https://e.com/1', 'formats': ['json']})
+        self.assertEqual(status, 202)
+
+        wait_for(self.service, job['id'])
+        status, info = self.request('GET', f"/jobs/{job['id']}")
+        self.assertEqual((status, info['status']), (200, 'done'))
+        status, result = self.request('GET', f"/jobs/{job['id']}/result")
+        self.assertEqual((status, result['article']['json']), (200, '<json>'))
+
+    def test_errors(self):
+        """Test bad requests and unknown jobs."""
+        self.assertEqual(self.request('POST', '/jobs', {'formats': ['html']})[0], 400)
+        self.assertEqual(self.request('POST', '/jobs', {'url': 'https://e.com/1', 'formats': ['pdf']})[0], 400)
+        self.assertEqual(self.request('POST', '/jobs', {'url': 'https://e.com/1', 'formats': 5})[0], 400)
+        self.assertEqual(self.request('POST', '/jobs', {'url': 'https://e.com/1', 'formats': [1]})[0], 400)
+        self.assertEqual(self.request('POST', '/jobs', {'url': ['https://e.com/1']})[0], 400)
+        self.assertEqual(self.request('GET', '/jobs/missing')[0], 404)
+
+    def test_health_and_metrics(self):
+        """Test the monitoring endpoints."""
+        status, health = self.request('GET', '/health')
+        self.assertEqual((status, health['status'], health['workers']), (200, 'ok', 2))
+
+        status, stats = self.request('GET', '/metrics')
+        self.assertEqual(status, 200)
+        self.assertEqual(stats['queue_capacity'], 100)
+        self.assertIn('mean_wait_seconds', stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from benchmarks.startup import check_budget, parse_importtime, run_startup_benchmark, HEAVY_MODULES
+
+
+class TestStartup(unittest.TestCase):
+    """Test that the CLI starts without loading the conversion stack."""
+
+    def test_parse_importtime(self):
+        """Test reading module times from -X importtime output."""
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _io\n"
+                  "import time:      2500 |       2620 | openai\n"
+                  "usage: engoo-writer\n")
+        self.assertEqual(parse_importtime(stderr), {'_io': 120, 'openai': 2500})
+
+    def test_check_budget(self):
+        """Test that heavy imports and slow startups are both reported."""
+        report = {'help': {'import_ms': 50.0, 'heavy_modules': []},
+                  'gist --help': {'import_ms': 900.0, 'heavy_modules': ['openai']}}
+        problems = check_budget(report, budget_ms=300)
+        self.assertEqual(len(problems), 2)
+        self.assertTrue(all(problem.startswith('gist --help') for problem in problems))
+
+    def test_light_commands_skip_heavy_imports(self):
+        """Test that help, gist and library commands load none of the heavy dependencies."""
+        for name, stats in run_startup_benchmark(runs=1).items():
+            with self.subTest(command=name):
+                self.assertEqual(stats['returncode'], 0)
+                self.assertEqual(stats['heavy_modules'], [])
+
+    def test_scraper_defers_parsers(self):
+        """Test that importing the scraper leaves newspaper, BeautifulSoup and httpx for first use."""
+        code = ("import sys; sys.path.insert(0, 'src'); import src.scraper; "
+                "print(' '.join(sorted({m.split('.')[0] for m in sys.modules} & set(sys.argv[1:]))))")
+        result = subprocess.run([sys.executable, '-c', code, *HEAVY_MODULES], capture_output=True, text=True,
+                                cwd=Path(__file__).parent.parent, check=True)
+        self.assertEqual(result.stdout.split(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.tokens import TokenBudget, TokenCounter
+
+
+class TestTokenCounter(unittest.TestCase):
+    """Test cases for TokenCounter with the character-based estimate."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.counter = TokenCounter(use_tiktoken=False)
+
+    def test_count_and_truncate(self):
+        """Test counting and truncating by tokens."""
+        text = "abcd" * 10
+        self.assertEqual(self.counter.count(text), 10)
+        self.assertEqual(self.counter.count(self.counter.truncate(text, 3)), 3)
+        self.assertEqual(self.counter.truncate("short", 100), "short")
+
+    def test_split_respects_budget_and_order(self):
+        """Test that chunks stay within budget and keep document order."""
+        paragraphs = [f"Paragraph {i}. " + "text " * 20 for i in range(5)]
+        chunks = self.counter.split("\n\n".join(paragraphs), 60)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(self.counter.count(chunk), 60)
+        self.assertEqual(" ".join(chunks).split().count("Paragraph"), 5)
+        self.assertTrue(chunks[0].startswith("Paragraph 0."))
+
+    def test_split_breaks_oversized_paragraphs(self):
+        """Test that a single paragraph over budget is split further."""
+        chunks = self.counter.split("word " * 200, 50)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(self.counter.count(chunk), 50)
+
+    def test_budget_from_env(self):
+        """Test that budgets can be configured through the environment."""
+        with patch.dict('os.environ', {'ENGOO_REWRITE_TOKENS': '2000'}):
+            budget = TokenBudget.from_env()
+
+        self.assertEqual(budget.rewrite, 2000)
+        self.assertEqual(budget.vocabulary, TokenBudget().vocabulary)
+
+
+if __name__ == '__main__':
+    unittest.main()